@@ -7,6 +7,7 @@ import re
 import shutil
 
 from config import COMPANY_AFFILIATION_PATTERNS, COMPANY_INSTITUTION_NAMES, INSTITUTIONS_PATTERNS, MAX_PDF_PAGES_TO_SCAN, USE_HARDLINKS
+from paper import entry_arxiv_id
 from pdf_affil import extract_core_author_affiliation_text
 
 
@@ -64,7 +65,7 @@ def classify_from_pdf_with_stats(
     }
 
     for entry in entries:
-        aid = (entry.get("id") or "").split("/")[-1]
+        aid = entry_arxiv_id(entry)
         pdf_path = id2pdf.get(aid)
         if not pdf_path or not os.path.exists(pdf_path):
             stats["missing_pdf"] += 1
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping
+
+from config import DEBUG
+
+# Only these parameters change the response body; anything else is ignored
+# when building the cache key.
+_KEY_PARAMS = ("search_query", "id_list", "sortBy", "sortOrder", "start", "max_results")
+
+
+def cache_key(params: Mapping[str, Any]) -> str:
+    canonical = json.dumps(
+        {name: str(params[name]) for name in _KEY_PARAMS if params.get(name) is not None},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    key: str
+    text: str
+    fetched_at: float
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def revalidation_headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ApiResponseCache:
+    """Gzip-compressed raw API responses stored under a hash of the query parameters.
+
+    Each entry is ``<key>.xml.gz`` plus a ``<key>.json`` sidecar with the
+    expiry time and the validators needed for a conditional request.
+    """
+
+    def __init__(self, root: Path | Callable[[], Path]) -> None:
+        self._root = root
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0}
+
+    @property
+    def root(self) -> Path:
+        return Path(self._root() if callable(self._root) else self._root)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        directory = self.root / key[:2]
+        return directory / f"{key}.xml.gz", directory / f"{key}.json"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def lookup(self, params: Mapping[str, Any]) -> CachedResponse | None:
+        """Return the stored response for ``params``, fresh or not; ``None`` when absent or unreadable."""
+        key = cache_key(params)
+        body_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            text = gzip.decompress(body_path.read_bytes()).decode("utf-8")
+        except Exception:
+            self._count("misses")
+            return None
+        cached = CachedResponse(
+            key=key,
+            text=text,
+            fetched_at=float(meta.get("fetched_at", 0)),
+            expires_at=float(meta.get("expires_at", 0)),
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+        )
+        self._count("hits" if cached.fresh else "misses")
+        return cached
+
+    def store(
+        self,
+        params: Mapping[str, Any],
+        text: str,
+        ttl_sec: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        if self._write(params, text, ttl_sec, etag, last_modified):
+            self._count("stored")
+
+    def refresh(self, cached: CachedResponse, params: Mapping[str, Any], ttl_sec: float) -> None:
+        """Extend a stored response after the server answered 304 Not Modified."""
+        self._count("revalidated")
+        self._write(params, cached.text, ttl_sec, cached.etag, cached.last_modified)
+
+    def _write(
+        self,
+        params: Mapping[str, Any],
+        text: str,
+        ttl_sec: float,
+        etag: str | None,
+        last_modified: str | None,
+    ) -> bool:
+        key = cache_key(params)
+        body_path, meta_path = self._paths(key)
+        now = time.time()
+        meta = {
+            "params": {name: params[name] for name in _KEY_PARAMS if params.get(name) is not None},
+            "fetched_at": now,
+            "expires_at": now + max(0.0, ttl_sec),
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        try:
+            body_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_body = body_path.with_suffix(".gz.part")
+            temp_body.write_bytes(gzip.compress(text.encode("utf-8"), compresslevel=6))
+            temp_body.replace(body_path)
+            # The sidecar is written last so a reader never sees metadata for a missing body.
+            temp_meta = meta_path.with_suffix(".json.part")
+            temp_meta.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+            temp_meta.replace(meta_path)
+            return True
+        except Exception as exc:
+            if DEBUG:
+                print(f"[WARN] failed to cache arXiv API response {key}: {exc}")
+            return False
+
+    def stats_snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
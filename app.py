@@ -2,14 +2,22 @@ from __future__ import annotations
 
 import json
 import re
-from datetime import date, datetime, timedelta
+import time
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Tuple
 
 from affil_classify import classify_from_pdf_with_stats
+from baseline_store import CheckpointJournal, CompactBaseline, write_compact_baseline
 from config import (
+    ARXIV_DELTA_FETCH,
+    ARXIV_PRIMARY_CATEGORY_PREFIXES,
+    BASELINE_JOURNAL_FSYNC_PAGES,
+    BASELINE_METADATA_BACKEND,
     CACHE_REPORT_DIR,
     CLASSIFY_FROM_PDF,
+    COOLDOWN_PROGRESS_INTERVAL_SEC,
+    COOLDOWN_WAIT_MAX_RESUMES,
     DEBUG,
     INSTITUTIONS_PATTERNS,
     LOCAL_TZ,
@@ -17,16 +25,38 @@ from config import (
     PRIORITY_CATEGORIES,
     PRUNE_UNMATCHED_CACHED_PDFS,
 )
-from fetch_arxiv import describe_arxiv_request_state, get_arxiv_id, iter_recent_cs
+from fetch_arxiv import (
+    ArxivRateLimitError,
+    api_cache_stats,
+    api_page_size_stats,
+    close_request_trace,
+    connection_pool_stats,
+    describe_arxiv_request_state,
+    extract_pdf_url,
+    get_arxiv_id,
+    iter_category_since,
+    open_request_trace,
+    probe_category_total,
+    request_trace_position,
+    request_trace_summary,
+    request_wait_stats,
+    route_cache_stats,
+)
 from filters import (
     arxiv_day_window,
     arxiv_previous_day_window,
     in_time_window,
     is_cs,
+    window_is_settled,
 )
-from pipeline_report import PipelineReport
+from http_sessions import summarize_pool_stats
+from metadata_backends import SearchApiBackend, get_metadata_backend
+from paper import Paper
+from pipeline_report import PipelineReport
 from prefetch import cache_pdfs_with_stats, organize_cached_pdfs
+from request_scheduler import wait_stats_delta
 from runtime_control import PipelineCancelled, PipelineController
+from snapshot_import import load_or_build_snapshot_index
 from utils import now_local
 
 BASELINE_CHECKPOINT_VERSION = "api_calendar_day_v2"
@@ -159,51 +189,58 @@ def institutions_text_from_terms(org_search_terms: Dict[str, List[str]] | None =
 
 
 def _baseline_checkpoint_path(report_date: str) -> Path:
-    return Path(CACHE_REPORT_DIR) / report_date / "baseline_fetch_checkpoint.json"
+    return Path(CACHE_REPORT_DIR) / report_date / "baseline_fetch_checkpoint.jsonl"
 
 
 def _baseline_complete_cache_path(report_date: str) -> Path:
+    return Path(CACHE_REPORT_DIR) / report_date / "baseline_entries_cache.bin"
+
+
+def _request_trace_path(report_date: str) -> Path:
+    return Path(CACHE_REPORT_DIR) / report_date / "request_trace.jsonl"
+
+
+def _legacy_baseline_cache_path(report_date: str) -> Path:
     return Path(CACHE_REPORT_DIR) / report_date / "baseline_entries_cache.json"
 
 
 def _serialize_checkpoint_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
-    payload = dict(entry)
-    for key, value in list(payload.items()):
-        if hasattr(value, "isoformat"):
-            payload[key] = value.isoformat()
-    return payload
+    return Paper.from_dict(entry).to_dict()
+
+
+def _deserialize_checkpoint_entry(entry: Dict[str, Any]) -> Paper:
+    return Paper.from_dict(entry)
+
+
+def _baseline_journal(report_date: str, start_utc, end_utc) -> CheckpointJournal:
+    header = {
+        "report_date": report_date,
+        "start_utc": start_utc.isoformat(),
+        "end_utc": end_utc.isoformat(),
+        "filter_version": BASELINE_CHECKPOINT_VERSION,
+    }
+    # Cursors of one backend mean nothing to another; search API journals
+    # keep their original header.
+    if BASELINE_METADATA_BACKEND != SearchApiBackend.name:
+        header["metadata_backend"] = BASELINE_METADATA_BACKEND
+    return CheckpointJournal(_baseline_checkpoint_path(report_date), header, fsync_every=BASELINE_JOURNAL_FSYNC_PAGES)
 
 
-def _deserialize_iso_datetime_fields(entry: Dict[str, Any]) -> Dict[str, Any]:
-    payload = dict(entry)
-    for key in ("published", "updated"):
-        value = payload.get(key)
-        if isinstance(value, str):
-            try:
-                payload[key] = datetime.fromisoformat(value)
-            except Exception:
-                payload[key] = None
-    return payload
+def _baseline_source() -> Callable[..., Any]:
+    return get_metadata_backend(BASELINE_METADATA_BACKEND).iter_entries
 
 
-def _deserialize_checkpoint_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
-    return _deserialize_iso_datetime_fields(entry)
+def _checkpoint_cursor(stats: Dict[str, Any], next_start: int, cursors: Dict[str, Any] | None) -> Dict[str, Any]:
+    return {"next_start": next_start, "cursors": cursors, "stats": stats}
 
 
 def _load_baseline_checkpoint(report_date: str, start_utc, end_utc) -> Dict[str, Any] | None:
-    path = _baseline_checkpoint_path(report_date)
-    if not path.exists():
-        return None
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return None
-    if payload.get("start_utc") != start_utc.isoformat() or payload.get("end_utc") != end_utc.isoformat():
+    replayed = _baseline_journal(report_date, start_utc, end_utc).replay()
+    if not replayed or replayed["cursor"] is None:
         return None
-    if payload.get("filter_version") != BASELINE_CHECKPOINT_VERSION:
-        return None
-    entries = [_deserialize_checkpoint_entry(entry) for entry in payload.get("entries", [])]
-    stats = payload.get("stats") or {}
+    cursor = replayed["cursor"]
+    entries = [_deserialize_checkpoint_entry(entry) for entry in replayed["entries"]]
+    stats = cursor.get("stats") or {}
     return {
         "entries": entries,
         "stats": {
@@ -212,65 +249,186 @@ def _load_baseline_checkpoint(report_date: str, start_utc, end_utc) -> Dict[str,
             "filtered_non_cs": int(stats.get("filtered_non_cs", 0)),
             "filtered_out_of_window": int(stats.get("filtered_out_of_window", 0)),
         },
-        "next_start": int(payload.get("next_start", 0)),
+        "next_start": int(cursor.get("next_start", 0)),
+        "cursors": cursor.get("cursors"),
+        "journal_bytes": replayed["valid_bytes"],
     }
 
 
-def _write_baseline_checkpoint(
-    report_date: str,
-    start_utc,
-    end_utc,
-    entries: List[Dict[str, Any]],
-    stats: Dict[str, Any],
-    next_start: int,
-) -> None:
-    path = _baseline_checkpoint_path(report_date)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    payload = {
+def _baseline_cache_meta(report_date: str, start_utc, end_utc) -> Dict[str, Any]:
+    return {
         "report_date": report_date,
         "start_utc": start_utc.isoformat(),
         "end_utc": end_utc.isoformat(),
-        "next_start": next_start,
         "filter_version": BASELINE_CHECKPOINT_VERSION,
-        "stats": stats,
-        "entries": [_serialize_checkpoint_entry(entry) for entry in entries],
     }
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
-def _clear_baseline_checkpoint(report_date: str) -> None:
-    try:
-        _baseline_checkpoint_path(report_date).unlink(missing_ok=True)
-    except Exception:
-        pass
+def _baseline_index_fields(row: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        get_arxiv_id(row),
+        row.get("id"),
+        row.get("primary_category"),
+        row.get("categories") or [],
+        row.get("published"),
+        extract_pdf_url(row),
+    )
 
 
-def _load_complete_baseline_cache(report_date: str, start_utc, end_utc) -> List[Dict[str, Any]] | None:
-    path = _baseline_complete_cache_path(report_date)
-    if not path.exists():
+def _open_complete_baseline_cache(report_date: str, start_utc, end_utc) -> CompactBaseline | None:
+    meta = _baseline_cache_meta(report_date, start_utc, end_utc)
+    baseline = CompactBaseline.open(_baseline_complete_cache_path(report_date), _deserialize_checkpoint_entry)
+    if baseline is None:
+        if not _migrate_legacy_baseline_cache(report_date, meta):
+            return None
+        baseline = CompactBaseline.open(_baseline_complete_cache_path(report_date), _deserialize_checkpoint_entry)
+    # ``delta`` holds the watermarks of the last fetch, not part of the cache identity.
+    if baseline is None or {key: baseline.meta.get(key) for key in meta} != meta:
         return None
+    return baseline
+
+
+def _load_complete_baseline_cache(report_date: str, start_utc, end_utc) -> List[Dict[str, Any]] | None:
+    """Return the cached baseline as lazy entries; full rows are decoded only when a field outside the index is read."""
+    baseline = _open_complete_baseline_cache(report_date, start_utc, end_utc)
+    return baseline.entries() if baseline is not None else None
+
+
+def _baseline_delta_state(entries: List[Dict[str, Any]], end_utc, totals: Dict[str, int | None] | None = None) -> Dict[str, Any]:
+    """Per-category watermark (newest ``published`` and its ID) and last known totalResults.
+
+    A category missing from ``totals`` (it was fetched in a combined or
+    exclusion query, or by another backend) gets the number of entries
+    listing it, which is its totalResults when the fetch was complete.
+    """
+    categories: Dict[str, Dict[str, Any]] = {
+        category: {"watermark": None, "newest_id": None, "total": (totals or {}).get(category)}
+        for category in ARXIV_PRIMARY_CATEGORY_PREFIXES
+    }
+    counts = {category: 0 for category in categories}
+    newest: Dict[str, datetime] = {}
+    for entry in entries:
+        published = entry.get("published")
+        for category in entry.get("categories") or ():
+            if category not in categories:
+                continue
+            counts[category] += 1
+            if published is not None and (category not in newest or published > newest[category]):
+                newest[category] = published
+                categories[category]["watermark"] = published.isoformat()
+                categories[category]["newest_id"] = get_arxiv_id(entry)
+    for category, state in categories.items():
+        if state["total"] is None:
+            state["total"] = counts[category]
+    return {"open": not window_is_settled(end_utc), "categories": categories}
+
+
+def _migrate_legacy_baseline_cache(report_date: str, meta: Dict[str, Any]) -> bool:
+    legacy_path = _legacy_baseline_cache_path(report_date)
+    if not legacy_path.exists():
+        return False
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload = json.loads(legacy_path.read_text(encoding="utf-8"))
     except Exception:
-        return None
-    if payload.get("start_utc") != start_utc.isoformat() or payload.get("end_utc") != end_utc.isoformat():
-        return None
-    if payload.get("filter_version") != BASELINE_CHECKPOINT_VERSION:
-        return None
-    return [_deserialize_checkpoint_entry(entry) for entry in payload.get("entries", [])]
+        return False
+    if any(payload.get(key) != value for key, value in meta.items() if key != "report_date"):
+        return False
+    write_compact_baseline(
+        _baseline_complete_cache_path(report_date),
+        meta,
+        payload.get("entries", []),
+        _baseline_index_fields,
+    )
+    legacy_path.unlink(missing_ok=True)
+    return True
 
 
-def _write_complete_baseline_cache(report_date: str, start_utc, end_utc, entries: List[Dict[str, Any]]) -> None:
-    path = _baseline_complete_cache_path(report_date)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    payload = {
-        "report_date": report_date,
-        "start_utc": start_utc.isoformat(),
-        "end_utc": end_utc.isoformat(),
-        "filter_version": BASELINE_CHECKPOINT_VERSION,
-        "entries": [_serialize_checkpoint_entry(entry) for entry in entries],
+def _write_complete_baseline_cache(
+    report_date: str,
+    start_utc,
+    end_utc,
+    entries: List[Dict[str, Any]],
+    totals: Dict[str, int | None] | None = None,
+) -> None:
+    write_compact_baseline(
+        _baseline_complete_cache_path(report_date),
+        {
+            **_baseline_cache_meta(report_date, start_utc, end_utc),
+            "delta": _baseline_delta_state(entries, end_utc, totals),
+        },
+        (_serialize_checkpoint_entry(entry) for entry in entries),
+        _baseline_index_fields,
+    )
+
+
+def _refresh_baseline_delta(
+    baseline: CompactBaseline,
+    start_utc,
+    end_utc,
+    report_date: str,
+    controller: PipelineController | None = None,
+    progress_callback: ProgressCallback | None = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Top up a cached baseline whose window was still open when it was written.
+
+    Each category first gets a ``max_results=1`` probe; when its
+    totalResults matches the cached count it is skipped, otherwise only
+    ``[watermark TO end]`` is queried and new in-window rows are appended.
+    """
+    entries: List[Dict[str, Any]] = baseline.entries()
+    known_ids = {record.arxiv_id for record in baseline.index}
+    cached_state = (baseline.meta.get("delta") or {}).get("categories") or {}
+    totals: Dict[str, int | None] = {}
+    delta = {"probes": 0, "skipped": [], "queried": [], "new": 0}
+    for category in ARXIV_PRIMARY_CATEGORY_PREFIXES:
+        _checkpoint(controller)
+        cached = cached_state.get(category) or {}
+        totals[category] = probe_category_total(category, start_utc, end_utc)
+        delta["probes"] += 1
+        if totals[category] is not None and totals[category] == cached.get("total"):
+            delta["skipped"].append(category)
+            continue
+        delta["queried"].append(category)
+        since = datetime.fromisoformat(cached["watermark"]) if cached.get("watermark") else start_utc
+        for entry in iter_category_since(
+            category,
+            max(since, start_utc),
+            end_utc,
+            known_ids=known_ids,
+            on_request_progress=lambda message: _emit_progress(progress_callback, "baseline_fetch", message, "warning", None),
+        ):
+            _checkpoint(controller)
+            arxiv_id = get_arxiv_id(entry)
+            if arxiv_id in known_ids:
+                continue
+            known_ids.add(arxiv_id)
+            if is_cs(entry) and _entry_in_target_window(entry, start_utc, end_utc):
+                entries.append(entry)
+                delta["new"] += 1
+    # Rewrite even without new rows: the totals and the open/settled flag changed.
+    _write_complete_baseline_cache(report_date, start_utc, end_utc, entries, totals)
+    # The rewrite moved every row, so hand out entries over the new file.
+    rewritten = _open_complete_baseline_cache(report_date, start_utc, end_utc)
+    if rewritten is not None:
+        entries = rewritten.entries()
+    _emit_progress(
+        progress_callback,
+        "baseline_fetch",
+        (
+            f"delta refresh for {report_date}: {delta['new']} new papers, "
+            f"{len(delta['skipped'])}/{delta['probes']} categories unchanged"
+        ),
+        "running",
+        None,
+    )
+    return entries, {
+        "scanned": len(entries),
+        "matched": len(entries),
+        "filtered_non_cs": 0,
+        "filtered_out_of_window": 0,
+        "cache_hit": True,
+        "delta": delta,
     }
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
 def _collect_baseline_entries(
@@ -279,8 +437,12 @@ def _collect_baseline_entries(
     report_date: str,
     controller: PipelineController | None = None,
     progress_callback: ProgressCallback | None = None,
+    write_complete_cache: bool = True,
 ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
-    cached_entries = _load_complete_baseline_cache(report_date, start_utc, end_utc)
+    baseline = _open_complete_baseline_cache(report_date, start_utc, end_utc) if write_complete_cache else None
+    if baseline is not None and ARXIV_DELTA_FETCH and (baseline.meta.get("delta") or {}).get("open"):
+        return _refresh_baseline_delta(baseline, start_utc, end_utc, report_date, controller, progress_callback)
+    cached_entries = baseline.entries() if baseline is not None else None
     if cached_entries is not None:
         _emit_progress(
             progress_callback,
@@ -303,6 +465,8 @@ def _collect_baseline_entries(
     filtered_non_cs = 0
     filtered_out_of_window = 0
     start_offset = 0
+    cursors = None
+    journal = _baseline_journal(report_date, start_utc, end_utc)
     checkpoint = _load_baseline_checkpoint(report_date, start_utc, end_utc)
     if checkpoint:
         entries = checkpoint["entries"]
@@ -311,6 +475,8 @@ def _collect_baseline_entries(
         filtered_non_cs = checkpoint["stats"]["filtered_non_cs"]
         filtered_out_of_window = checkpoint["stats"]["filtered_out_of_window"]
         start_offset = checkpoint["next_start"]
+        cursors = checkpoint["cursors"]
+        journal.open(checkpoint["journal_bytes"])
         _emit_progress(
             progress_callback,
             "baseline_fetch",
@@ -335,8 +501,12 @@ def _collect_baseline_entries(
             None,
         )
 
-    def _checkpoint_page(current_start: int, next_start: int, fetched_count: int) -> None:
-        if fetched_count <= 0:
+    journaled_count = len(entries)
+
+    def _checkpoint_page(current_start: int, next_start: int, fetched_count: int, cursors=None) -> None:
+        nonlocal journaled_count
+        # An empty page still matters when it marks a category as finished.
+        if fetched_count <= 0 and cursors is None:
             return
         stats = {
             "scanned": total_scanned,
@@ -344,36 +514,48 @@ def _collect_baseline_entries(
             "filtered_non_cs": filtered_non_cs,
             "filtered_out_of_window": filtered_out_of_window,
         }
-        _write_baseline_checkpoint(report_date, start_utc, end_utc, entries, stats, next_start)
-
-    for entry in iter_recent_cs(
-        start_utc=start_utc,
-        end_utc=end_utc,
-        start_offset=start_offset,
-        on_page_complete=_checkpoint_page,
-        on_request_progress=lambda message: _emit_progress(
-            progress_callback,
-            "baseline_fetch",
-            message,
-            "warning",
-            None,
-        ),
-    ):
-        _checkpoint(controller)
-        total_scanned += 1
-        if total_scanned % 25 == 0:
-            _emit_progress(progress_callback, "baseline_fetch", f"baseline scanned {total_scanned} papers", "running", None)
-        if not is_cs(entry):
-            filtered_non_cs += 1
-            continue
-        if not _entry_in_target_window(entry, start_utc, end_utc):
-            filtered_out_of_window += 1
-            continue
-        arxiv_id = get_arxiv_id(entry)
-        if arxiv_id in seen_entry_ids:
-            continue
-        seen_entry_ids.add(arxiv_id)
-        entries.append(entry)
+        # Only entries accepted since the previous page are appended.
+        journal.append_page(
+            [_serialize_checkpoint_entry(entry) for entry in entries[journaled_count:]],
+            _checkpoint_cursor(stats, next_start, cursors),
+        )
+        journaled_count = len(entries)
+
+    query_plan: Dict[str, Any] = {}
+    try:
+        for entry in _baseline_source()(
+            start_utc=start_utc,
+            end_utc=end_utc,
+            start_offset=start_offset,
+            cursors=cursors,
+            on_page_complete=_checkpoint_page,
+            on_query_plan=query_plan.update,
+            on_request_progress=lambda message: _emit_progress(
+                progress_callback,
+                "baseline_fetch",
+                message,
+                "warning",
+                None,
+            ),
+            seen_ids=seen_entry_ids,
+        ):
+            _checkpoint(controller)
+            total_scanned += 1
+            if total_scanned % 25 == 0:
+                _emit_progress(progress_callback, "baseline_fetch", f"baseline scanned {total_scanned} papers", "running", None)
+            if not is_cs(entry):
+                filtered_non_cs += 1
+                continue
+            if not _entry_in_target_window(entry, start_utc, end_utc):
+                filtered_out_of_window += 1
+                continue
+            arxiv_id = get_arxiv_id(entry)
+            if arxiv_id in seen_entry_ids:
+                continue
+            seen_entry_ids.add(arxiv_id)
+            entries.append(entry)
+    finally:
+        journal.close()
 
     if DEBUG:
         print(f"[DEBUG] scanned={total_scanned} baseline_matches={len(entries)}")
@@ -385,11 +567,239 @@ def _collect_baseline_entries(
         "filtered_out_of_window": filtered_out_of_window,
         "cache_hit": False,
     }
-    _write_complete_baseline_cache(report_date, start_utc, end_utc, entries)
-    _clear_baseline_checkpoint(report_date)
+    if query_plan:
+        stats["query_plan"] = query_plan
+        if "naive_requests" in query_plan:
+            plan_message = (
+                f"arXiv {query_plan['plan']} query plan used {query_plan['requests']} requests "
+                f"(naive plan ~{query_plan['naive_requests']}), saved {query_plan['requests_saved']} requests "
+                f"and ~{query_plan['bytes_saved']} bytes"
+            )
+        else:
+            plan_message = (
+                f"arXiv {query_plan['plan']} harvest used {query_plan['requests']} requests "
+                f"and {query_plan['bytes']} bytes for {query_plan['rows']} papers"
+            )
+        _emit_progress(progress_callback, "baseline_fetch", plan_message, "running", None)
+    if write_complete_cache:
+        _write_complete_baseline_cache(report_date, start_utc, end_utc, entries, query_plan.get("totals"))
+    journal.discard()
     return entries, stats
+
+
+def _as_date(value: date | str) -> date:
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def collect_baseline_range(
+    start_day: date | str,
+    end_day: date | str,
+    controller: PipelineController | None = None,
+    progress_callback: ProgressCallback | None = None,
+) -> Dict[str, Any]:
+    """Fill the per-day baseline caches for ``start_day``..``end_day``, one API pass per run of missing days.
+
+    Days that already have a complete baseline cache are skipped, and the
+    missing days are grouped into runs of consecutive days so no cached day
+    is fetched again. Each run is queried once per category and the stream
+    is split into per-day ``baseline_entries_cache.bin`` files using
+    ``arxiv_day_window``. Progress is checkpointed under a range key per
+    run so an interrupted backfill resumes where it stopped.
+    """
+    start_day, end_day = _as_date(start_day), _as_date(end_day)
+    if end_day < start_day:
+        raise ValueError(f"range end {end_day} is before range start {start_day}")
+    windows: Dict[str, Tuple[datetime, datetime]] = {}
+    day = start_day
+    while day <= end_day:
+        windows[day.isoformat()] = arxiv_day_window(day)
+        day += timedelta(days=1)
+
+    missing = [
+        report_date for report_date, (start_utc, end_utc) in windows.items()
+        if _load_complete_baseline_cache(report_date, start_utc, end_utc) is None
+    ]
+    stats: Dict[str, Any] = {
+        "days": len(windows),
+        "cached_days": [report_date for report_date in windows if report_date not in missing],
+        "fetched_days": missing,
+        "matched_by_day": {},
+    }
+    if not missing:
+        return stats
+
+    runs: List[List[str]] = []
+    for report_date in missing:
+        if runs and _as_date(report_date) - _as_date(runs[-1][-1]) == timedelta(days=1):
+            runs[-1].append(report_date)
+        else:
+            runs.append([report_date])
+    totals = {"scanned": 0, "matched": 0, "filtered_non_cs": 0, "filtered_out_of_window": 0}
+    for run in runs:
+        _emit_progress(
+            progress_callback,
+            "baseline_fetch",
+            f"fetching baseline range {run[0]}..{run[-1]} in one pass",
+            "running",
+            None,
+        )
+        run_key = f"{run[0]}_{run[-1]}"
+        entries, fetch_stats = _collect_baseline_entries(
+            windows[run[0]][0],
+            windows[run[-1]][1],
+            report_date=run_key,
+            controller=controller,
+            progress_callback=progress_callback,
+            write_complete_cache=False,
+        )
+        by_day: Dict[str, List[Dict[str, Any]]] = {report_date: [] for report_date in run}
+        for entry in entries:
+            report_date = entry["published"].astimezone(LOCAL_TZ).date().isoformat()
+            if report_date in by_day and in_time_window(entry, *windows[report_date]):
+                by_day[report_date].append(entry)
+        for report_date, day_entries in by_day.items():
+            _write_complete_baseline_cache(report_date, *windows[report_date], day_entries)
+            stats["matched_by_day"][report_date] = len(day_entries)
+        # The run's journal is gone; drop the directory it was kept in.
+        try:
+            _baseline_checkpoint_path(run_key).parent.rmdir()
+        except OSError:
+            pass
+        for key in totals:
+            totals[key] += fetch_stats[key]
+    stats.update(totals)
+    return stats
+
+
+def _snapshot_index_path(snapshot_path: Path) -> Path:
+    return Path(CACHE_REPORT_DIR) / "_snapshot_index" / f"{Path(snapshot_path).name}.index.json.gz"
+
+
+def import_baseline_snapshot(
+    snapshot_path: Path | str,
+    start_day: date | str,
+    end_day: date | str,
+    overwrite: bool = False,
+    progress_callback: ProgressCallback | None = None,
+) -> Dict[str, Any]:
+    """Fill the per-day baseline caches for ``start_day``..``end_day`` from a local metadata snapshot.
+
+    The snapshot (the arXiv JSON-lines metadata dump) is scanned once into
+    a per-day byte-range index of its CS rows, kept under
+    ``CACHE_REPORT_DIR/_snapshot_index``; each day's rows are then read
+    straight from the snapshot. Days that already have a complete baseline
+    cache are skipped unless ``overwrite`` is set.
+    """
+    start_day, end_day = _as_date(start_day), _as_date(end_day)
+    if end_day < start_day:
+        raise ValueError(f"range end {end_day} is before range start {start_day}")
+    snapshot_path = Path(snapshot_path)
+    index, built = load_or_build_snapshot_index(
+        snapshot_path,
+        _snapshot_index_path(snapshot_path),
+        progress=lambda scanned, indexed: _emit_progress(
+            progress_callback,
+            "baseline_fetch",
+            f"indexing snapshot {snapshot_path.name}: scanned {scanned} rows, {indexed} CS papers",
+            "running",
+            None,
+        ),
+    )
+    stats: Dict[str, Any] = {
+        "index_built": built,
+        "snapshot_rows": index.scanned,
+        "indexed_papers": index.indexed,
+        "cached_days": [],
+        "imported_days": [],
+        "matched_by_day": {},
+    }
+    day = start_day
+    while day <= end_day:
+        report_date = day.isoformat()
+        start_utc, end_utc = arxiv_day_window(day)
+        day += timedelta(days=1)
+        if not overwrite and _load_complete_baseline_cache(report_date, start_utc, end_utc) is not None:
+            stats["cached_days"].append(report_date)
+            continue
+        entries = index.rows_for_day(report_date)
+        _write_complete_baseline_cache(report_date, start_utc, end_utc, entries)
+        stats["imported_days"].append(report_date)
+        stats["matched_by_day"][report_date] = len(entries)
+    _emit_progress(
+        progress_callback,
+        "baseline_fetch",
+        f"imported {len(stats['imported_days'])} baseline days from snapshot {snapshot_path.name}",
+        "ok",
+        None,
+    )
+    return stats
 
 
+def _format_wait(seconds: float) -> str:
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{secs:02d}s"
+
+
+def wait_for_arxiv_cooldown(
+    until: datetime,
+    controller: PipelineController | None = None,
+    progress_callback: ProgressCallback | None = None,
+) -> float:
+    """Sleep until the arXiv API cooldown ends at ``until`` and return the seconds waited.
+
+    The remaining time is reported on the ``cooldown`` stage every
+    ``COOLDOWN_PROGRESS_INTERVAL_SEC``; cancelling ``controller`` ends the
+    wait with :class:`PipelineCancelled`.
+    """
+    # One spare second, so the resumed request does not land on the boundary.
+    resume_at = until.astimezone(timezone.utc) + timedelta(seconds=1)
+    started = time.monotonic()
+    total = max(0.0, (resume_at - datetime.now(timezone.utc)).total_seconds())
+    while True:
+        remaining = (resume_at - datetime.now(timezone.utc)).total_seconds()
+        if remaining <= 0:
+            break
+        _emit_progress(
+            progress_callback,
+            "cooldown",
+            f"arXiv API cooldown, resuming in {_format_wait(remaining)} at {resume_at.astimezone(LOCAL_TZ):%Y-%m-%d %H:%M:%S}",
+            "waiting",
+            100.0 * (1.0 - remaining / total) if total else 100.0,
+        )
+        pause = min(remaining, max(1.0, COOLDOWN_PROGRESS_INTERVAL_SEC))
+        if controller:
+            controller.sleep(pause)
+        else:
+            time.sleep(pause)
+    waited = time.monotonic() - started
+    _emit_progress(progress_callback, "cooldown", "arXiv API cooldown over, resuming", "running", 100.0)
+    return waited
+
+
+def run_after_cooldowns(
+    task: Callable[[], Any],
+    controller: PipelineController | None = None,
+    progress_callback: ProgressCallback | None = None,
+    max_resumes: int = COOLDOWN_WAIT_MAX_RESUMES,
+) -> Any:
+    """Run ``task``; after an arXiv 429 cooldown, wait it out and run ``task`` again.
+
+    Baseline fetches checkpoint every page, so the rerun continues where
+    the rate limit stopped it. The error is re-raised once ``max_resumes``
+    waits are used up or when it carries no end time.
+    """
+    resumes = 0
+    while True:
+        try:
+            return task()
+        except ArxivRateLimitError as exc:
+            if exc.retry_at is None or resumes >= max_resumes:
+                raise
+            resumes += 1
+            wait_for_arxiv_cooldown(exc.retry_at, controller=controller, progress_callback=progress_callback)
+
+
 def select_candidates(
     baseline_entries: List[Dict[str, Any]],
     progress_callback: ProgressCallback | None = None,
@@ -490,6 +900,10 @@ def _record_stage_metrics(report: PipelineReport, stage_name: str, metrics: Dict
         stage.set_metric(key, value)
 
 
+def _route_cache_delta(before: Dict[str, float]) -> Dict[str, float]:
+    return {key: round(value - before.get(key, 0), 3) for key, value in route_cache_stats().items()}
+
+
 def _json_default(value: Any):
     if isinstance(value, datetime):
         return value.isoformat()
@@ -499,9 +913,7 @@ def _json_default(value: Any):
 
 
 def _serialize_entry(entry: Dict[str, Any], cache_path: str | None = None, matched_orgs: List[str] | None = None) -> Dict[str, Any]:
-    serialized = _deserialize_iso_datetime_fields(_serialize_checkpoint_entry(entry))
-    serialized = _serialize_checkpoint_entry(serialized)
-    serialized["arxiv_id"] = get_arxiv_id(entry)
+    serialized = _serialize_checkpoint_entry(entry)
     serialized["cached_pdf"] = cache_path
     serialized["matched_orgs"] = matched_orgs or []
     return serialized
@@ -559,11 +971,18 @@ def run_pipeline(
         _checkpoint(controller)
         start_utc, end_utc, report_date = _resolve_window(now, target_day)
         result["report_date"] = report_date
+        open_request_trace(_request_trace_path(report_date))
         _debug_print_window(now, start_utc, end_utc)
         _record_stage_metrics(report, "time_window", {"now": now.isoformat(), "start_utc": start_utc.isoformat(), "end_utc": end_utc.isoformat(), "report_date": report_date, "requested_date": str(target_day or report_date)})
         _finish_stage(report, "time_window", progress_callback, f"time window ready: {report_date}")
 
         _begin_stage(report, "baseline_fetch", progress_callback, "starting baseline fetch")
+        wait_before = request_wait_stats(reset_max=True)
+        pool_before = connection_pool_stats()
+        api_cache_before = api_cache_stats()
+        route_cache_before = route_cache_stats()
+        trace_before = request_trace_position()
+        page_size_events_before = len(api_page_size_stats()["history"])
         baseline_entries, baseline_stats = _collect_baseline_entries(
             start_utc,
             end_utc,
@@ -571,6 +990,13 @@ def run_pipeline(
             controller=controller,
             progress_callback=progress_callback,
         )
+        baseline_stats["limiter_wait"] = wait_stats_delta(wait_before, request_wait_stats())
+        baseline_stats["connection_pool"] = summarize_pool_stats(pool_before, connection_pool_stats())
+        baseline_stats["api_cache"] = {key: value - api_cache_before.get(key, 0) for key, value in api_cache_stats().items()}
+        baseline_stats["route_cache"] = _route_cache_delta(route_cache_before)
+        baseline_stats["request_trace"] = request_trace_summary(trace_before)
+        page_sizes = api_page_size_stats()
+        baseline_stats["page_size"] = {"learned": page_sizes["sizes"], "history": page_sizes["history"][page_size_events_before:]}
         _record_stage_metrics(report, "baseline_fetch", baseline_stats)
         if baseline_stats["matched"] == 0:
             report.stage("baseline_fetch").add_warning("baseline fetch returned no in-window papers")
@@ -597,6 +1023,10 @@ def run_pipeline(
         _finish_stage(report, "priority_ranking", progress_callback, f"priority ranking complete, {priority_stats['priority_entries']} priority papers")
 
         _begin_stage(report, "pdf_cache", progress_callback, "starting PDF cache")
+        wait_before = request_wait_stats(reset_max=True)
+        pool_before = connection_pool_stats()
+        route_cache_before = route_cache_stats()
+        trace_before = request_trace_position()
         id2pdf, cache_stats = cache_pdfs_with_stats(result["ordered_candidates"], report_date=report_date, controller=controller, progress_callback=progress_callback)
         result["cached"] = id2pdf
         result["ordered_candidates"] = [
@@ -604,6 +1034,10 @@ def run_pipeline(
             if get_arxiv_id(entry) in id2pdf
         ]
         cache_stats["pdf_available_candidates"] = len(result["ordered_candidates"])
+        cache_stats["limiter_wait"] = wait_stats_delta(wait_before, request_wait_stats())
+        cache_stats["connection_pool"] = summarize_pool_stats(pool_before, connection_pool_stats())
+        cache_stats["route_cache"] = _route_cache_delta(route_cache_before)
+        cache_stats["request_trace"] = request_trace_summary(trace_before)
         _record_stage_metrics(report, "pdf_cache", cache_stats)
         for message in cache_stats["errors"][:20]:
             report.stage("pdf_cache").add_warning(message)
@@ -652,6 +1086,8 @@ def run_pipeline(
     except Exception as exc:
         _emit_progress(progress_callback, "pipeline", f"pipeline failed: {exc}", "error", None)
         raise
+    finally:
+        close_request_trace()
 
 
 def print_report(report: PipelineReport) -> None:
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import BinaryIO, Container, List, Optional
+from xml.etree.ElementTree import iterparse
+
+from paper import Paper, arxiv_id_from_entry_id
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ARXIV_NS = "{http://arxiv.org/schemas/atom}"
+OPENSEARCH_NS = "{http://a9.com/-/spec/opensearch/1.1/}"
+
+_ENTRY_TAG = f"{ATOM_NS}entry"
+_HEADER_TAGS = {
+    f"{OPENSEARCH_NS}totalResults": "total_results",
+    f"{OPENSEARCH_NS}startIndex": "start_index",
+    f"{OPENSEARCH_NS}itemsPerPage": "items_per_page",
+}
+
+
+@dataclass
+class AtomPage:
+    """One page of an arXiv API response, already reduced to pipeline rows."""
+
+    rows: List[Paper] = field(default_factory=list)
+    ids: List[str] = field(default_factory=list)
+    total_results: int | None = None
+    start_index: int | None = None
+    items_per_page: int | None = None
+    skipped_seen: int = 0
+    payload_bytes: int = 0
+
+    @property
+    def entry_count(self) -> int:
+        return len(self.ids)
+
+
+def _parse_dt(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc)
+    except Exception:
+        return None
+
+
+def _parse_header_int(value: str | None) -> int | None:
+    try:
+        return int((value or "").strip())
+    except ValueError:
+        return None
+
+
+def _text(elem) -> str:
+    return (elem.text or "").strip() if elem is not None else ""
+
+
+def _pdf_link(elem) -> str | None:
+    for link in elem.iterfind(f"{ATOM_NS}link"):
+        if link.get("type") == "application/pdf" or link.get("title") == "pdf":
+            return link.get("href")
+    return None
+
+
+def _entry_row(elem, entry_id: str, arxiv_id: str) -> Paper:
+    categories = [
+        term
+        for term in ((tag.get("term") or "").strip() for tag in elem.iterfind(f"{ATOM_NS}category"))
+        if term
+    ]
+    primary = elem.find(f"{ARXIV_NS}primary_category")
+    primary_category = primary.get("term") if primary is not None else None
+    if primary_category and primary_category not in categories:
+        categories.insert(0, primary_category)
+    return Paper(
+        id=entry_id,
+        arxiv_id=arxiv_id,
+        title=_text(elem.find(f"{ATOM_NS}title")),
+        summary=_text(elem.find(f"{ATOM_NS}summary")),
+        authors=[_text(author.find(f"{ATOM_NS}name")) for author in elem.iterfind(f"{ATOM_NS}author")],
+        published=_parse_dt(_text(elem.find(f"{ATOM_NS}published"))),
+        updated=_parse_dt(_text(elem.find(f"{ATOM_NS}updated"))),
+        primary_category=primary_category,
+        categories=categories,
+        comment=_text(elem.find(f"{ARXIV_NS}comment")),
+        journal_ref=_text(elem.find(f"{ARXIV_NS}journal_ref")),
+        pdf_url=_pdf_link(elem),
+    )
+
+
+def parse_atom_page(source: str | bytes | BinaryIO, seen_ids: Container[str] | None = None) -> AtomPage:
+    """Incrementally parse an arXiv Atom page into compact row dicts.
+
+    Entries whose arXiv ID is in ``seen_ids`` are counted but not converted,
+    and every finished ``<entry>`` element is released as soon as it is read.
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    payload_bytes = 0
+    if isinstance(source, (bytes, bytearray)):
+        payload_bytes = len(source)
+        source = io.BytesIO(source)
+
+    page = AtomPage(payload_bytes=payload_bytes)
+    root = None
+    for event, elem in iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            continue
+        if elem.tag == _ENTRY_TAG:
+            entry_id = _text(elem.find(f"{ATOM_NS}id"))
+            arxiv_id = arxiv_id_from_entry_id(entry_id)
+            page.ids.append(arxiv_id)
+            if seen_ids is not None and arxiv_id in seen_ids:
+                page.skipped_seen += 1
+            else:
+                page.rows.append(_entry_row(elem, entry_id, arxiv_id))
+            root.clear()
+        elif elem.tag in _HEADER_TAGS:
+            setattr(page, _HEADER_TAGS[elem.tag], _parse_header_int(elem.text))
+    return page
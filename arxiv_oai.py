@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import io
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import BinaryIO, Container, List, Optional
+from xml.etree.ElementTree import iterparse
+
+from config import ARXIV_BASE_URL
+from paper import Paper
+
+OAI_NS = "{http://www.openarchives.org/OAI/2.0/}"
+RAW_NS = "{http://arxiv.org/OAI/arXivRaw/}"
+
+_LIST_TAG = f"{OAI_NS}ListRecords"
+_RECORD_TAG = f"{OAI_NS}record"
+_TOKEN_TAG = f"{OAI_NS}resumptionToken"
+_ERROR_TAG = f"{OAI_NS}error"
+_AUTHOR_SEPARATOR = re.compile(r",\s*and\s+|\s+and\s+|,\s*")
+
+
+@dataclass
+class OaiPage:
+    """One ``ListRecords`` response in the ``arXivRaw`` format, reduced to pipeline rows."""
+
+    rows: List[Paper] = field(default_factory=list)
+    ids: List[str] = field(default_factory=list)
+    # ``None`` once the list is complete (the last page carries an empty token).
+    resumption_token: str | None = None
+    complete_list_size: int | None = None
+    cursor: int | None = None
+    deleted: int = 0
+    skipped_seen: int = 0
+    error_code: str | None = None
+    error_message: str = ""
+    payload_bytes: int = 0
+
+    @property
+    def record_count(self) -> int:
+        return len(self.ids) + self.deleted
+
+
+def _text(elem) -> str:
+    return (elem.text or "").strip() if elem is not None else ""
+
+
+def parse_version_date(value: str) -> Optional[datetime]:
+    """UTC time of an arXiv version date (``Mon, 1 Jun 2026 17:59:58 GMT``)."""
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _parse_int(value: str | None) -> int | None:
+    try:
+        return int((value or "").strip())
+    except ValueError:
+        return None
+
+
+def split_authors(value: str) -> List[str]:
+    """Split an arXivRaw ``authors`` line (``A, B and C``) into names."""
+    collapsed = " ".join(value.split())
+    return [name for name in _AUTHOR_SEPARATOR.split(collapsed) if name]
+
+
+def _record_arxiv_id(raw) -> str:
+    """Versioned arXiv ID of an ``arXivRaw`` record, read without converting it."""
+    latest = ""
+    for version in raw.iterfind(f"{RAW_NS}version"):
+        latest = version.get("version") or ""
+    return f"{_text(raw.find(f'{RAW_NS}id'))}{latest}"
+
+
+def _record_row(raw, arxiv_id: str) -> Paper:
+    versions = [parse_version_date(_text(version.find(f"{RAW_NS}date"))) for version in raw.iterfind(f"{RAW_NS}version")]
+    categories = _text(raw.find(f"{RAW_NS}categories")).split()
+    # The same site the PDF cache downloads from, so stand-in runs stay local.
+    site = ARXIV_BASE_URL or "https://arxiv.org"
+    return Paper(
+        id=f"{site}/abs/{arxiv_id}",
+        arxiv_id=arxiv_id,
+        title=_text(raw.find(f"{RAW_NS}title")),
+        summary=_text(raw.find(f"{RAW_NS}abstract")),
+        authors=split_authors(_text(raw.find(f"{RAW_NS}authors"))),
+        # The search API's ``published`` is the v1 submission time.
+        published=versions[0] if versions else None,
+        updated=versions[-1] if versions else None,
+        primary_category=categories[0] if categories else None,
+        categories=categories,
+        comment=_text(raw.find(f"{RAW_NS}comments")),
+        journal_ref=_text(raw.find(f"{RAW_NS}journal-ref")),
+        pdf_url=f"{site}/pdf/{arxiv_id}",
+    )
+
+
+def parse_list_records(source: str | bytes | BinaryIO, seen_ids: Container[str] | None = None) -> OaiPage:
+    """Incrementally parse an OAI-PMH ``ListRecords`` page into the rows ``parse_atom_page`` produces.
+
+    Deleted records are counted and dropped; records whose versioned ID is
+    in ``seen_ids`` are counted but not converted.
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    payload_bytes = 0
+    if isinstance(source, (bytes, bytearray)):
+        payload_bytes = len(source)
+        source = io.BytesIO(source)
+
+    page = OaiPage(payload_bytes=payload_bytes)
+    records_parent = None
+    for event, elem in iterparse(source, events=("start", "end")):
+        if event == "start":
+            if elem.tag == _LIST_TAG:
+                records_parent = elem
+            continue
+        if elem.tag == _RECORD_TAG:
+            header = elem.find(f"{OAI_NS}header")
+            raw = elem.find(f"{OAI_NS}metadata/{RAW_NS}arXivRaw")
+            if (header is not None and header.get("status") == "deleted") or raw is None:
+                page.deleted += 1
+            else:
+                arxiv_id = _record_arxiv_id(raw)
+                page.ids.append(arxiv_id)
+                if seen_ids is not None and arxiv_id in seen_ids:
+                    page.skipped_seen += 1
+                else:
+                    page.rows.append(_record_row(raw, arxiv_id))
+            # Records sit under <ListRecords>; drop the finished ones from it.
+            if records_parent is not None:
+                records_parent.clear()
+        elif elem.tag == _TOKEN_TAG:
+            page.resumption_token = _text(elem) or None
+            page.complete_list_size = _parse_int(elem.get("completeListSize"))
+            page.cursor = _parse_int(elem.get("cursor"))
+        elif elem.tag == _ERROR_TAG:
+            page.error_code = elem.get("code")
+            page.error_message = _text(elem)
+    return page
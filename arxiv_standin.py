@@ -0,0 +1,484 @@
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape, quoteattr
+
+from config import ARXIV_EXCLUDED_CATEGORIES, ARXIV_PRIMARY_CATEGORY_PREFIXES, LOCAL_TZ, MIN_PDF_BYTES
+from filters import arxiv_day_window
+
+_OTHER_CATEGORIES = ["math.OC", "stat.ML", "eess.IV", "eess.AS", "physics.optics", "q-bio.NC"]
+_INSTITUTIONS = [
+    "Tsinghua University",
+    "Peking University",
+    "Stanford University",
+    "Carnegie Mellon University",
+    "ETH Zurich",
+    "University of Cambridge",
+    "Google DeepMind",
+    "Microsoft Research",
+    "Meta AI",
+    "NVIDIA",
+    "ByteDance",
+    "Alibaba Group",
+    "Shanghai AI Laboratory",
+]
+_GIVEN_NAMES = ["Alice", "Bo", "Carla", "Deepak", "Elena", "Feng", "Grace", "Hiro", "Ines", "Jun", "Kofi", "Lena", "Mateo", "Nadia"]
+_FAMILY_NAMES = ["Zhang", "Li", "Smith", "Garcia", "Kumar", "Wang", "Muller", "Sato", "Okafor", "Chen", "Rossi", "Novak"]
+_TOPICS = ["Language Models", "Graph Neural Networks", "Robot Grasping", "Image Segmentation", "Code Generation", "Federated Learning", "Speech Recognition", "Program Repair"]
+_METHODS = ["Sparse Adapters", "Contrastive Pretraining", "Diffusion Policies", "Retrieval Augmentation", "Mixture of Experts", "Curriculum Learning"]
+
+_QUERY_TOKEN = re.compile(r"submittedDate:\[(\d{12}) TO (\d{12})\]|\(|\)|ANDNOT\b|AND\b|OR\b|(\w+):([^\s()]+)")
+
+
+@dataclass(frozen=True)
+class StandinPaper:
+    arxiv_id: str
+    title: str
+    summary: str
+    authors: Tuple[Tuple[str, str], ...]
+    primary_category: str
+    categories: Tuple[str, ...]
+    published: datetime
+    updated: datetime
+
+    @property
+    def base_id(self) -> str:
+        return self.arxiv_id.rsplit("v", 1)[0]
+
+
+def generate_corpus(days: Iterable[date], papers_per_day: int = 300, seed: int = 0) -> List[StandinPaper]:
+    """A deterministic set of submissions spread over the arXiv days ``days``, newest first.
+
+    Most papers are listed in a configured CS category; some carry an
+    excluded or non-CS primary category, and about a third are cross-listed,
+    so the category queries and the local filters both have work to do.
+    """
+    rng = random.Random(seed)
+    papers: List[StandinPaper] = []
+    numbers: Counter = Counter()
+    for day in sorted(set(days)):
+        start_utc, _ = arxiv_day_window(day)
+        offsets = sorted(rng.uniform(0, 86399) for _ in range(papers_per_day))
+        for offset in offsets:
+            published = (start_utc + timedelta(seconds=offset)).replace(microsecond=0)
+            month = published.strftime("%y%m")
+            numbers[month] += 1
+            version = 2 if rng.random() < 0.15 else 1
+            roll = rng.random()
+            if roll < 0.1:
+                primary = rng.choice(ARXIV_EXCLUDED_CATEGORIES)
+            elif roll < 0.2:
+                primary = rng.choice(_OTHER_CATEGORIES)
+            else:
+                primary = rng.choice(ARXIV_PRIMARY_CATEGORY_PREFIXES)
+            cross = rng.sample(ARXIV_PRIMARY_CATEGORY_PREFIXES + _OTHER_CATEGORIES, rng.choice([0, 0, 1, 2]))
+            categories = tuple(dict.fromkeys([primary, *cross]))
+            authors = tuple(
+                (f"{rng.choice(_GIVEN_NAMES)} {rng.choice(_FAMILY_NAMES)}", rng.choice(_INSTITUTIONS))
+                for _ in range(rng.randint(1, 5))
+            )
+            topic, method = rng.choice(_TOPICS), rng.choice(_METHODS)
+            papers.append(StandinPaper(
+                arxiv_id=f"{month}.{numbers[month]:05d}v{version}",
+                title=f"{method} for {topic}",
+                summary=f"We apply {method.lower()} to {topic.lower()} and report gains on standard benchmarks.",
+                authors=authors,
+                primary_category=primary,
+                categories=categories,
+                published=published,
+                updated=published + timedelta(days=version - 1),
+            ))
+    papers.sort(key=lambda paper: paper.published, reverse=True)
+    return papers
+
+
+def _parse_query(query: str) -> Callable[[StandinPaper], bool]:
+    """Compile the subset of arXiv ``search_query`` syntax the pipeline sends.
+
+    Terms are ``cat:`` (with a trailing ``*`` wildcard) and
+    ``submittedDate:[YYYYMMDDHHMM TO YYYYMMDDHHMM]``; AND, OR and ANDNOT
+    bind left to right, as on arXiv, with parentheses for grouping.
+    """
+    tokens = [match for match in _QUERY_TOKEN.finditer(query)]
+    position = 0
+
+    def term() -> Callable[[StandinPaper], bool]:
+        nonlocal position
+        if position >= len(tokens):
+            raise ValueError(f"incomplete query: {query}")
+        token = tokens[position]
+        position += 1
+        if token.group(0) == "(":
+            inner = expression()
+            if position >= len(tokens) or tokens[position].group(0) != ")":
+                raise ValueError(f"unbalanced query: {query}")
+            position += 1
+            return inner
+        if token.group(1):
+            low, high = token.group(1), token.group(2)
+            return lambda paper: low <= paper.published.strftime("%Y%m%d%H%M") <= high
+        if token.group(3) == "cat":
+            value = token.group(4)
+            if value.endswith("*"):
+                prefix = value[:-1]
+                return lambda paper: any(category.startswith(prefix) for category in paper.categories)
+            return lambda paper: value in paper.categories
+        raise ValueError(f"unsupported query term: {token.group(0)}")
+
+    def expression() -> Callable[[StandinPaper], bool]:
+        nonlocal position
+        result = term()
+        while position < len(tokens) and tokens[position].group(0) in ("AND", "OR", "ANDNOT"):
+            operator = tokens[position].group(0)
+            position += 1
+            left, right = result, term()
+            if operator == "AND":
+                result = lambda paper, left=left, right=right: left(paper) and right(paper)
+            elif operator == "OR":
+                result = lambda paper, left=left, right=right: left(paper) or right(paper)
+            else:
+                result = lambda paper, left=left, right=right: left(paper) and not right(paper)
+        return result
+
+    predicate = expression()
+    if position != len(tokens):
+        raise ValueError(f"unsupported query: {query}")
+    return predicate
+
+
+def _atom_time(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def render_feed(papers: Sequence[StandinPaper], total: int, start: int, max_results: int, base_url: str, query: str) -> str:
+    entries = []
+    for paper in papers:
+        authors = "".join(
+            f"<author><name>{escape(name)}</name>"
+            f"<arxiv:affiliation xmlns:arxiv=\"http://arxiv.org/schemas/atom\">{escape(affiliation)}</arxiv:affiliation></author>"
+            for name, affiliation in paper.authors
+        )
+        categories = "".join(
+            f"<category term={quoteattr(category)} scheme=\"http://arxiv.org/schemas/atom\"/>" for category in paper.categories
+        )
+        entries.append(
+            "<entry>"
+            f"<id>http://arxiv.org/abs/{paper.arxiv_id}</id>"
+            f"<updated>{_atom_time(paper.updated)}</updated>"
+            f"<published>{_atom_time(paper.published)}</published>"
+            f"<title>{escape(paper.title)}</title>"
+            f"<summary>{escape(paper.summary)}</summary>"
+            f"{authors}"
+            f"<link href=\"http://arxiv.org/abs/{paper.arxiv_id}\" rel=\"alternate\" type=\"text/html\"/>"
+            f"<link title=\"pdf\" href=\"{base_url}/pdf/{paper.arxiv_id}\" rel=\"related\" type=\"application/pdf\"/>"
+            f"<arxiv:primary_category xmlns:arxiv=\"http://arxiv.org/schemas/atom\" term={quoteattr(paper.primary_category)} scheme=\"http://arxiv.org/schemas/atom\"/>"
+            f"{categories}"
+            "</entry>"
+        )
+    opensearch = "xmlns:opensearch=\"http://a9.com/-/spec/opensearch/1.1/\""
+    return (
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n"
+        "<feed xmlns=\"http://www.w3.org/2005/Atom\">"
+        f"<title type=\"html\">ArXiv Query: {escape(query)}</title>"
+        f"<updated>{_atom_time(datetime.now(timezone.utc))}</updated>"
+        f"<opensearch:totalResults {opensearch}>{total}</opensearch:totalResults>"
+        f"<opensearch:startIndex {opensearch}>{start}</opensearch:startIndex>"
+        f"<opensearch:itemsPerPage {opensearch}>{max_results}</opensearch:itemsPerPage>"
+        + "".join(entries)
+        + "</feed>\n"
+    )
+
+
+def _pdf_text(value: str) -> str:
+    value = value.encode("latin-1", "replace").decode("latin-1")
+    return value.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_pdf(paper: StandinPaper, size: int) -> bytes:
+    """A one-page PDF with the title, authors and affiliations, padded to about ``size`` bytes.
+
+    The padding is an unreferenced stream object, so the text extraction of
+    the first page is unaffected and the file still clears MIN_PDF_BYTES.
+    """
+    lines = [paper.title, ", ".join(name for name, _ in paper.authors)]
+    lines += list(dict.fromkeys(affiliation for _, affiliation in paper.authors))
+    lines += ["Abstract", paper.summary]
+    text = "BT /F1 12 Tf 72 720 Td " + " 0 -18 Td ".join(f"({_pdf_text(line)}) Tj" for line in lines) + " ET"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(text), text.encode("latin-1")),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+
+    def assemble(padding: int) -> bytes:
+        body = objects + [b"<< /Length %d >>\nstream\n%s\nendstream" % (padding, b"0" * padding)]
+        out = bytearray(b"%PDF-1.4\n")
+        offsets = []
+        for number, obj in enumerate(body, start=1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(body) + 1)
+        out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+        out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(body) + 1, xref)
+        return bytes(out)
+
+    return assemble(max(0, size - len(assemble(0))))
+
+
+def render_html(paper: StandinPaper) -> str:
+    authors = "<br>".join(f"{escape(name)}, {escape(affiliation)}" for name, affiliation in paper.authors)
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<title>{escape(paper.title)}</title></head><body>"
+        f"<h1 class=\"ltx_title\">{escape(paper.title)}</h1>"
+        f"<div class=\"ltx_authors\">{authors}</div>"
+        f"<h6>Abstract</h6><p>{escape(paper.summary)}</p>"
+        "</body></html>\n"
+    )
+
+
+@dataclass
+class StandinOptions:
+    """Fault injection for :class:`ArxivStandin`; the defaults answer every request at once."""
+
+    # Delay before every response.
+    latency_sec: float = 0.0
+    # Throttle response bodies to this rate; 0 sends them at once.
+    body_bytes_per_sec: float = 0.0
+    # Answer every Nth API request with 429; 0 never does.
+    throttle_every: int = 0
+    # Also answer API requests that arrive closer together than this with 429.
+    min_api_interval_sec: float = 0.0
+    # Retry-After of the 429 answers.
+    retry_after_sec: int = 5
+    # Answer API requests asking for more than this many results with 503; 0 never does.
+    max_results_limit: int = 0
+    # Size of every generated PDF.
+    pdf_bytes: int = MIN_PDF_BYTES + 64 * 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_StandinHTTPServer"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.server.standin.handle(self)
+
+
+class _StandinHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, standin: "ArxivStandin") -> None:
+        self.standin = standin
+        super().__init__(address, _Handler)
+
+
+class ArxivStandin:
+    """A local HTTP server that answers like arXiv's search API, /pdf and /html for a generated corpus.
+
+    Start it, point ``DAILYPAPER_ARXIV_BASE_URL`` (or ``ARXIV_BASE_URL`` in
+    config.py) at :attr:`base_url`, and the whole pipeline runs offline:
+    category and ``submittedDate`` queries with paging and opensearch
+    totals, PDF downloads and the HTML fallback. :class:`StandinOptions`
+    adds latency, 429 with Retry-After, 503 on large pages and slow bodies.
+    """
+
+    def __init__(
+        self,
+        corpus: Sequence[StandinPaper],
+        options: StandinOptions | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.corpus = list(corpus)
+        self.options = options or StandinOptions()
+        self._by_id: Dict[str, StandinPaper] = {}
+        for paper in self.corpus:
+            self._by_id[paper.arxiv_id] = paper
+            self._by_id[paper.base_id] = paper
+        self._address = (host, port)
+        self._server: _StandinHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._requests: Counter = Counter()
+        self._statuses: Counter = Counter()
+        self._api_requests = 0
+        self._last_api_request: float | None = None
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("arXiv stand-in is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        if self._server is None:
+            self._server = _StandinHTTPServer(self._address, self)
+            self._thread = threading.Thread(target=self._server.serve_forever, name="arxiv-standin", daemon=True)
+            self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ArxivStandin":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {"requests": dict(self._requests), "statuses": dict(self._statuses)}
+
+    def handle(self, request: BaseHTTPRequestHandler) -> None:
+        parsed = urlparse(request.path)
+        path = parsed.path.rstrip("/")
+        if self.options.latency_sec > 0:
+            time.sleep(self.options.latency_sec)
+        if path.endswith("/api/query"):
+            self._count("api")
+            self._answer_query(request, parse_qs(parsed.query))
+            return
+        kind, _, arxiv_id = path.lstrip("/").partition("/")
+        self._count(kind if kind in ("pdf", "html", "abs") else "other")
+        paper = self._by_id.get(arxiv_id[:-4] if arxiv_id.endswith(".pdf") else arxiv_id)
+        if kind == "pdf" and paper is not None:
+            self._send(request, 200, render_pdf(paper, self.options.pdf_bytes), "application/pdf")
+        elif kind in ("html", "abs") and paper is not None:
+            self._send(request, 200, render_html(paper).encode("utf-8"), "text/html; charset=utf-8")
+        else:
+            self._send(request, 404, b"not found", "text/plain")
+
+    def _count(self, kind: str) -> None:
+        with self._lock:
+            self._requests[kind] += 1
+
+    def _throttled(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            self._api_requests += 1
+            previous, self._last_api_request = self._last_api_request, now
+            if self.options.throttle_every and self._api_requests % self.options.throttle_every == 0:
+                return True
+            return bool(
+                self.options.min_api_interval_sec
+                and previous is not None
+                and now - previous < self.options.min_api_interval_sec
+            )
+
+    def _answer_query(self, request: BaseHTTPRequestHandler, params: Dict[str, List[str]]) -> None:
+        if self._throttled():
+            self._send(request, 429, b"Rate exceeded.", "text/plain", {"Retry-After": str(self.options.retry_after_sec)})
+            return
+        query = (params.get("search_query") or [""])[0]
+        try:
+            start = int((params.get("start") or ["0"])[0])
+            max_results = int((params.get("max_results") or ["10"])[0])
+            predicate = _parse_query(query) if query.strip() else (lambda paper: True)
+        except ValueError as exc:
+            self._send(request, 400, str(exc).encode("utf-8"), "text/plain")
+            return
+        if self.options.max_results_limit and max_results > self.options.max_results_limit:
+            self._send(request, 503, b"Service Unavailable", "text/plain", {"Retry-After": str(self.options.retry_after_sec)})
+            return
+        matches = [paper for paper in self.corpus if predicate(paper)]
+        id_list = {value.strip() for value in ",".join(params.get("id_list") or []).split(",") if value.strip()}
+        if id_list:
+            matches = [paper for paper in matches if paper.arxiv_id in id_list or paper.base_id in id_list]
+        sort_by = (params.get("sortBy") or ["submittedDate"])[0]
+        ascending = (params.get("sortOrder") or ["descending"])[0] == "ascending"
+        key = (lambda paper: paper.updated) if sort_by == "lastUpdatedDate" else (lambda paper: paper.published)
+        matches.sort(key=key, reverse=not ascending)
+        page = matches[start:start + max(0, max_results)]
+        feed = render_feed(page, len(matches), start, max_results, self.base_url, query)
+        self._send(request, 200, feed.encode("utf-8"), "application/atom+xml; charset=utf-8")
+
+    def _send(self, request: BaseHTTPRequestHandler, status: int, body: bytes, content_type: str, headers: Dict[str, str] | None = None) -> None:
+        with self._lock:
+            self._statuses[str(status)] += 1
+        try:
+            request.send_response(status)
+            request.send_header("Content-Type", content_type)
+            request.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                request.send_header(name, value)
+            request.end_headers()
+            rate = self.options.body_bytes_per_sec
+            if rate <= 0:
+                request.wfile.write(body)
+                return
+            chunk = max(1024, int(rate / 10))
+            for offset in range(0, len(body), chunk):
+                request.wfile.write(body[offset:offset + chunk])
+                request.wfile.flush()
+                time.sleep(len(body[offset:offset + chunk]) / rate)
+        except (BrokenPipeError, ConnectionResetError):
+            request.close_connection = True
+
+
+def main() -> None:
+    today = datetime.now(LOCAL_TZ).date()
+    parser = argparse.ArgumentParser(description="Serve a generated arXiv corpus for offline pipeline runs.")
+    parser.add_argument("--days", nargs="*", type=date.fromisoformat, help="arXiv days to generate (default: the last three)")
+    parser.add_argument("--papers-per-day", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before every response")
+    parser.add_argument("--body-rate", type=float, default=0.0, help="response body bytes per second (0: unthrottled)")
+    parser.add_argument("--throttle-every", type=int, default=0, help="answer every Nth API request with 429")
+    parser.add_argument("--min-api-interval", type=float, default=0.0, help="answer API requests closer than this with 429")
+    parser.add_argument("--retry-after", type=int, default=5)
+    parser.add_argument("--max-results-limit", type=int, default=0, help="answer larger API pages with 503")
+    args = parser.parse_args()
+
+    days = args.days or [today - timedelta(days=offset) for offset in (1, 2, 3)]
+    options = StandinOptions(
+        latency_sec=args.latency,
+        body_bytes_per_sec=args.body_rate,
+        throttle_every=args.throttle_every,
+        min_api_interval_sec=args.min_api_interval,
+        retry_after_sec=args.retry_after,
+        max_results_limit=args.max_results_limit,
+    )
+    standin = ArxivStandin(generate_corpus(days, args.papers_per_day, args.seed), options, host=args.host, port=args.port)
+    base_url = standin.start()
+    print(f"arXiv stand-in with {len(standin.corpus)} papers on {', '.join(str(day) for day in sorted(days))}")
+    print(f"set DAILYPAPER_ARXIV_BASE_URL={base_url} for the pipeline; Ctrl+C stops")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin.stop()
+        print(standin.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import zlib
+from collections.abc import Mapping as MappingABC
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Sequence
+
+from config import DEBUG
+
+
+class CheckpointJournal:
+    """Append-only JSONL checkpoint for an in-progress baseline fetch.
+
+    The file holds one ``header`` record, then ``entry`` records for accepted
+    papers and a ``cursor`` record after each finished page. Only entries
+    followed by a cursor count on replay; a torn last line from a crash is
+    dropped and cut off before appending resumes. Pages are flushed as they
+    are written and fsynced every ``fsync_every`` pages and on close.
+    """
+
+    def __init__(self, path: Path, header: Mapping[str, Any], fsync_every: int = 8) -> None:
+        self.path = Path(path)
+        self.header = {"type": "header", **header}
+        self.fsync_every = max(1, int(fsync_every))
+        self._handle = None
+        self._unsynced_pages = 0
+
+    def replay(self) -> Dict[str, Any] | None:
+        """Return ``{"entries", "cursor", "valid_bytes"}`` for a journal matching the header, else ``None``."""
+        try:
+            data = self.path.read_bytes()
+        except OSError:
+            return None
+        entries: List[Dict[str, Any]] = []
+        pending: List[Dict[str, Any]] = []
+        cursor: Dict[str, Any] | None = None
+        header_seen = False
+        valid_bytes = 0
+        offset = 0
+        for raw in data.splitlines(keepends=True):
+            offset += len(raw)
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                break
+            if not isinstance(record, dict):
+                break
+            if not header_seen:
+                if record != self.header:
+                    return None
+                header_seen = True
+                valid_bytes = offset
+            elif record.get("type") == "entry":
+                pending.append(record.get("entry") or {})
+            elif record.get("type") == "cursor":
+                entries.extend(pending)
+                pending = []
+                cursor = record
+                valid_bytes = offset
+        if not header_seen:
+            return None
+        return {"entries": entries, "cursor": cursor, "valid_bytes": valid_bytes}
+
+    def open(self, resume_bytes: int | None = None) -> None:
+        """Start a new journal, or append to the replayed one after its last complete page."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume_bytes:
+            self._handle = self.path.open("r+b")
+            self._handle.truncate(resume_bytes)
+            self._handle.seek(resume_bytes)
+            return
+        self._handle = self.path.open("wb")
+        self._write(self.header)
+        self._sync()
+
+    def append_page(self, entries: Iterable[Mapping[str, Any]], cursor: Mapping[str, Any]) -> None:
+        if self._handle is None:
+            self.open()
+        for entry in entries:
+            self._write({"type": "entry", "entry": entry})
+        self._write({"type": "cursor", **cursor})
+        self._handle.flush()
+        self._unsynced_pages += 1
+        if self._unsynced_pages >= self.fsync_every:
+            self._sync()
+
+    def close(self) -> None:
+        if self._handle is None:
+            return
+        try:
+            self._sync()
+        finally:
+            self._handle.close()
+            self._handle = None
+
+    def discard(self) -> None:
+        self.close()
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError as exc:
+            if DEBUG:
+                print(f"[WARN] failed to remove checkpoint journal {self.path}: {exc}")
+
+    def _write(self, record: Mapping[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        self._handle.write(line.encode("utf-8") + b"\n")
+
+    def _sync(self) -> None:
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._unsynced_pages = 0
+
+
+_COMPACT_MAGIC = b"DPBASE1\n"
+_HEADER_LENGTH = struct.Struct(">I")
+
+RowDecoder = Callable[[Dict[str, Any]], Mapping[str, Any]]
+
+
+class BaselineIndexRow(NamedTuple):
+    arxiv_id: str
+    entry_id: str
+    primary_category: str | None
+    categories: List[str]
+    published: datetime | None
+    pdf_url: str | None
+    offset: int
+    length: int
+
+
+def write_compact_baseline(
+    path: Path,
+    meta: Mapping[str, Any],
+    rows: Iterable[Mapping[str, Any]],
+    index_fields: Callable[[Mapping[str, Any]], Sequence[Any]],
+) -> None:
+    """Write serialized ``rows`` as a compact baseline file.
+
+    The file starts with a zlib-compressed JSON header holding ``meta`` and
+    one index record per row (see :class:`BaselineIndexRow`), followed by
+    every row compressed on its own so any one of them can be read back
+    without touching the others. ``index_fields`` returns the first six
+    index fields of a serialized row, with ``published`` as ISO text.
+    """
+    index: List[List[Any]] = []
+    blobs: List[bytes] = []
+    offset = 0
+    for row in rows:
+        blob = zlib.compress(json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+        index.append([*index_fields(row), offset, len(blob)])
+        blobs.append(blob)
+        offset += len(blob)
+    header = zlib.compress(
+        json.dumps({"meta": dict(meta), "index": index}, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        6,
+    )
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(path.suffix + ".part")
+    with temp_path.open("wb") as handle:
+        handle.write(_COMPACT_MAGIC)
+        handle.write(_HEADER_LENGTH.pack(len(header)))
+        handle.write(header)
+        for blob in blobs:
+            handle.write(blob)
+    temp_path.replace(path)
+
+
+def _parse_published(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+class CompactBaseline:
+    """Read side of :func:`write_compact_baseline`: the index up front, rows on demand."""
+
+    def __init__(self, path: Path, meta: Dict[str, Any], index: List[BaselineIndexRow], body_start: int, decode_row: RowDecoder) -> None:
+        self.path = Path(path)
+        self.meta = meta
+        self.index = index
+        self._body_start = body_start
+        self._decode_row = decode_row
+
+    @classmethod
+    def open(cls, path: Path, decode_row: RowDecoder) -> "CompactBaseline | None":
+        """Read only the header of ``path``; ``None`` when it is missing or not a compact baseline."""
+        try:
+            with Path(path).open("rb") as handle:
+                if handle.read(len(_COMPACT_MAGIC)) != _COMPACT_MAGIC:
+                    return None
+                (header_length,) = _HEADER_LENGTH.unpack(handle.read(_HEADER_LENGTH.size))
+                header = json.loads(zlib.decompress(handle.read(header_length)))
+            index = [
+                BaselineIndexRow(arxiv_id, entry_id, primary, list(categories or []), _parse_published(published), pdf_url, offset, length)
+                for arxiv_id, entry_id, primary, categories, published, pdf_url, offset, length in header["index"]
+            ]
+        except (OSError, ValueError, KeyError, TypeError, struct.error, zlib.error):
+            return None
+        body_start = len(_COMPACT_MAGIC) + _HEADER_LENGTH.size + header_length
+        return cls(Path(path), header.get("meta") or {}, index, body_start, decode_row)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def load_row(self, position: int) -> Mapping[str, Any]:
+        record = self.index[position]
+        # A handle per read keeps the file free to be replaced (Windows
+        # refuses to replace files that are still open).
+        with self.path.open("rb") as handle:
+            handle.seek(self._body_start + record.offset)
+            blob = handle.read(record.length)
+        return self._decode_row(json.loads(zlib.decompress(blob)))
+
+    def entries(self) -> List["LazyBaselineEntry"]:
+        return [LazyBaselineEntry(self, position) for position in range(len(self.index))]
+
+
+class LazyBaselineEntry(MappingABC):
+    """Read-only entry answering ``id``/``primary_category``/``categories``/``published`` from the index.
+
+    Any other key loads and keeps the full row. ``arxiv_id`` and ``pdf_url``
+    are attributes, as on :class:`paper.Paper`.
+    """
+
+    __slots__ = ("_baseline", "_position", "_row")
+
+    def __init__(self, baseline: CompactBaseline, position: int) -> None:
+        self._baseline = baseline
+        self._position = position
+        self._row: Mapping[str, Any] | None = None
+
+    @property
+    def arxiv_id(self) -> str:
+        return self._baseline.index[self._position].arxiv_id
+
+    @property
+    def pdf_url(self) -> str | None:
+        return self._baseline.index[self._position].pdf_url
+
+    def _head(self, key: str) -> Any:
+        record = self._baseline.index[self._position]
+        if key == "id":
+            return record.entry_id
+        if key == "primary_category":
+            return record.primary_category
+        if key == "categories":
+            return record.categories
+        if key == "published":
+            return record.published
+        raise KeyError(key)
+
+    def _full(self) -> Mapping[str, Any]:
+        if self._row is None:
+            self._row = self._baseline.load_row(self._position)
+        return self._row
+
+    def __getitem__(self, key: str) -> Any:
+        if self._row is None and key in _HEAD_KEYS:
+            return self._head(key)
+        return self._full()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._full())
+
+    def __len__(self) -> int:
+        return len(self._full())
+
+    def __repr__(self) -> str:
+        return f"LazyBaselineEntry({self._baseline.index[self._position].arxiv_id!r})"
+
+
+_HEAD_KEYS = frozenset({"id", "primary_category", "categories", "published"})
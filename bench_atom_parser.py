@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from arxiv_atom import _parse_dt, parse_atom_page
+from paper import Paper
+
+RECORDED_PAGE = Path(__file__).resolve().parent / "tests" / "fixtures" / "arxiv_api_page.xml"
+
+
+def _feedparser_rows(xml: str) -> List[Dict[str, Any]]:
+    """The previous fetch path: feedparser.parse plus a per-entry dict copy."""
+    import feedparser
+
+    rows = []
+    for entry in feedparser.parse(xml).entries:
+        categories = [
+            (tag.get("term") or "").strip()
+            for tag in (entry.get("tags", []) or [])
+            if (tag.get("term") or "").strip()
+        ]
+        primary_category = (entry.get("arxiv_primary_category") or {}).get("term")
+        if primary_category and primary_category not in categories:
+            categories.insert(0, primary_category)
+        rows.append({
+            "id": entry.get("id"),
+            "title": (entry.get("title") or "").strip(),
+            "summary": (entry.get("summary") or "").strip(),
+            "authors": [author.get("name", "") for author in entry.get("authors", [])],
+            "published": _parse_dt(entry.get("published")),
+            "updated": _parse_dt(entry.get("updated")),
+            "primary_category": primary_category,
+            "categories": categories,
+            "comment": entry.get("arxiv_comment") or "",
+            "journal_ref": entry.get("arxiv_journal_ref") or "",
+            "links": entry.get("links", []),
+        })
+    return rows
+
+
+def _atom_rows(xml: str) -> List[Paper]:
+    return parse_atom_page(xml).rows
+
+
+def inflate_page(xml: str, entries: int) -> str:
+    """Repeat the recorded entries with fresh IDs to build a busy-day sized page."""
+    templates = re.findall(r"<entry>.*?</entry>", xml, flags=re.DOTALL)
+    head = xml[:xml.index("<entry>")]
+    tail = xml[xml.rindex("</entry>") + len("</entry>"):]
+    generated = []
+    for index in range(entries):
+        template = templates[index % len(templates)]
+        generated.append(re.sub(r"2606\.\d{5}", f"2606.{index:05d}", template))
+    return head + "\n  ".join(generated) + tail
+
+
+def _measure(parser: Callable[[str], List[Any]], xml: str, repeats: int) -> Dict[str, Any]:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        parser(xml)
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    rows = parser(xml)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "rows": len(rows),
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "best_ms": round(min(timings) * 1000, 2),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_benchmark(pages: List[Path], entries: int, repeats: int) -> Dict[str, Any]:
+    results = []
+    for path in pages:
+        xml = path.read_text(encoding="utf-8")
+        if path == RECORDED_PAGE and entries:
+            xml = inflate_page(xml, entries)
+        legacy = _feedparser_rows(xml)
+        streamed = _atom_rows(xml)
+        if [Paper.from_dict(row).to_dict() for row in legacy] != [row.to_dict() for row in streamed]:
+            raise AssertionError(f"parsers disagree on rows for {path}")
+        feedparser_stats = _measure(_feedparser_rows, xml, repeats)
+        atom_stats = _measure(_atom_rows, xml, repeats)
+        results.append({
+            "page": str(path),
+            "payload_bytes": len(xml.encode("utf-8")),
+            "feedparser": feedparser_stats,
+            "atom_iterparse": atom_stats,
+            "speedup": round(feedparser_stats["median_ms"] / max(atom_stats["median_ms"], 0.001), 2),
+        })
+    return {"repeats": repeats, "pages": results}
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare the streaming Atom parser with feedparser")
+    parser.add_argument("pages", nargs="*", help="Recorded arXiv API responses (defaults to the test fixture)")
+    parser.add_argument("--entries", type=int, default=500, help="Entries per page when inflating the fixture")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+    pages = [Path(page) for page in args.pages] or [RECORDED_PAGE]
+    print(json.dumps(run_benchmark(pages, args.entries, args.repeats), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
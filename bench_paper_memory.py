@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from arxiv_atom import parse_atom_page
+from bench_atom_parser import RECORDED_PAGE, _feedparser_rows, inflate_page
+
+
+def _retained_kib(build: Callable[[], List[Any]]) -> Dict[str, Any]:
+    """Memory still held by the rows ``build`` returns, after parser garbage is collected."""
+    gc.collect()
+    tracemalloc.start()
+    rows = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "rows": len(rows),
+        "retained_kib": round(current / 1024, 1),
+        "peak_kib": round(peak / 1024, 1),
+        "bytes_per_row": round(current / max(1, len(rows)), 1),
+    }
+
+
+def run_benchmark(entries: int) -> Dict[str, Any]:
+    xml = inflate_page(RECORDED_PAGE.read_text(encoding="utf-8"), entries)
+    dict_rows = _retained_kib(lambda: _feedparser_rows(xml))
+    papers = _retained_kib(lambda: parse_atom_page(xml).rows)
+    return {
+        "entries": entries,
+        "dict_rows": dict_rows,
+        "papers": papers,
+        "saved_pct": round(100 * (1 - papers["retained_kib"] / max(dict_rows["retained_kib"], 0.1)), 1),
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare memory held by Paper records and the old per-entry dicts")
+    parser.add_argument("--entries", type=int, default=20000)
+    args = parser.parse_args(argv)
+    print(json.dumps(run_benchmark(args.entries), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date
+from typing import Any, Dict, List
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    # config reads the base URL when it is first imported, so the pipeline
+    # modules may only be imported once it is set.
+    from arxiv_standin import ArxivStandin, StandinOptions, generate_corpus
+    from app import run_pipeline
+
+    options = StandinOptions(
+        latency_sec=args.latency,
+        body_bytes_per_sec=args.body_rate,
+        throttle_every=args.throttle_every,
+        min_api_interval_sec=args.min_api_interval,
+        retry_after_sec=args.retry_after,
+        max_results_limit=args.max_results_limit,
+    )
+    corpus = generate_corpus([args.day], args.papers_per_day, args.seed)
+    with ArxivStandin(corpus, options, port=args.port) as standin:
+        started = time.perf_counter()
+        result = run_pipeline(target_day=args.day)
+        elapsed = time.perf_counter() - started
+        stats = standin.stats()
+    stages = {}
+    for name, stage in result["report"].stages.items():
+        seconds = None
+        if stage.started_at and stage.ended_at:
+            seconds = round((stage.ended_at - stage.started_at).total_seconds(), 3)
+        stages[name] = {"status": stage.status, "seconds": seconds, "errors": stage.errors}
+    return {
+        "day": args.day.isoformat(),
+        "corpus_papers": len(corpus),
+        "candidates": len(result["candidates"]),
+        "elapsed_sec": round(elapsed, 3),
+        "stages": stages,
+        "standin": stats,
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Time run_pipeline end to end against a local arXiv stand-in")
+    parser.add_argument("--day", type=date.fromisoformat, default=date(2026, 6, 1), help="arXiv day to generate and fetch")
+    parser.add_argument("--papers-per-day", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds before every response")
+    parser.add_argument("--body-rate", type=float, default=0.0, help="response body bytes per second (0: unthrottled)")
+    parser.add_argument("--throttle-every", type=int, default=0, help="answer every Nth API request with 429")
+    parser.add_argument("--min-api-interval", type=float, default=0.0, help="answer API requests closer than this with 429")
+    parser.add_argument("--retry-after", type=int, default=5)
+    parser.add_argument("--max-results-limit", type=int, default=0, help="answer larger API pages with 503")
+    args = parser.parse_args(argv)
+    if "config" in sys.modules:
+        parser.error("run this as a script; config was imported before the stand-in URL could be set")
+    os.environ["DAILYPAPER_ARXIV_BASE_URL"] = f"http://127.0.0.1:{args.port}"
+    print(json.dumps(run_benchmark(args), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,6 +6,7 @@ except Exception:
     class ZoneInfoNotFoundError(Exception):
         pass
 
+import os
 from datetime import timedelta, timezone
 
 
@@ -27,10 +28,17 @@ READ_TIMEOUT_SEC = 120
 CLASSIFY_FROM_PDF = True
 PDF_CACHE_DIR = "cache_pdfs"
 CACHE_REPORT_DIR = "cache_pdfs/_reports"
+# The baseline checkpoint journal is fsynced after this many pages.
+BASELINE_JOURNAL_FSYNC_PAGES = 8
 PDF_CACHE_WITH_COMPANY_DIR = "with_company"
 PDF_CACHE_UNIVERSITY_ONLY_DIR = "university_only"
 PRUNE_UNMATCHED_CACHED_PDFS = True
 MIN_PDF_BYTES = 1024 * 1024
+# Downloads in flight per site (all arxiv.org hosts are one site). It is also
+# the concurrency of the "pdf" rate-limit class. Every download URL is on the
+# same arXiv site, so workers beyond it would only wait for a slot.
+PDF_DOWNLOADS_PER_HOST = 4
+PDF_DOWNLOAD_WORKERS = PDF_DOWNLOADS_PER_HOST
 USE_HARDLINKS = True
 MAX_PDF_PAGES_TO_SCAN = 1
 PDF_EXTRACT_ENGINE = "pymupdf"
@@ -70,6 +78,11 @@ REQUEST_TIMEOUT = (20, 120)
 REQUESTS_UA = "DailyPaper/1.0 (+contact: your_email@example.com)"
 REQUEST_CONCURRENCY_LIMIT = 1
 SESSION_RATE_LIMIT_PER_MIN = 18
+HTTP_POOL_CONNECTIONS = 8
+HTTP_POOL_MAXSIZE = 4
+# Per-host overrides; a key also matches its subdomains.
+HTTP_POOL_MAXSIZE_BY_HOST = {"arxiv.org": PDF_DOWNLOADS_PER_HOST}
+HTTP_KEEPALIVE_IDLE_SEC = 30
 
 PROXIES = {
     "http": "http://127.0.0.1:7897",
@@ -80,10 +93,150 @@ NO_PROXY_HOSTS = ["arxiv.org", "export.arxiv.org"]
 ARXIV_API_USE_PROXY = True
 
 RATE_LIMIT_MIN_INTERVAL_SEC = 3.1
+REQUEST_STATE_FLUSH_DELAY_SEC = 1.0
+# Write one JSON line per HTTP request (limiter wait, connect, time to first
+# byte, transfer, status, parse time) to <report dir>/request_trace.jsonl;
+# percentiles are added to the baseline_fetch and pdf_cache stage metrics.
+REQUEST_TRACE_ENABLED = True
 ARXIV_429_COOLDOWN_SEC = 7200
 ARXIV_429_COOLDOWN_MAX_SEC = 86400
+# Headless runs with --wait-for-cooldown sleep through a 429 cooldown and
+# resume, at most this many times per step, reporting the remaining time
+# every COOLDOWN_PROGRESS_INTERVAL_SEC.
+COOLDOWN_WAIT_MAX_RESUMES = 3
+COOLDOWN_PROGRESS_INTERVAL_SEC = 60
+# Each API endpoint and each direct/proxy session per host is a route with
+# a rolling latency and error rate. ROUTE_BREAKER_FAILURES failures in a row
+# take a route out of rotation for ROUTE_BREAKER_OPEN_SEC; then it is tried
+# again (half-open). Healthy routes are tried fastest first.
+ROUTE_BREAKER_FAILURES = 3
+ROUTE_BREAKER_OPEN_SEC = 300
+ROUTE_HEALTH_SMOOTHING = 0.3
+# The route that last worked for a host is tried first for ROUTE_CACHE_TTL_SEC.
+# While a host is served through the proxy, the direct route is re-probed in
+# the background with a TCP connect of ROUTE_PROBE_TIMEOUT_SEC, at most once
+# per ROUTE_PROBE_INTERVAL_SEC. Hosts in NO_PROXY_HOSTS always go direct.
+ROUTE_CACHE_TTL_SEC = 600
+ROUTE_PROBE_TIMEOUT_SEC = 3
+ROUTE_PROBE_INTERVAL_SEC = 60
+
+# Each site/request-class pair gets its own start-time window, concurrency limit
+# and cooldown. All arxiv.org hosts count as one site. Only "api" uses the
+# persisted restart gap and the escalating 429 cooldown above.
+RATE_LIMIT_POLICIES = {
+    "api": {
+        "min_interval_sec": RATE_LIMIT_MIN_INTERVAL_SEC,
+        "per_minute": SESSION_RATE_LIMIT_PER_MIN,
+        "concurrency": REQUEST_CONCURRENCY_LIMIT,
+    },
+    "pdf": {"min_interval_sec": 0.5, "per_minute": 90, "concurrency": PDF_DOWNLOADS_PER_HOST, "cooldown_sec": 60},
+    "html": {"min_interval_sec": 1.0, "per_minute": 40, "concurrency": 2, "cooldown_sec": 60},
+    "other": {"min_interval_sec": 0.0, "per_minute": 120, "concurrency": 4, "cooldown_sec": 30},
+    "oai": {"min_interval_sec": RATE_LIMIT_MIN_INTERVAL_SEC, "per_minute": 18, "concurrency": 1, "cooldown_sec": 60},
+}
+# Lanes of these classes share their budget with every other DailyPaper
+# process on the machine through a file-locked ledger in the user state
+# directory: two runs started together take turns instead of both sending
+# requests at full rate. The ledger replaces the persisted restart gap.
+RATE_LIMIT_SHARED_LEDGER = True
+RATE_LIMIT_SHARED_CLASSES = ["api", "oai"]
 
 MAX_RESULTS_PER_PAGE = 500
+# Page sizes are learned per category: +STEP after GROW_AFTER good pages in
+# a row, times BACKOFF after an HTTP 503, never below MIN or above
+# MAX_RESULTS_PER_PAGE.
+# The learned sizes are kept with the arXiv request state across runs.
+ARXIV_PAGE_SIZE_MIN = 100
+ARXIV_PAGE_SIZE_STEP = 100
+ARXIV_PAGE_SIZE_BACKOFF = 0.5
+ARXIV_PAGE_SIZE_GROW_AFTER = 4
+# Request the next API page while the current one is being consumed.
+ARXIV_PIPELINED_PAGINATION = True
+# How the category scan is split into API queries:
+#   "combined"     one `cat:A OR cat:B ...` query for every category
+#   "exclusion"    one query per category, `ANDNOT` the categories before it
+#   "per_category" one plain query per category (cross-lists fetched repeatedly)
+#   "auto"         combined, unless its totalResults exceeds
+#                  ARXIV_COMBINED_QUERY_MAX_RESULTS, then exclusion
+ARXIV_CATEGORY_QUERY_PLAN = "auto"
+ARXIV_COMBINED_QUERY_MAX_RESULTS = 10000
+# A query whose totalResults exceeds this many pages is split into
+# sub-windows of the time window, sized so each fits in about one page;
+# deep `start` offsets are slow and often answered with 503. 0 disables.
+ARXIV_SUBWINDOW_MAX_PAGES = 2
+
+# Raw API responses are cached gzip-compressed under ARXIV_API_CACHE_DIR.
+# A window counts as settled once its end is ARXIV_WINDOW_SETTLE_HOURS in
+# the past (late announcements and weekends included); settled windows use
+# the long TTL, open windows and unbounded queries the short one.
+ARXIV_API_CACHE_ENABLED = True
+ARXIV_API_CACHE_DIR = "cache_pdfs/_api_cache"
+ARXIV_API_CACHE_OPEN_TTL_SEC = 15 * 60
+ARXIV_API_CACHE_SETTLED_TTL_SEC = 30 * 24 * 3600
+ARXIV_WINDOW_SETTLE_HOURS = 72
+# A cached baseline written while its window was still open is topped up on
+# later runs: a one-row totalResults probe per category, then only the
+# categories whose count changed are queried from their newest cached
+# submittedDate onwards.
+ARXIV_DELTA_FETCH = True
+
+# Where baseline metadata comes from:
+#   "search_api"  the category queries against ARXIV_API_ENDPOINTS
+#   "oai_pmh"     an OAI-PMH ListRecords harvest of ARXIV_OAI_SET in the
+#                 arXivRaw format, paged with resumption tokens
+# The delta top-up of open windows always uses the search API.
+BASELINE_METADATA_BACKEND = "search_api"
+ARXIV_OAI_ENDPOINT = "https://oaipmh.arxiv.org/oai"
+ARXIV_OAI_SET = "cs"
+# 503 answers with Retry-After are flow control on OAI-PMH, not failures.
+ARXIV_OAI_MAX_RETRIES = 5
+# The harvest runs from the window's first day to this many days past its
+# end (never past today). A paper revised later than that carries a later
+# datestamp and is missed; None harvests up to today, which is complete but
+# re-reads every record modified since the window on an old backfill.
+ARXIV_OAI_UNTIL_MARGIN_DAYS = 7
+
+# Base URL of a stand-in for arXiv's search API, /pdf and /html, such as the
+# local server of arxiv_standin.py; empty means the real arXiv. It can also
+# be set through the DAILYPAPER_ARXIV_BASE_URL environment variable. Runs
+# against a stand-in keep their caches under cache_pdfs_standin and their
+# request state in a "standin" subdirectory, apart from real data.
+ARXIV_BASE_URL = os.environ.get("DAILYPAPER_ARXIV_BASE_URL", "").rstrip("/")
+if ARXIV_BASE_URL:
+    from urllib.parse import urlparse as _urlparse
+
+    ARXIV_API_ENDPOINTS = [f"{ARXIV_BASE_URL}/api/query"]
+    ARXIV_API_USE_PROXY = False
+    NO_PROXY_HOSTS = NO_PROXY_HOSTS + [_urlparse(ARXIV_BASE_URL).hostname or ""]
+    PDF_CACHE_DIR = "cache_pdfs_standin"
+    CACHE_REPORT_DIR = f"{PDF_CACHE_DIR}/_reports"
+    ARXIV_API_CACHE_DIR = f"{PDF_CACHE_DIR}/_api_cache"
+
+# What sits under request_with_network_fallback:
+#   "passthrough"  the network
+#   "record"       the network, with every response (headers, gzip-compressed
+#                  body, timing) or request error written to
+#                  TRANSPORT_CASSETTE_DIR
+#   "replay"       the cassette, with no network access and no rate-limit
+#                  sleeps; each answer comes after the recorded time to first
+#                  byte and transfer time times TRANSPORT_REPLAY_TIME_SCALE
+#                  (1.0, the default, keeps the recorded timing; 0 answers
+#                  at once, for tests that only check results)
+# Both record and replay skip the API response cache so every page goes
+# through the transport. Replays keep their caches under cache_pdfs_replay
+# and their request state in a "replay" subdirectory, and start from empty
+# caches: a run recorded from cold caches replays in full. The
+# DAILYPAPER_TRANSPORT_MODE, DAILYPAPER_CASSETTE_DIR and
+# DAILYPAPER_REPLAY_TIME_SCALE environment variables override these.
+TRANSPORT_MODE = os.environ.get("DAILYPAPER_TRANSPORT_MODE", "passthrough")
+TRANSPORT_CASSETTE_DIR = os.environ.get("DAILYPAPER_CASSETTE_DIR", "cache_pdfs/_cassettes/default")
+TRANSPORT_REPLAY_TIME_SCALE = float(os.environ.get("DAILYPAPER_REPLAY_TIME_SCALE", "1.0"))
+if TRANSPORT_MODE in ("record", "replay"):
+    ARXIV_API_CACHE_ENABLED = False
+if TRANSPORT_MODE == "replay":
+    PDF_CACHE_DIR = "cache_pdfs_replay"
+    CACHE_REPORT_DIR = f"{PDF_CACHE_DIR}/_reports"
+    ARXIV_API_CACHE_DIR = f"{PDF_CACHE_DIR}/_api_cache"
 
 PRIORITY_CATEGORIES = [
     "cs.CL",
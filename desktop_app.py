@@ -4,8 +4,10 @@ import argparse
 import json
 import os
 import queue
+import signal
 import sys
 import threading
+from contextlib import contextmanager, nullcontext
 from datetime import date, timedelta
 from pathlib import Path
 from tkinter import BOTH, END, LEFT, RIGHT, X, StringVar, Tk, messagebox
@@ -18,8 +20,11 @@ from tkcalendar import DateEntry
 from app import (
     STAGE_SEQUENCE,
     build_runtime_institution_maps,
+    collect_baseline_range,
+    import_baseline_snapshot,
     institutions_text_from_terms,
     parse_institutions_text,
+    run_after_cooldowns,
     run_pipeline,
 )
 from runtime_control import PipelineCancelled, PipelineController
@@ -104,13 +109,77 @@ def _load_custom_entries(args: argparse.Namespace):
     return None
 
 
+def _days_between(start_day: str, end_day: str) -> list[date]:
+    day, last = date.fromisoformat(start_day), date.fromisoformat(end_day)
+    days = []
+    while day <= last:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def _print_progress(stage: str, message: str, state: str, percent: float | None) -> None:
+    print(f"[{stage}] {message}", file=sys.stderr, flush=True)
+
+
+@contextmanager
+def _cancel_on_signals(controller: PipelineController):
+    """Turn SIGINT/SIGTERM into a controller cancel, so a waiting run still writes its outputs."""
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    signals = [signal.SIGINT] + ([signal.SIGTERM] if hasattr(signal, "SIGTERM") else [])
+    previous = {signum: signal.signal(signum, lambda _signum, _frame: controller.cancel()) for signum in signals}
+    try:
+        yield
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+
 def run_cli_pipeline(args: argparse.Namespace) -> int:
+    step_kwargs: Dict[str, Any] = {}
+    guard = nullcontext()
+    if args.wait_for_cooldown:
+        controller = PipelineController()
+        step_kwargs["controller"] = controller
+        guard = _cancel_on_signals(controller)
+
+    def run_step(task):
+        if not args.wait_for_cooldown:
+            return task()
+        # Each step is resumed on its own, so days already finished are not redone.
+        return run_after_cooldowns(
+            task,
+            controller=step_kwargs["controller"],
+            progress_callback=None if args.quiet else _print_progress,
+        )
+
     try:
         custom_entries = _load_custom_entries(args)
         _org_search_terms, institution_patterns = build_runtime_institution_maps(custom_entries)
-        result = run_pipeline(target_day=args.target_day, institution_patterns=institution_patterns)
-        payload = _result_payload(result)
-        summary_text = build_result_overview(result)
+        with guard:
+            if args.import_snapshot:
+                if not args.target_day:
+                    raise ValueError("--import-snapshot requires --target-day")
+                # Days written here are cache hits for the range pass below.
+                import_baseline_snapshot(args.import_snapshot, args.target_day, args.through_day or args.target_day)
+            if args.through_day:
+                if not args.target_day:
+                    raise ValueError("--through-day requires --target-day")
+                # One API pass fills every day's baseline cache; each run below then starts from its cache.
+                run_step(lambda: collect_baseline_range(args.target_day, args.through_day, **step_kwargs))
+                results = [
+                    run_step(lambda day=day: run_pipeline(target_day=day, institution_patterns=institution_patterns, **step_kwargs))
+                    for day in _days_between(args.target_day, args.through_day)
+                ]
+            else:
+                results = [run_step(lambda: run_pipeline(target_day=args.target_day, institution_patterns=institution_patterns, **step_kwargs))]
+        if len(results) == 1:
+            payload = _result_payload(results[0])
+        else:
+            payload = {"status": "ok", "days": [_result_payload(result) for result in results]}
+        summary_text = "\n\n".join(build_result_overview(result) for result in results)
     except PipelineCancelled:
         payload = {"status": "cancelled"}
         summary_text = "任务已取消。"
@@ -138,6 +207,19 @@ def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="DailyPaper desktop app and headless runner")
     parser.add_argument("--run-once", action="store_true", help="Run one pipeline job without opening the GUI")
     parser.add_argument("--target-day", help="Target arXiv server day in YYYY-MM-DD format")
+    parser.add_argument(
+        "--through-day",
+        help="With --target-day, backfill every day through this YYYY-MM-DD date using one API pass",
+    )
+    parser.add_argument(
+        "--import-snapshot",
+        help="Fill the baseline caches of --target-day (through --through-day) from a local arXiv metadata snapshot (JSON lines)",
+    )
+    parser.add_argument(
+        "--wait-for-cooldown",
+        action="store_true",
+        help="After an arXiv HTTP 429, sleep until the cooldown ends and resume instead of exiting",
+    )
     parser.add_argument("--institutions-file", help="UTF-8 text file, one institution per line")
     parser.add_argument("--institutions-text", help="Institution definitions passed inline")
     parser.add_argument("--output-json", help="Write machine-readable result JSON to this path")
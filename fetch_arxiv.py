@@ -1,63 +1,107 @@
 from __future__ import annotations
 
+import math
 import os
-import json
+import queue
+import socket
 import sys
 import threading
 import time
-from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional
 from urllib.parse import urlparse
 
-import feedparser
 import requests
-from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError as RequestsConnectionError
 from requests.exceptions import ProxyError, SSLError
 
+from api_cache import ApiResponseCache
+from arxiv_atom import AtomPage, parse_atom_page
 from config import (
+    ARXIV_API_CACHE_DIR,
+    ARXIV_API_CACHE_ENABLED,
+    ARXIV_API_CACHE_OPEN_TTL_SEC,
+    ARXIV_API_CACHE_SETTLED_TTL_SEC,
     ARXIV_API_ENDPOINTS,
     ARXIV_API_USE_PROXY,
+    ARXIV_BASE_URL,
+    ARXIV_CATEGORY_QUERY_PLAN,
+    ARXIV_COMBINED_QUERY_MAX_RESULTS,
+    ARXIV_PAGE_SIZE_BACKOFF,
+    ARXIV_PAGE_SIZE_GROW_AFTER,
+    ARXIV_PAGE_SIZE_MIN,
+    ARXIV_PAGE_SIZE_STEP,
+    ARXIV_PIPELINED_PAGINATION,
     ARXIV_429_COOLDOWN_MAX_SEC,
     ARXIV_429_COOLDOWN_SEC,
     ARXIV_PRIMARY_CATEGORY_PREFIXES,
+    ARXIV_SUBWINDOW_MAX_PAGES,
     CACHE_REPORT_DIR,
     DEBUG,
+    HTTP_KEEPALIVE_IDLE_SEC,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_POOL_MAXSIZE_BY_HOST,
     MAX_RESULTS_PER_PAGE,
     NO_PROXY_HOSTS,
     PROXIES,
-    RATE_LIMIT_MIN_INTERVAL_SEC,
+    RATE_LIMIT_POLICIES,
+    RATE_LIMIT_SHARED_CLASSES,
+    RATE_LIMIT_SHARED_LEDGER,
+    REQUEST_TRACE_ENABLED,
+    REQUEST_STATE_FLUSH_DELAY_SEC,
     REQUESTS_UA,
-    REQUEST_CONCURRENCY_LIMIT,
     REQUEST_TIMEOUT,
     RESPECT_ENV_PROXIES,
-    SESSION_RATE_LIMIT_PER_MIN,
+    ROUTE_BREAKER_FAILURES,
+    ROUTE_BREAKER_OPEN_SEC,
+    ROUTE_CACHE_TTL_SEC,
+    ROUTE_HEALTH_SMOOTHING,
+    ROUTE_PROBE_INTERVAL_SEC,
+    ROUTE_PROBE_TIMEOUT_SEC,
+    TRANSPORT_CASSETTE_DIR,
+    TRANSPORT_MODE,
+    TRANSPORT_REPLAY_TIME_SCALE,
 )
-
-PDF_ENDPOINTS = [
+from filters import window_is_settled
+from http_sessions import HttpSessionManager, take_thread_connect_sec
+from page_sizing import PageSizeController
+from paper import entry_arxiv_id
+from query_planner import PlanCursors, QueryPlanStats, QueryStream, combined_too_large, exclusion_streams, initial_plan
+from rate_ledger import SharedRateLedger
+from request_scheduler import RateLimitPolicy, RequestLane, RequestScheduler
+from request_state import RequestStateStore
+from request_trace import RequestTracer
+from route_health import RouteCache, RouteHealth
+from transport import Transport
+
+PDF_ENDPOINTS = [f"{ARXIV_BASE_URL}/pdf"] if ARXIV_BASE_URL else [
     "https://arxiv.org/pdf",
     "https://export.arxiv.org/pdf",
 ]
 
-_request_semaphore = threading.BoundedSemaphore(max(1, REQUEST_CONCURRENCY_LIMIT))
-_request_slot_lock = threading.Lock()
-_request_start_window: deque[float] = deque()
-_last_request_start_ts = 0.0
 def _user_state_dir() -> Path:
     base = os.environ.get("LOCALAPPDATA") or os.environ.get("APPDATA")
-    if base:
-        return Path(base) / "DailyPaper"
-    return Path.home() / ".dailypaper"
+    root = Path(base) / "DailyPaper" if base else Path.home() / ".dailypaper"
+    # Cooldowns and request history of a stand-in server or of a replay must not block real runs.
+    if TRANSPORT_MODE == "replay":
+        return root / "replay"
+    return root / "standin" if ARXIV_BASE_URL else root
 
 
 _request_state_path = _user_state_dir() / "arxiv_request_state.json"
+_rate_ledger_path = _user_state_dir() / "arxiv_rate_ledger.json"
 _legacy_request_state_path = Path(CACHE_REPORT_DIR) / "arxiv_request_state.json"
 
 
 class ArxivRateLimitError(RuntimeError):
-    pass
+    """The arXiv API is cooling down after an HTTP 429; ``retry_at`` is when it ends (UTC), if known."""
+
+    def __init__(self, message: str, retry_at: datetime | None = None) -> None:
+        super().__init__(message)
+        self.retry_at = retry_at
 
 
 class ArxivServiceUnavailableError(RuntimeError):
@@ -68,7 +112,7 @@ def _candidate_request_state_paths() -> list[Path]:
     paths = [_request_state_path, _legacy_request_state_path]
     try:
         executable_dir = Path(sys.executable).resolve().parent
-        paths.append(executable_dir / "cache_pdfs" / "_reports" / "arxiv_request_state.json")
+        paths.append(executable_dir / CACHE_REPORT_DIR / "arxiv_request_state.json")
     except Exception:
         pass
 
@@ -82,78 +126,23 @@ def _candidate_request_state_paths() -> list[Path]:
     return deduped
 
 
-def _read_json_file(path: Path) -> Dict[str, Any]:
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-        return payload if isinstance(payload, dict) else {}
-    except Exception:
-        return {}
+def _request_state_write_paths() -> list[Path]:
+    return [_request_state_path, _legacy_request_state_path]
 
 
-def _max_iso_datetime(values: list[str]) -> str | None:
-    best_dt: datetime | None = None
-    best_raw: str | None = None
-    for value in values:
-        try:
-            dt = datetime.fromisoformat(value)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            dt = dt.astimezone(timezone.utc)
-        except Exception:
-            continue
-        if best_dt is None or dt > best_dt:
-            best_dt = dt
-            best_raw = dt.isoformat()
-    return best_raw
+_request_state_store = RequestStateStore(
+    _candidate_request_state_paths,
+    _request_state_write_paths,
+    flush_delay_sec=REQUEST_STATE_FLUSH_DELAY_SEC,
+).register_atexit()
 
 
 def _read_request_state() -> Dict[str, Any]:
-    payloads = [_read_json_file(path) for path in _candidate_request_state_paths()]
-    payloads = [payload for payload in payloads if payload]
-    if not payloads:
-        return {}
-    merged: Dict[str, Any] = {}
-    latest_request = _max_iso_datetime([
-        str(payload.get("last_request_started_at")) for payload in payloads if payload.get("last_request_started_at")
-    ])
-    latest_cooldown = _max_iso_datetime([
-        str(payload.get("cooldown_until")) for payload in payloads if payload.get("cooldown_until")
-    ])
-    latest_429 = _max_iso_datetime([
-        str(payload.get("last_429_at")) for payload in payloads if payload.get("last_429_at")
-    ])
-    if latest_request:
-        merged["last_request_started_at"] = latest_request
-    if latest_cooldown:
-        merged["cooldown_until"] = latest_cooldown
-    if latest_429:
-        merged["last_429_at"] = latest_429
-    consecutive_values = []
-    for payload in payloads:
-        try:
-            consecutive_values.append(int(payload.get("consecutive_429", 0) or 0))
-        except Exception:
-            pass
-    if consecutive_values:
-        merged["consecutive_429"] = max(consecutive_values)
-    for payload in payloads:
-        if payload.get("last_429_endpoint"):
-            merged["last_429_endpoint"] = payload["last_429_endpoint"]
-    return merged
+    return _request_state_store.snapshot()
 
 
 def _write_request_state(payload: Dict[str, Any]) -> None:
-    wrote = False
-    for path in (_request_state_path, _legacy_request_state_path):
-        try:
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-            wrote = True
-        except Exception:
-            if DEBUG:
-                print(f"[WARN] failed to persist arXiv request state at {path}")
-    if not wrote and DEBUG:
-        print("[WARN] failed to persist arXiv request state")
+    _request_state_store.replace(payload)
 
 
 def describe_arxiv_request_state() -> Dict[str, Any]:
@@ -169,6 +158,11 @@ def describe_arxiv_request_state() -> Dict[str, Any]:
         "cooldown_until": state.get("cooldown_until"),
         "last_429_at": state.get("last_429_at"),
         "consecutive_429": int(state.get("consecutive_429", 0) or 0),
+        "api_page_sizes": state.get("api_page_sizes") or {},
+        "route_health": _route_health.snapshot(),
+        "rate_ledger_file": str(_rate_ledger_path) if RATE_LIMIT_SHARED_LEDGER else None,
+        "rate_ledger": _request_scheduler.ledger_snapshot(),
+        "transport": transport_stats(),
     }
 
 
@@ -218,7 +212,8 @@ def _check_persisted_cooldown() -> None:
         wait_seconds = int((until - now).total_seconds())
         raise ArxivRateLimitError(
             "arXiv API cooldown active after a previous HTTP 429; "
-            f"wait about {wait_seconds} seconds, retry after {until.isoformat()}"
+            f"wait about {wait_seconds} seconds, retry after {until.isoformat()}",
+            retry_at=until,
         )
 
 
@@ -235,17 +230,21 @@ def _persisted_last_request_gap(now_utc: datetime) -> Optional[float]:
         return None
 
 
+_session_manager = HttpSessionManager(
+    user_agent=REQUESTS_UA,
+    pool_maxsize=HTTP_POOL_MAXSIZE,
+    pool_maxsize_by_host=HTTP_POOL_MAXSIZE_BY_HOST,
+    pool_connections=HTTP_POOL_CONNECTIONS,
+    keepalive_idle_sec=HTTP_KEEPALIVE_IDLE_SEC,
+)
+
+
 def _build_session(*, proxies: Dict[str, str] | None = None, trust_env: bool = False) -> requests.Session:
-    session = requests.Session()
-    # Hidden urllib3 retries would bypass the explicit arXiv request scheduler.
-    adapter = HTTPAdapter(max_retries=0, pool_connections=1, pool_maxsize=1)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    session.headers.update({"User-Agent": REQUESTS_UA})
-    session.trust_env = trust_env
-    if proxies:
-        session.proxies.update(proxies)
-    return session
+    return _session_manager.build_session(proxies=proxies, trust_env=trust_env)
+
+
+def connection_pool_stats() -> Dict[str, Dict[str, float]]:
+    return _session_manager.stats_snapshot()
 
 
 def _environment_proxies() -> Dict[str, str]:
@@ -294,65 +293,246 @@ _PROXY_SESSION = _build_proxy_session()
 _HAS_PROXY_FALLBACK = PROXIES is not None or bool(_environment_proxies())
 
 
-def _reserve_request_slot(_url: str) -> None:
-    global _last_request_start_ts
+def _request_class(url: str) -> str:
+    path = urlparse(url).path.lower()
+    if path.endswith("/api/query"):
+        return "api"
+    if path.endswith(("/oai", "/oai2")):
+        return "oai"
+    if path.startswith("/pdf/") or path.endswith(".pdf"):
+        return "pdf"
+    if path.startswith(("/html/", "/abs/")):
+        return "html"
+    return "other"
+
+
+def _build_request_scheduler(
+    policies: Dict[str, Dict[str, Any]] | None = None,
+    ledger: SharedRateLedger | None = None,
+) -> RequestScheduler:
+    policies = RATE_LIMIT_POLICIES if policies is None else policies
+    return RequestScheduler(
+        {name: RateLimitPolicy.from_config(values) for name, values in policies.items()},
+        _request_class,
+        ledger=ledger,
+        shared_classes=RATE_LIMIT_SHARED_CLASSES,
+    )
+
+
+_request_scheduler = _build_request_scheduler(
+    ledger=SharedRateLedger(_rate_ledger_path) if RATE_LIMIT_SHARED_LEDGER else None,
+)
+
+
+def request_wait_stats(reset_max: bool = False) -> Dict[str, Dict[str, float]]:
+    return _request_scheduler.wait_stats(reset_max=reset_max)
+
 
+def _reserve_request_slot(url: str) -> None:
+    lane = _request_scheduler.lane_for(url)
+    if lane.request_class != "api":
+        _request_scheduler.reserve(lane)
+        return
+    # Only the API lane carries the persisted restart gap and 429 cooldown.
+    # A shared ledger already holds the last start of every process.
     _check_persisted_cooldown()
-    min_interval = max(0.0, RATE_LIMIT_MIN_INTERVAL_SEC)
-    session_rate_limit = max(1, SESSION_RATE_LIMIT_PER_MIN)
-    while True:
-        sleep_for = 0.0
-        with _request_slot_lock:
-            now = time.monotonic()
-            persisted_gap = _persisted_last_request_gap(datetime.now(timezone.utc))
-            if persisted_gap is not None and persisted_gap < min_interval:
-                sleep_for = max(sleep_for, min_interval - persisted_gap)
-            while _request_start_window and now - _request_start_window[0] >= 60.0:
-                _request_start_window.popleft()
-            if len(_request_start_window) >= session_rate_limit:
-                sleep_for = 60.0 - (now - _request_start_window[0])
-            if _last_request_start_ts:
-                sleep_for = max(sleep_for, min_interval - (now - _last_request_start_ts))
-            if sleep_for <= 0.0:
-                _request_start_window.append(now)
-                _last_request_start_ts = now
-                state = _read_request_state()
-                state["last_request_started_at"] = datetime.now(timezone.utc).isoformat()
-                _write_request_state(state)
-                return
-        time.sleep(max(sleep_for, 0.01))
+    _request_scheduler.reserve(
+        lane,
+        persisted_gap=None if _request_scheduler.shares(lane) else lambda: _persisted_last_request_gap(datetime.now(timezone.utc)),
+    )
+    _request_state_store.update({"last_request_started_at": datetime.now(timezone.utc).isoformat()})
+
+
+def _note_lane_response(lane: RequestLane, response: Any) -> None:
+    if lane.request_class == "api" or getattr(response, "status_code", None) not in (429, 503):
+        return
+    retry_at = _parse_retry_after((getattr(response, "headers", None) or {}).get("Retry-After"))
+    seconds = (retry_at - datetime.now(timezone.utc)).total_seconds() if retry_at else None
+    _request_scheduler.note_cooldown(lane, seconds)
+    if DEBUG:
+        print(f"[WARN] {lane.key} returned HTTP {response.status_code}; pausing that lane")
+
+
+_request_tracer = RequestTracer()
+
+
+def open_request_trace(path: Path) -> None:
+    """Write a trace record for every request from now on to ``path`` (JSON lines)."""
+    if REQUEST_TRACE_ENABLED:
+        _request_tracer.open(path)
+
+
+def close_request_trace() -> None:
+    _request_tracer.close()
+
+
+def request_trace_position() -> int:
+    return _request_tracer.position()
+
+
+def request_trace_summary(since: int = 0) -> Dict[str, Any]:
+    return _request_tracer.summary(since)
+
+
+def traced_parse():
+    """Context manager that records the parse time of the body this thread just received."""
+    return _request_tracer.parsing()
+
+
+def note_response_transferred(transfer_bytes: int) -> None:
+    """Finish the trace record of this thread's streamed response after reading its body."""
+    _request_tracer.note_transferred(transfer_bytes)
+
+
+_transport = Transport(TRANSPORT_MODE, TRANSPORT_CASSETTE_DIR, time_scale=TRANSPORT_REPLAY_TIME_SCALE)
+
+
+def transport_stats() -> Dict[str, Any]:
+    return _transport.stats_snapshot()
 
 
-def _guarded_get(session: requests.Session, url: str, *, params=None, timeout=None, stream: bool = False) -> requests.Response:
-    with _request_semaphore:
+def _replay_request(url: str, params=None, stream: bool = False) -> requests.Response:
+    # No scheduler lane: a replay never waits for a rate-limit slot.
+    trace = _request_tracer.begin(url, _request_class(url), "replay", time.perf_counter())
+    try:
+        response = _transport.replay(url, params)
+    except BaseException as exc:
+        _request_tracer.failed(trace, exc, 0.0)
+        raise
+    _request_tracer.received(trace, response, 0.0, _response_latency(response), stream)
+    return response
+
+
+def _guarded_get(session: requests.Session, url: str, *, params=None, timeout=None, stream: bool = False, headers=None) -> requests.Response:
+    lane = _request_scheduler.lane_for(url)
+    queued_at = time.perf_counter()
+    with lane.semaphore:
         _reserve_request_slot(url)
-        return session.get(
-            url,
-            params=params,
-            timeout=timeout or REQUEST_TIMEOUT,
-            stream=stream,
-        )
+        trace = _request_tracer.begin(url, lane.request_class, "proxy" if session is _PROXY_SESSION else "direct", queued_at)
+        take_thread_connect_sec()
+        sent_at = time.perf_counter()
+        try:
+            response = session.get(
+                url,
+                params=params,
+                timeout=timeout or REQUEST_TIMEOUT,
+                stream=stream,
+                headers=headers,
+            )
+        except BaseException as exc:
+            _request_tracer.failed(trace, exc, take_thread_connect_sec())
+            raise
+    round_trip_sec = time.perf_counter() - sent_at
+    _request_tracer.received(trace, response, take_thread_connect_sec(), _response_latency(response), stream)
+    _note_lane_response(lane, response)
+    if _transport.recording:
+        _transport.record(url, params, response, round_trip_sec, stream)
+    return response
 
 
 def _should_try_proxy_fallback(exc: Exception) -> bool:
     return isinstance(exc, (RequestsConnectionError, ProxyError, SSLError))
 
 
-def request_with_network_fallback(url: str, *, params=None, timeout=None, stream: bool = False) -> requests.Response:
+_route_health = RouteHealth(
+    lambda: _read_request_state().get("route_health"),
+    lambda routes: _request_state_store.update({"route_health": routes}),
+    failure_threshold=ROUTE_BREAKER_FAILURES,
+    open_sec=ROUTE_BREAKER_OPEN_SEC,
+    smoothing=ROUTE_HEALTH_SMOOTHING,
+)
+
+
+_route_cache = RouteCache(ttl_sec=ROUTE_CACHE_TTL_SEC)
+
+
+def route_cache_stats() -> Dict[str, float]:
+    return _route_cache.stats()
+
+
+def _response_latency(response: Any) -> float | None:
+    # Time to the response headers, so scheduler waits and body reads are not counted.
+    elapsed = getattr(response, "elapsed", None)
+    return elapsed.total_seconds() if elapsed is not None else None
+
+
+def _probe_direct_route(url: str) -> bool:
+    """TCP-connect to ``url``'s host with a short timeout; a success puts the direct route back in front."""
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    route = f"{host}:direct"
+    started = time.monotonic()
+    try:
+        with socket.create_connection((host, parsed.port or (443 if parsed.scheme == "https" else 80)), timeout=ROUTE_PROBE_TIMEOUT_SEC):
+            pass
+    except OSError:
+        _route_health.record_failure(route)
+        return False
+    _route_health.record_success(route, time.monotonic() - started)
+    _route_cache.remember(host, route)
+    _route_cache.note_recovery()
+    return True
+
+
+def _schedule_route_probe(url: str) -> None:
+    threading.Thread(target=_probe_direct_route, args=(url,), name="route-probe", daemon=True).start()
+
+
+def request_with_network_fallback(url: str, *, params=None, timeout=None, stream: bool = False, headers=None) -> requests.Response:
+    """GET ``url`` over the best direct/proxy route, or from the cassette of a record/replay transport."""
+    if _transport.replaying:
+        return _replay_request(url, params, stream)
+    if not _transport.recording:
+        return _request_over_routes(url, params=params, timeout=timeout, stream=stream, headers=headers)
+    started = time.perf_counter()
+    try:
+        return _request_over_routes(url, params=params, timeout=timeout, stream=stream, headers=headers)
+    except Exception as exc:
+        # _guarded_get records responses; failed routes that were retried over
+        # another route are not recorded, only the error the caller sees.
+        _transport.record_error(url, params, exc, time.perf_counter() - started)
+        raise
+
+
+def _request_over_routes(url: str, *, params=None, timeout=None, stream: bool = False, headers=None) -> requests.Response:
     if ARXIV_API_USE_PROXY and _is_arxiv_api_url(url):
         if not _HAS_PROXY_FALLBACK:
             raise RuntimeError(f"arXiv API proxy mode is enabled but no proxy is configured for {url}")
-        return _guarded_get(_PROXY_SESSION, url, params=params, timeout=timeout, stream=stream)
-    if _host_matches_no_proxy(url):
-        return _guarded_get(_DIRECT_SESSION, url, params=params, timeout=timeout, stream=stream)
-    try:
-        return _guarded_get(_DIRECT_SESSION, url, params=params, timeout=timeout, stream=stream)
-    except Exception as exc:
-        if not _HAS_PROXY_FALLBACK or not _should_try_proxy_fallback(exc):
-            raise
-        if DEBUG:
-            print(f"[WARN] direct request failed for {url} ({exc}); retrying with proxy-aware session")
-        return _guarded_get(_PROXY_SESSION, url, params=params, timeout=timeout, stream=stream)
+        return _guarded_get(_PROXY_SESSION, url, params=params, timeout=timeout, stream=stream, headers=headers)
+    if _host_matches_no_proxy(url) or not _HAS_PROXY_FALLBACK:
+        return _guarded_get(_DIRECT_SESSION, url, params=params, timeout=timeout, stream=stream, headers=headers)
+    host = (urlparse(url).hostname or "").lower()
+    direct_route = f"{host}:direct"
+    sessions = {direct_route: _DIRECT_SESSION, f"{host}:proxy": _PROXY_SESSION}
+    routes = _route_health.order(list(sessions))
+    cached = _route_cache.lookup(host)
+    if cached in routes:
+        routes.remove(cached)
+        routes.insert(0, cached)
+    if routes[0] != direct_route:
+        _route_cache.note_bypass()
+    for position, route in enumerate(routes):
+        started = time.monotonic()
+        try:
+            response = _guarded_get(sessions[route], url, params=params, timeout=timeout, stream=stream, headers=headers)
+        except Exception as exc:
+            if not _should_try_proxy_fallback(exc):
+                raise
+            _route_health.record_failure(route)
+            _route_cache.forget(host)
+            fell_back = position < len(routes) - 1
+            _route_cache.note_failed_attempt(time.monotonic() - started, fell_back)
+            if not fell_back:
+                raise
+            if DEBUG:
+                print(f"[WARN] {route} request failed for {url} ({exc}); retrying via {routes[position + 1]}")
+            continue
+        _route_health.record_success(route, _response_latency(response))
+        _route_cache.remember(host, route)
+        # The direct route is preferred; check in the background whether it is back.
+        if route != direct_route and _route_cache.claim_probe(host, ROUTE_PROBE_INTERVAL_SEC):
+            _schedule_route_probe(url)
+        return response
 
 
 def get_http_session() -> requests.Session:
@@ -389,7 +569,8 @@ def _raise_rate_limit(endpoint: str, response: requests.Response) -> None:
     state["cooldown_until"] = cooldown_until.isoformat()
     state["last_429_at"] = datetime.now(timezone.utc).isoformat()
     state["last_429_endpoint"] = endpoint
-    _write_request_state(state)
+    # The cooldown must survive a crash or restart, so this write is not deferred.
+    _request_state_store.update(state, durable=True)
     body = (response.text or "").strip()
     details = []
     if retry_after:
@@ -401,14 +582,49 @@ def _raise_rate_limit(endpoint: str, response: requests.Response) -> None:
     if not retry_after:
         details.append(f"cooldown_until={cooldown_until.isoformat()}")
         suffix = f" ({', '.join(details)})" if details else ""
-    raise ArxivRateLimitError(f"arXiv API is temporarily unavailable at {endpoint}: HTTP 429{suffix}")
+    raise ArxivRateLimitError(
+        f"arXiv API is temporarily unavailable at {endpoint}: HTTP 429{suffix}",
+        retry_at=cooldown_until,
+    )
+
+
+_api_cache = ApiResponseCache(Path(ARXIV_API_CACHE_DIR))
+
+
+def api_cache_stats() -> Dict[str, int]:
+    return _api_cache.stats_snapshot()
+
+
+def _api_cache_ttl(window_end: datetime | None) -> float:
+    if window_end is not None and window_is_settled(window_end):
+        return ARXIV_API_CACHE_SETTLED_TTL_SEC
+    return ARXIV_API_CACHE_OPEN_TTL_SEC
 
 
-def _get_with_fallback(params: Dict[str, Any]) -> str:
+def _get_with_fallback(params: Dict[str, Any], window_end: datetime | None = None) -> str:
+    cached = _api_cache.lookup(params) if ARXIV_API_CACHE_ENABLED else None
+    if cached is not None and cached.fresh:
+        # No request was made; keep the parse time off the previous one.
+        _request_tracer.detach()
+        return cached.text
+    ttl_sec = _api_cache_ttl(window_end)
+    headers = cached.revalidation_headers() if cached is not None else {}
     last_exc: Exception | None = None
-    for endpoint in ARXIV_API_ENDPOINTS:
+    # A 429 or 503 says the service is busy, not that the route is broken,
+    # so only other failures count against an endpoint's health.
+    for endpoint in _route_health.order(ARXIV_API_ENDPOINTS):
         try:
-            response = request_with_network_fallback(endpoint, params=params, timeout=REQUEST_TIMEOUT)
+            response = request_with_network_fallback(
+                endpoint,
+                params=params,
+                timeout=REQUEST_TIMEOUT,
+                headers=headers or None,
+            )
+            if response.status_code == 304 and cached is not None:
+                _route_health.record_success(endpoint, _response_latency(response))
+                _request_state_store.update(remove=("cooldown_until", "consecutive_429"))
+                _api_cache.refresh(cached, params, ttl_sec)
+                return cached.text
             if response.status_code == 429:
                 _raise_rate_limit(endpoint, response)
             if response.status_code == 503:
@@ -419,10 +635,16 @@ def _get_with_fallback(params: Dict[str, Any]) -> str:
                 )
             response.raise_for_status()
             _validate_api_payload(response.text)
-            state = _read_request_state()
-            state.pop("cooldown_until", None)
-            state.pop("consecutive_429", None)
-            _write_request_state(state)
+            _route_health.record_success(endpoint, _response_latency(response))
+            _request_state_store.update(remove=("cooldown_until", "consecutive_429"))
+            if ARXIV_API_CACHE_ENABLED:
+                _api_cache.store(
+                    params,
+                    response.text,
+                    ttl_sec,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
             return response.text
         except ArxivRateLimitError:
             raise
@@ -430,6 +652,7 @@ def _get_with_fallback(params: Dict[str, Any]) -> str:
             raise
         except Exception as exc:
             last_exc = exc
+            _route_health.record_failure(endpoint)
             if DEBUG:
                 print(f"[WARN] endpoint failed: {endpoint} ({exc}); trying next...")
     if last_exc is None:
@@ -437,47 +660,11 @@ def _get_with_fallback(params: Dict[str, Any]) -> str:
     raise last_exc
 
 
-def _parse_dt(value: Optional[str]) -> Optional[datetime]:
-    if not value:
-        return None
-    try:
-        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
-        if parsed.tzinfo is None:
-            parsed = parsed.replace(tzinfo=timezone.utc)
-        return parsed.astimezone(timezone.utc)
-    except Exception:
-        return None
-
-
-def _entry_to_dict(entry: Any) -> Dict[str, Any]:
-    categories = [
-        (tag.get("term") or "").strip()
-        for tag in (entry.get("tags", []) or [])
-        if (tag.get("term") or "").strip()
-    ]
-    primary_category = (entry.get("arxiv_primary_category") or {}).get("term")
-    if primary_category and primary_category not in categories:
-        categories.insert(0, primary_category)
-    return {
-        "id": entry.get("id"),
-        "title": (entry.get("title") or "").strip(),
-        "summary": (entry.get("summary") or "").strip(),
-        "authors": [author.get("name", "") for author in entry.get("authors", [])],
-        "published": _parse_dt(entry.get("published")),
-        "updated": _parse_dt(entry.get("updated")),
-        "primary_category": primary_category,
-        "categories": categories,
-        "comment": entry.get("arxiv_comment") or "",
-        "journal_ref": entry.get("arxiv_journal_ref") or "",
-        "links": entry.get("links", []),
-    }
-
-
 def _format_arxiv_datetime(value: datetime) -> str:
     return value.astimezone(timezone.utc).strftime("%Y%m%d%H%M")
 
 
-def query_cs_sorted(start: int, max_results: int):
+def query_cs_sorted(start: int, max_results: int, seen_ids=None) -> AtomPage:
     xml = _get_with_fallback({
         "search_query": "cat:cs.*",
         "sortBy": "submittedDate",
@@ -485,154 +672,430 @@ def query_cs_sorted(start: int, max_results: int):
         "start": start,
         "max_results": max_results,
     })
-    return feedparser.parse(xml)
+    with _request_tracer.parsing():
+        return parse_atom_page(xml, seen_ids=seen_ids)
+
 
+def query_cs_window(start_utc: datetime, end_utc: datetime, start: int, max_results: int, seen_ids=None) -> AtomPage:
+    return query_category_window("cs.*", start_utc, end_utc, start, max_results, seen_ids=seen_ids)
 
-def query_cs_window(start_utc: datetime, end_utc: datetime, start: int, max_results: int):
-    return query_category_window("cs.*", start_utc, end_utc, start, max_results)
+
+def query_category_window(
+    category: str,
+    start_utc: datetime,
+    end_utc: datetime,
+    start: int,
+    max_results: int,
+    seen_ids=None,
+) -> AtomPage:
+    return query_clause_window(f"cat:{category}", start_utc, end_utc, start, max_results, seen_ids=seen_ids)
 
 
-def query_category_window(category: str, start_utc: datetime, end_utc: datetime, start: int, max_results: int):
+def query_clause_window(
+    clause: str,
+    start_utc: datetime,
+    end_utc: datetime,
+    start: int,
+    max_results: int,
+    seen_ids=None,
+) -> AtomPage:
     xml = _get_with_fallback({
         "search_query": (
             f"submittedDate:[{_format_arxiv_datetime(start_utc)} TO "
-            f"{_format_arxiv_datetime(end_utc)}] AND cat:{category}"
+            f"{_format_arxiv_datetime(end_utc)}] AND {clause}"
         ),
         "sortBy": "submittedDate",
         "sortOrder": "descending",
         "start": start,
         "max_results": max_results,
-    })
-    return feedparser.parse(xml)
-
-
-def _candidate_page_sizes(initial_page_size: int) -> list[int]:
-    candidates = [initial_page_size, 1000, 500, 200]
-    ordered: list[int] = []
-    for candidate in candidates:
-        normalized = max(1, min(initial_page_size, candidate))
-        if normalized not in ordered:
-            ordered.append(normalized)
-    return ordered
-
-
-def _feed_reported_items_per_page(feed: Any) -> int | None:
-    metadata = getattr(feed, "feed", None)
-    if isinstance(metadata, dict):
-        candidates = [metadata.get("opensearch_itemsperpage")]
-    else:
-        candidates = [getattr(metadata, "opensearch_itemsperpage", None)]
-    for value in candidates:
-        try:
-            parsed = int(value)
-            if parsed > 0:
-                return parsed
-        except Exception:
-            continue
-    return None
+    }, window_end=end_utc)
+    with _request_tracer.parsing():
+        return parse_atom_page(xml, seen_ids=seen_ids)
+
+
+_page_sizes = PageSizeController(
+    lambda: _read_request_state().get("api_page_sizes"),
+    lambda sizes: _request_state_store.update({"api_page_sizes": sizes}),
+    minimum=ARXIV_PAGE_SIZE_MIN,
+    step=ARXIV_PAGE_SIZE_STEP,
+    backoff=ARXIV_PAGE_SIZE_BACKOFF,
+    grow_after=ARXIV_PAGE_SIZE_GROW_AFTER,
+)
 
 
-def _query_cs_window_adaptive(
-    start_utc: datetime,
-    end_utc: datetime,
+def api_page_size_stats() -> Dict[str, Any]:
+    return _page_sizes.stats()
+
+
+def _query_with_learned_page_size(
+    key: str,
+    fetch,
     start: int,
-    preferred_page_size: int,
+    max_page_size: int,
     on_request_progress=None,
-):
-    last_error: ArxivServiceUnavailableError | None = None
-    for page_size in _candidate_page_sizes(preferred_page_size):
+    where: str = "",
+) -> AtomPage:
+    page_size = _page_sizes.size_for(key, max_page_size)
+    while True:
         try:
-            feed = query_cs_window(start_utc, end_utc, start, page_size)
-            return feed, _feed_reported_items_per_page(feed)
-        except ArxivServiceUnavailableError as exc:
-            last_error = exc
-            message = f"arXiv API 503 at start={start}, max_results={page_size}; reducing page size"
+            page = fetch(page_size)
+        except ArxivServiceUnavailableError:
+            smaller = _page_sizes.record_unavailable(key, page_size)
+            if smaller is None:
+                raise
+            message = f"arXiv API 503 at {where}start={start}, max_results={page_size}; reducing page size to {smaller}"
             if DEBUG:
                 print(f"[WARN] {message}")
             if on_request_progress:
                 on_request_progress(message)
+            page_size = smaller
             continue
-    raise last_error or ArxivServiceUnavailableError("arXiv API service unavailable")
+        _page_sizes.record_success(key, max_page_size)
+        return page
 
 
-def _query_category_window_adaptive(
-    category: str,
+def _query_cs_window_adaptive(
+    start_utc: datetime,
+    end_utc: datetime,
+    start: int,
+    preferred_page_size: int,
+    on_request_progress=None,
+    seen_ids=None,
+) -> AtomPage:
+    return _query_with_learned_page_size(
+        "cs.*",
+        lambda page_size: query_cs_window(start_utc, end_utc, start, page_size, seen_ids=seen_ids),
+        start,
+        preferred_page_size,
+        on_request_progress=on_request_progress,
+    )
+
+
+def _query_stream_adaptive(
+    stream: QueryStream,
     start_utc: datetime,
     end_utc: datetime,
     start: int,
     preferred_page_size: int,
     on_request_progress=None,
-):
-    last_error: ArxivServiceUnavailableError | None = None
-    for page_size in _candidate_page_sizes(preferred_page_size):
+    seen_ids=None,
+) -> AtomPage:
+    def fetch(page_size: int) -> AtomPage:
+        if stream.single_category:
+            return query_category_window(stream.single_category, start_utc, end_utc, start, page_size, seen_ids=seen_ids)
+        return query_clause_window(stream.clause, start_utc, end_utc, start, page_size, seen_ids=seen_ids)
+
+    return _query_with_learned_page_size(
+        stream.key,
+        fetch,
+        start,
+        preferred_page_size,
+        on_request_progress=on_request_progress,
+        where=f"category={stream.key}, ",
+    )
+
+
+def _prefetch_ahead(items: Iterable[Any]) -> Iterator[Any]:
+    """Drive ``items`` on a background thread so the next one is fetched while the caller works."""
+    handoff: queue.Queue = queue.Queue(maxsize=1)
+    stop = threading.Event()
+
+    def produce() -> None:
         try:
-            feed = query_category_window(category, start_utc, end_utc, start, page_size)
-            return feed, _feed_reported_items_per_page(feed)
-        except ArxivServiceUnavailableError as exc:
-            last_error = exc
-            message = f"arXiv API 503 at category={category}, start={start}, max_results={page_size}; reducing page size"
-            if DEBUG:
-                print(f"[WARN] {message}")
-            if on_request_progress:
-                on_request_progress(message)
-            continue
-    raise last_error or ArxivServiceUnavailableError("arXiv API service unavailable")
+            for item in items:
+                if not _offer(("item", item)):
+                    return
+            _offer(("done", None))
+        except BaseException as exc:
+            _offer(("error", exc))
+
+    def _offer(message) -> bool:
+        while not stop.is_set():
+            try:
+                handoff.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    worker = threading.Thread(target=produce, name="arxiv-page-prefetch", daemon=True)
+    worker.start()
+    try:
+        while True:
+            kind, payload = handoff.get()
+            if kind == "error":
+                raise payload
+            if kind == "done":
+                return
+            yield payload
+    finally:
+        stop.set()
+
+
+@dataclass
+class _StreamPage:
+    plan: str
+    stream_key: str
+    start: int
+    next_start: int
+    page: AtomPage
+    # True once the stream has nothing left after this page.
+    done: bool
+    # Sub-windows still to fetch, the one ``next_start`` belongs to first;
+    # empty while the stream pages through its whole window.
+    windows: list = field(default_factory=list)
+
+
+def split_window(start_utc: datetime, end_utc: datetime, parts: int) -> list[tuple[datetime, datetime]]:
+    """Split an arXiv ``submittedDate`` window into up to ``parts`` adjacent slices, newest first.
+
+    The API matches whole minutes with both bounds inclusive, so slices are
+    cut on minute boundaries and each ends one minute before the next starts.
+    """
+    first_minute = start_utc.replace(second=0, microsecond=0)
+    minutes = int((end_utc - first_minute).total_seconds() // 60) + 1
+    parts = max(1, min(parts, minutes))
+    bounds = [first_minute + timedelta(minutes=minutes * index // parts) for index in range(parts + 1)]
+    slices = [
+        (start_utc if index == 0 else bounds[index], end_utc if index == parts - 1 else bounds[index + 1] - timedelta(minutes=1))
+        for index in range(parts)
+    ]
+    return slices[::-1]
 
 
-def iter_recent_cs_by_category(
+def _sub_window_count(page: AtomPage, page_size: int, window_start: datetime, window_end: datetime) -> int:
+    """How many sub-windows a window's first page asks for; 1 when it is small enough to page through."""
+    if ARXIV_SUBWINDOW_MAX_PAGES <= 0 or page.total_results is None:
+        return 1
+    if window_end - window_start < timedelta(minutes=1):
+        return 1
+    effective_page_size = min(page_size, page.items_per_page or page_size)
+    if page.total_results <= ARXIV_SUBWINDOW_MAX_PAGES * effective_page_size:
+        return 1
+    return math.ceil(page.total_results / effective_page_size)
+
+
+def _iter_category_pages(
+    categories: list[str],
     start_utc,
     end_utc,
-    start_offset: int = 0,
-    on_page_complete=None,
+    start_offset: int,
+    page_size: int,
+    seen_ids: set[str],
     on_request_progress=None,
-) -> Iterable[Dict[str, Any]]:
-    page_size = max(1, MAX_RESULTS_PER_PAGE)
-    categories = list(ARXIV_PRIMARY_CATEGORY_PREFIXES)
-    seen_ids: set[str] = set()
-    for category_index, category in enumerate(categories):
-        start = max(0, start_offset) if category_index == 0 else 0
+    plan_mode: str = "per_category",
+    plan_stats: QueryPlanStats | None = None,
+    cursors: PlanCursors | None = None,
+) -> Iterator[_StreamPage]:
+    plan, streams = initial_plan(categories, plan_mode, cursors.plan if cursors else None)
+    if cursors is not None and cursors.plan != plan:
+        # The saved offset belongs to the rejected plan as well.
+        cursors = None
+        start_offset = 0
+    stream_index = 0
+    while stream_index < len(streams):
+        stream = streams[stream_index]
+        windows = [(start_utc, end_utc)]
+        if cursors is not None:
+            if cursors.is_complete(stream.key):
+                stream_index += 1
+                continue
+            start = cursors.start_for(stream.key)
+            windows = [
+                (datetime.fromisoformat(window_start), datetime.fromisoformat(window_end))
+                for window_start, window_end in cursors.windows_for(stream.key)
+            ] or windows
+        else:
+            start = max(0, start_offset) if stream_index == 0 else 0
         previous_page_ids: list[str] | None = None
+        if plan_stats is not None:
+            plan_stats.plan = plan
+            plan_stats.streams = len(streams)
         if on_request_progress:
-            on_request_progress(f"querying arXiv category {category_index + 1}/{len(categories)}: {category}")
+            on_request_progress(f"querying arXiv {plan} stream {stream_index + 1}/{len(streams)}: {stream.key}")
+        replanned = False
         while True:
-            current_start = start
-            feed, actual_page_size = _query_category_window_adaptive(
-                category,
-                start_utc,
-                end_utc,
+            window_start, window_end = windows[0]
+            page = _query_stream_adaptive(
+                stream,
+                window_start,
+                window_end,
                 start,
                 page_size,
                 on_request_progress=on_request_progress,
+                seen_ids=seen_ids,
             )
-            entries = feed.entries or []
-            if not entries:
-                break
-            page_ids: list[str] = []
-            rows: list[Dict[str, Any]] = []
-            for entry in entries:
-                row = _entry_to_dict(entry)
-                arxiv_id = get_arxiv_id(row)
-                page_ids.append(arxiv_id)
-                rows.append(row)
-            if page_ids and page_ids == previous_page_ids:
+            if plan_stats is not None:
+                plan_stats.record_page(page)
+                if (
+                    start == 0
+                    and stream.single_category
+                    and page.total_results is not None
+                    and (window_start, window_end) == (start_utc, end_utc)
+                ):
+                    # The same count a delta refresh probes for this category.
+                    plan_stats.record_total(stream.single_category, page.total_results)
+            if (
+                plan_mode == "auto"
+                and plan == "combined"
+                and combined_too_large(page.total_results, ARXIV_COMBINED_QUERY_MAX_RESULTS)
+            ):
+                # Too deep to page through reliably; the first page is dropped
+                # and the categories are fetched one by one without overlap.
+                plan, streams = "exclusion", exclusion_streams(categories)
+                if on_request_progress:
+                    on_request_progress(
+                        f"combined arXiv query matched {page.total_results} papers; "
+                        f"switching to {len(streams)} per-category queries with exclusions"
+                    )
+                replanned = True
                 break
-            previous_page_ids = page_ids
-            for row in rows:
-                arxiv_id = get_arxiv_id(row)
-                if arxiv_id in seen_ids:
-                    continue
-                seen_ids.add(arxiv_id)
-                yield row
-            next_start = current_start + len(entries)
-            if on_page_complete:
-                on_page_complete(
-                    current_start=current_start,
-                    next_start=next_start,
-                    fetched_count=len(entries),
+            sub_windows = _sub_window_count(page, page_size, window_start, window_end) if start == 0 else 1
+            if sub_windows > 1:
+                # Page through slices of the window instead, so every offset
+                # stays within the first page or two; this first page is dropped.
+                slices = split_window(window_start, window_end, sub_windows)
+                windows = slices + windows[1:]
+                previous_page_ids = None
+                if plan_stats is not None:
+                    plan_stats.record_split(len(slices))
+                if on_request_progress:
+                    on_request_progress(
+                        f"arXiv {stream.key} matched {page.total_results} papers; "
+                        f"splitting its window into {len(slices)} sub-windows"
+                    )
+                continue
+            if not page.entry_count or page.ids == previous_page_ids:
+                window_done, next_start, page = True, start, AtomPage()
+            else:
+                previous_page_ids = page.ids
+                next_start = start + page.entry_count
+                window_done = (
+                    (page.items_per_page is not None and page.entry_count < page.items_per_page)
+                    # totalResults tells us this was the last page; skip the empty one after it.
+                    or (page.total_results is not None and next_start >= page.total_results)
                 )
-            if actual_page_size is not None and len(entries) < actual_page_size:
+            done = window_done and len(windows) == 1
+            if window_done and not done:
+                windows = windows[1:]
+                next_start = 0
+                previous_page_ids = None
+            yield _StreamPage(
+                plan,
+                stream.key,
+                start,
+                next_start,
+                page,
+                done,
+                [] if windows == [(start_utc, end_utc)] else [(left.isoformat(), right.isoformat()) for left, right in windows],
+            )
+            if done:
                 break
             start = next_start
+        if not replanned:
+            stream_index += 1
+        elif plan_stats is not None:
+            plan_stats.plan = plan
+            plan_stats.streams = len(streams)
+
+
+def iter_recent_cs_by_category(
+    start_utc,
+    end_utc,
+    start_offset: int = 0,
+    on_page_complete=None,
+    on_request_progress=None,
+    pipelined: bool | None = None,
+    plan_mode: str | None = None,
+    on_query_plan=None,
+    cursors: Dict[str, Any] | None = None,
+) -> Iterable[Dict[str, Any]]:
+    """Yield the in-window rows of every configured category once.
+
+    ``plan_mode`` picks how the categories are queried (see
+    ``query_planner``); ``on_query_plan`` receives the plan's request and
+    byte counts next to the naive per-category estimate once the scan ends.
+
+    A stream matching more than ``ARXIV_SUBWINDOW_MAX_PAGES`` pages is
+    fetched as time sub-windows of about one page each (see
+    :func:`split_window`) instead of with ever larger ``start`` offsets.
+
+    ``cursors`` is the ``cursors`` value last passed to ``on_page_complete``;
+    finished streams are skipped and the others resume at their offsets,
+    and at the sub-window they had reached. Without it ``start_offset``
+    applies to the first stream only; cursors saved under a different plan
+    are dropped together with ``start_offset``.
+    """
+    page_size = max(1, MAX_RESULTS_PER_PAGE)
+    categories = list(ARXIV_PRIMARY_CATEGORY_PREFIXES)
+    seen_ids: set[str] = set()
+    plan_stats = QueryPlanStats(categories, page_size)
+    resume_cursors = PlanCursors.from_dict(cursors)
+    progress = resume_cursors.copy() if resume_cursors else PlanCursors()
+    pages = _iter_category_pages(
+        categories,
+        start_utc,
+        end_utc,
+        start_offset,
+        page_size,
+        seen_ids,
+        on_request_progress=on_request_progress,
+        plan_mode=plan_mode or ARXIV_CATEGORY_QUERY_PLAN,
+        plan_stats=plan_stats,
+        cursors=resume_cursors,
+    )
+    if ARXIV_PIPELINED_PAGINATION if pipelined is None else pipelined:
+        pages = _prefetch_ahead(pages)
+    for item in pages:
+        for row in item.page.rows:
+            arxiv_id = get_arxiv_id(row)
+            if arxiv_id in seen_ids:
+                continue
+            seen_ids.add(arxiv_id)
+            yield row
+        # Cursors only move once the consumer has taken every row of the page.
+        progress.advance(item.plan, item.stream_key, item.next_start, item.done, item.windows)
+        if on_page_complete:
+            on_page_complete(
+                current_start=item.start,
+                next_start=item.next_start,
+                fetched_count=item.page.entry_count,
+                cursors=progress.to_dict(),
+            )
+    if on_query_plan:
+        on_query_plan(plan_stats.summary())
+
+
+def probe_category_total(category: str, start_utc: datetime, end_utc: datetime) -> int | None:
+    """``totalResults`` of ``category`` in the window, read from a one-row request."""
+    return query_category_window(category, start_utc, end_utc, 0, 1).total_results
+
+
+def iter_category_since(
+    category: str,
+    since_utc: datetime,
+    end_utc: datetime,
+    known_ids: set[str] | None = None,
+    on_request_progress=None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield rows of ``category`` submitted in ``[since_utc TO end_utc]`` that are not in ``known_ids``.
+
+    arXiv matches whole minutes, so rows from the watermark minute itself
+    come back again; they are skipped while parsing.
+    """
+    known_ids = known_ids if known_ids is not None else set()
+    pages = _iter_category_pages(
+        [category],
+        since_utc,
+        end_utc,
+        0,
+        max(1, MAX_RESULTS_PER_PAGE),
+        known_ids,
+        on_request_progress=on_request_progress,
+        plan_mode="per_category",
+    )
+    for item in pages:
+        yield from item.page.rows
 
 
 def iter_recent_cs_single(
@@ -648,41 +1111,37 @@ def iter_recent_cs_single(
     while True:
         current_start = start
         if start_utc and end_utc:
-            feed, actual_page_size = _query_cs_window_adaptive(
+            page = _query_cs_window_adaptive(
                 start_utc,
                 end_utc,
                 start,
                 page_size,
                 on_request_progress=on_request_progress,
             )
+            actual_page_size = page.items_per_page
         else:
-            feed = query_cs_sorted(start, page_size)
+            page = query_cs_sorted(start, page_size)
             actual_page_size = page_size
-        entries = feed.entries or []
-        if not entries:
+        if not page.entry_count:
             break
-        page_ids: list[str] = []
-        rows: list[Dict[str, Any]] = []
-        for entry in entries:
-            row = _entry_to_dict(entry)
-            page_ids.append(get_arxiv_id(row))
-            rows.append(row)
-        if page_ids and page_ids == previous_page_ids:
+        if page.ids == previous_page_ids:
             break
-        previous_page_ids = page_ids
-        for row in rows:
+        previous_page_ids = page.ids
+        for row in page.rows:
             published = row["published"]
             if start_utc and published and published < start_utc:
                 return
             yield row
-        next_start = current_start + len(entries)
+        next_start = current_start + page.entry_count
         if on_page_complete:
             on_page_complete(
                 current_start=current_start,
                 next_start=next_start,
-                fetched_count=len(entries),
+                fetched_count=page.entry_count,
             )
-        if actual_page_size is not None and len(entries) < actual_page_size:
+        if actual_page_size is not None and page.entry_count < actual_page_size:
+            break
+        if page.total_results is not None and next_start >= page.total_results:
             break
         start = next_start
 
@@ -693,6 +1152,8 @@ def iter_recent_cs(
     start_offset: int = 0,
     on_page_complete=None,
     on_request_progress=None,
+    on_query_plan=None,
+    cursors: Dict[str, Any] | None = None,
     **_ignored,
 ) -> Iterable[Dict[str, Any]]:
     if start_utc and end_utc:
@@ -702,6 +1163,8 @@ def iter_recent_cs(
             start_offset=start_offset,
             on_page_complete=on_page_complete,
             on_request_progress=on_request_progress,
+            on_query_plan=on_query_plan,
+            cursors=cursors,
         )
     return iter_recent_cs_single(
         start_utc=start_utc,
@@ -713,6 +1176,11 @@ def iter_recent_cs(
 
 
 def extract_pdf_url(entry: Dict[str, Any]) -> str | None:
+    # Papers resolve the URL at parse time and lazy baseline entries keep it
+    # in their index; only older row dicts still carry raw ``links``.
+    resolved_url = getattr(entry, "pdf_url", None) or entry.get("pdf_url")
+    if resolved_url:
+        return resolved_url
     for link in entry.get("links", []):
         if link.get("type") == "application/pdf" or link.get("title") == "pdf":
             return link.get("href")
@@ -720,5 +1188,4 @@ def extract_pdf_url(entry: Dict[str, Any]) -> str | None:
 
 
 def get_arxiv_id(entry: Dict[str, Any]) -> str:
-    raw = (entry.get("id") or "").rstrip("/")
-    return raw.split("/")[-1]
+    return entry_arxiv_id(entry)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from datetime import date, datetime, timedelta, timezone
-from typing import Dict, Any, Tuple
-from config import LOCAL_TZ, ARXIV_PRIMARY_CATEGORY_PREFIXES, ARXIV_EXCLUDED_CATEGORIES
+from typing import Any, Mapping, Tuple
+from config import LOCAL_TZ, ARXIV_PRIMARY_CATEGORY_PREFIXES, ARXIV_EXCLUDED_CATEGORIES, ARXIV_WINDOW_SETTLE_HOURS
 
 
 def arxiv_day_window(target_day: date) -> Tuple[datetime, datetime]:
@@ -17,12 +17,18 @@ def arxiv_previous_day_window(now_local: datetime) -> Tuple[datetime, datetime]:
     return arxiv_day_window(target_day)
 
 
-def in_time_window(entry: Dict[str, Any], start_utc: datetime, end_utc: datetime) -> bool:
+def window_is_settled(end_utc: datetime, now_utc: datetime | None = None) -> bool:
+    """Return True once no new submissions are expected to be announced inside the window."""
+    now_utc = now_utc or datetime.now(timezone.utc)
+    return now_utc - end_utc >= timedelta(hours=ARXIV_WINDOW_SETTLE_HOURS)
+
+
+def in_time_window(entry: Mapping[str, Any], start_utc: datetime, end_utc: datetime) -> bool:
     dt = entry.get("published")
     return bool(dt and start_utc <= dt <= end_utc)
 
 
-def is_cs(entry: Dict[str, Any]) -> bool:
+def is_cs(entry: Mapping[str, Any]) -> bool:
     categories = [cat for cat in (entry.get("categories") or []) if isinstance(cat, str)]
     if categories:
         allowed = any(
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Mapping
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class PoolStats:
+    """Thread-safe per-host counters for connection reuse and handshake time."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, float]] = {}
+
+    def _bucket(self, host: str) -> Dict[str, float]:
+        bucket = self._hosts.get(host)
+        if bucket is None:
+            bucket = {"requests": 0, "new_connections": 0, "handshake_sec": 0.0, "idle_closed": 0}
+            self._hosts[host] = bucket
+        return bucket
+
+    def record_checkout(self, host: str) -> None:
+        with self._lock:
+            self._bucket(host)["requests"] += 1
+
+    def record_connect(self, host: str, elapsed: float) -> None:
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket["new_connections"] += 1
+            bucket["handshake_sec"] += elapsed
+
+    def record_idle_close(self, host: str) -> None:
+        with self._lock:
+            self._bucket(host)["idle_closed"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {host: dict(bucket) for host, bucket in self._hosts.items()}
+
+
+def summarize_pool_stats(
+    before: Mapping[str, Mapping[str, float]],
+    after: Mapping[str, Mapping[str, float]],
+) -> Dict[str, Any]:
+    """Turn two ``PoolStats.snapshot()`` results into report metrics for the span between them."""
+    hosts: Dict[str, Dict[str, Any]] = {}
+    totals = {"requests": 0, "new_connections": 0, "handshake_sec": 0.0, "idle_closed": 0}
+    for host, current in after.items():
+        previous = before.get(host, {})
+        delta = {key: current.get(key, 0) - previous.get(key, 0) for key in totals}
+        if delta["requests"] <= 0 and delta["new_connections"] <= 0:
+            continue
+        for key in totals:
+            totals[key] += delta[key]
+        hosts[host] = _describe(delta)
+    summary = _describe(totals)
+    summary["hosts"] = hosts
+    return summary
+
+
+def _describe(counts: Mapping[str, float]) -> Dict[str, Any]:
+    requests_made = int(counts["requests"])
+    new_connections = int(counts["new_connections"])
+    return {
+        "requests": requests_made,
+        "new_connections": new_connections,
+        "reused_connections": max(0, requests_made - new_connections),
+        "idle_closed": int(counts["idle_closed"]),
+        "handshake_sec": round(counts["handshake_sec"], 3),
+        "avg_handshake_ms": round(counts["handshake_sec"] / new_connections * 1000, 1) if new_connections else 0.0,
+    }
+
+
+_thread_connects = threading.local()
+
+
+def take_thread_connect_sec() -> float:
+    """Connect time spent by this thread since the previous call."""
+    elapsed = getattr(_thread_connects, "seconds", 0.0)
+    _thread_connects.seconds = 0.0
+    return elapsed
+
+
+class _TimedConnectionMixin:
+    pool_stats: PoolStats | None = None
+    stats_host = ""
+    idle_since: float | None = None
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()
+        elapsed = time.perf_counter() - started
+        _thread_connects.seconds = getattr(_thread_connects, "seconds", 0.0) + elapsed
+        if self.pool_stats is not None:
+            self.pool_stats.record_connect(self.stats_host, elapsed)
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _ManagedPoolMixin:
+    session_manager: "HttpSessionManager"
+
+    def __init__(self, host: str, *args: Any, **kwargs: Any) -> None:
+        kwargs["maxsize"] = self.session_manager.maxsize_for(host)
+        super().__init__(host, *args, **kwargs)
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn.pool_stats = self.session_manager.stats
+        conn.stats_host = self.host
+        return conn
+
+    def _get_conn(self, timeout: float | None = None):
+        conn = super()._get_conn(timeout=timeout)
+        idle_since = getattr(conn, "idle_since", None)
+        idle_timeout = self.session_manager.keepalive_idle_sec
+        if idle_since is not None and idle_timeout > 0 and time.monotonic() - idle_since > idle_timeout:
+            # Servers and proxies drop idle keep-alive sockets silently; close
+            # it here so the request opens a fresh one instead of failing.
+            if not conn.is_closed:
+                conn.close()
+                self.session_manager.stats.record_idle_close(self.host)
+        self.session_manager.stats.record_checkout(self.host)
+        return conn
+
+    def _put_conn(self, conn) -> None:
+        if conn is not None:
+            conn.idle_since = time.monotonic()
+        super()._put_conn(conn)
+
+
+class HttpSessionManager:
+    """Builds ``requests`` sessions whose connection pools share sizing, keep-alive and statistics.
+
+    ``pool_maxsize_by_host`` overrides ``pool_maxsize`` for a host and its
+    subdomains.
+    """
+
+    def __init__(
+        self,
+        *,
+        user_agent: str,
+        pool_maxsize: int = 4,
+        pool_maxsize_by_host: Mapping[str, int] | None = None,
+        pool_connections: int = 8,
+        keepalive_idle_sec: float = 30.0,
+    ) -> None:
+        self.user_agent = user_agent
+        self.pool_maxsize = max(1, int(pool_maxsize))
+        self.pool_maxsize_by_host = {host.lower(): max(1, int(size)) for host, size in (pool_maxsize_by_host or {}).items()}
+        self.pool_connections = max(1, int(pool_connections))
+        self.keepalive_idle_sec = max(0.0, float(keepalive_idle_sec))
+        self.stats = PoolStats()
+        self.pool_classes_by_scheme = {
+            "http": type("ManagedHTTPConnectionPool", (_ManagedPoolMixin, HTTPConnectionPool), {
+                "session_manager": self,
+                "ConnectionCls": TimedHTTPConnection,
+            }),
+            "https": type("ManagedHTTPSConnectionPool", (_ManagedPoolMixin, HTTPSConnectionPool), {
+                "session_manager": self,
+                "ConnectionCls": TimedHTTPSConnection,
+            }),
+        }
+
+    def maxsize_for(self, host: str) -> int:
+        host = (host or "").lower()
+        best = None
+        for candidate, size in self.pool_maxsize_by_host.items():
+            if host == candidate or host.endswith(f".{candidate}"):
+                if best is None or len(candidate) > len(best[0]):
+                    best = (candidate, size)
+        return best[1] if best else self.pool_maxsize
+
+    def build_session(self, *, proxies: Dict[str, str] | None = None, trust_env: bool = False) -> requests.Session:
+        session = requests.Session()
+        # Hidden urllib3 retries would bypass the explicit arXiv request scheduler.
+        adapter = ManagedHTTPAdapter(
+            self,
+            max_retries=0,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"User-Agent": self.user_agent})
+        session.trust_env = trust_env
+        if proxies:
+            session.proxies.update(proxies)
+        return session
+
+    def stats_snapshot(self) -> Dict[str, Dict[str, float]]:
+        return self.stats.snapshot()
+
+
+class ManagedHTTPAdapter(HTTPAdapter):
+    def __init__(self, session_manager: HttpSessionManager, **kwargs: Any) -> None:
+        self.session_manager = session_manager
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self.session_manager.pool_classes_by_scheme
+
+    def proxy_manager_for(self, proxy: str, **proxy_kwargs: Any):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        # SOCKS managers bring their own pool classes.
+        if not proxy.lower().startswith("socks"):
+            manager.pool_classes_by_scheme = self.session_manager.pool_classes_by_scheme
+        return manager
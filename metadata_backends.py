@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, Container, Dict, Iterator, Mapping
+
+from arxiv_oai import OaiPage, parse_list_records
+from config import (
+    ARXIV_OAI_ENDPOINT,
+    ARXIV_OAI_MAX_RETRIES,
+    ARXIV_OAI_SET,
+    ARXIV_OAI_UNTIL_MARGIN_DAYS,
+    DEBUG,
+    REQUEST_TIMEOUT,
+)
+from fetch_arxiv import iter_recent_cs, request_with_network_fallback, traced_parse
+from paper import Paper
+
+OAI_PLAN = "oai_pmh"
+
+
+class MetadataBackend(ABC):
+    """Source of the baseline rows for a time window.
+
+    ``iter_entries`` yields :class:`paper.Paper` rows and reports progress
+    the way :func:`fetch_arxiv.iter_recent_cs` does: ``on_page_complete``
+    after every page with a ``cursors`` value that, passed back on the next
+    call, resumes after that page, and ``on_query_plan`` once with a summary
+    holding at least ``plan``, ``requests``, ``bytes`` and ``rows``.
+    Rows whose arXiv ID is in ``seen_ids`` (those a resumed checkpoint
+    already holds) may be skipped without being converted.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def iter_entries(
+        self,
+        start_utc: datetime,
+        end_utc: datetime,
+        start_offset: int = 0,
+        cursors: Mapping[str, Any] | None = None,
+        on_page_complete=None,
+        on_query_plan=None,
+        on_request_progress=None,
+        seen_ids: Container[str] | None = None,
+    ) -> Iterator[Paper]:
+        ...
+
+
+class SearchApiBackend(MetadataBackend):
+    """The arXiv search API, queried per category (see ``query_planner``).
+
+    It keeps its own set of the IDs it has yielded; ``seen_ids`` is unused.
+    """
+
+    name = "search_api"
+
+    def iter_entries(self, start_utc, end_utc, start_offset=0, cursors=None, on_page_complete=None, on_query_plan=None, on_request_progress=None, seen_ids=None):
+        return iter(iter_recent_cs(
+            start_utc=start_utc,
+            end_utc=end_utc,
+            start_offset=start_offset,
+            cursors=cursors,
+            on_page_complete=on_page_complete,
+            on_query_plan=on_query_plan,
+            on_request_progress=on_request_progress,
+        ))
+
+
+class OaiPmhError(RuntimeError):
+    pass
+
+
+class OaiPmhBackend(MetadataBackend):
+    """OAI-PMH ``ListRecords`` harvest of one set in the ``arXivRaw`` format.
+
+    OAI datestamps change whenever a paper is revised, so the harvest runs
+    from the window's first day to ``until_margin_days`` past its end (or up
+    to today when that is ``None``) and keeps the records whose v1
+    submission falls inside the window; papers revised after ``until`` are
+    missed. Requests go through the shared
+    scheduler (the ``oai`` lane) and its 503/Retry-After cooldown. The
+    resumption token is the checkpoint cursor; a token the server no longer
+    accepts restarts the harvest, and the caller drops the repeated rows.
+    """
+
+    name = OAI_PLAN
+
+    def __init__(
+        self,
+        endpoint: str = ARXIV_OAI_ENDPOINT,
+        set_spec: str = ARXIV_OAI_SET,
+        max_retries: int = ARXIV_OAI_MAX_RETRIES,
+        until_margin_days: int | None = ARXIV_OAI_UNTIL_MARGIN_DAYS,
+    ) -> None:
+        self.endpoint = endpoint
+        self.set_spec = set_spec
+        self.max_retries = max(0, max_retries)
+        self.until_margin_days = until_margin_days
+
+    def _list_records(self, params: Dict[str, str], on_request_progress=None, seen_ids: Container[str] | None = None) -> OaiPage:
+        retries = 0
+        while True:
+            response = request_with_network_fallback(self.endpoint, params=params, timeout=REQUEST_TIMEOUT)
+            if response.status_code in (429, 503) and retries < self.max_retries:
+                # The scheduler has already paused the lane for Retry-After.
+                retries += 1
+                if on_request_progress:
+                    on_request_progress(f"arXiv OAI-PMH answered HTTP {response.status_code}; retrying after its Retry-After")
+                continue
+            response.raise_for_status()
+            with traced_parse():
+                return parse_list_records(response.content, seen_ids)
+
+    def iter_entries(self, start_utc, end_utc, start_offset=0, cursors=None, on_page_complete=None, on_query_plan=None, on_request_progress=None, seen_ids=None):
+        from_day = start_utc.astimezone(timezone.utc).date().isoformat()
+        until = datetime.now(timezone.utc).date()
+        if self.until_margin_days is not None:
+            until = min(until, end_utc.astimezone(timezone.utc).date() + timedelta(days=max(0, self.until_margin_days)))
+        until_day = until.isoformat()
+        token = None
+        offset = 0
+        if isinstance(cursors, Mapping) and cursors.get("plan") == OAI_PLAN and cursors.get("from") == from_day:
+            if cursors.get("complete"):
+                return
+            token = cursors.get("resumption_token") or None
+            until_day = cursors.get("until") or until_day
+            offset = max(0, int(start_offset or 0)) if token else 0
+        summary = {"plan": OAI_PLAN, "requests": 0, "bytes": 0, "rows": 0, "records": 0, "deleted": 0, "outside_window": 0, "skipped_seen": 0, "restarts": 0}
+        first_params = {"verb": "ListRecords", "metadataPrefix": "arXivRaw", "set": self.set_spec, "from": from_day, "until": until_day}
+        while True:
+            params = {"verb": "ListRecords", "resumptionToken": token} if token else first_params
+            page = self._list_records(params, on_request_progress, seen_ids)
+            summary["requests"] += 1
+            summary["bytes"] += page.payload_bytes
+            if page.error_code == "badResumptionToken" and token and not summary["restarts"]:
+                if DEBUG:
+                    print(f"[WARN] OAI-PMH resumption token expired ({page.error_message}); restarting the harvest")
+                summary["restarts"] += 1
+                token = None
+                offset = 0
+                continue
+            if page.error_code and page.error_code != "noRecordsMatch":
+                raise OaiPmhError(f"arXiv OAI-PMH error {page.error_code} at {self.endpoint}: {page.error_message}")
+            summary["records"] += page.record_count
+            summary["deleted"] += page.deleted
+            summary["skipped_seen"] += page.skipped_seen
+            for row in page.rows:
+                if row.published is not None and not start_utc <= row.published <= end_utc:
+                    summary["outside_window"] += 1
+                    continue
+                summary["rows"] += 1
+                yield row
+            token = page.resumption_token
+            next_offset = offset + page.record_count
+            if on_page_complete:
+                on_page_complete(
+                    current_start=offset,
+                    next_start=next_offset,
+                    fetched_count=page.record_count,
+                    cursors={
+                        "plan": OAI_PLAN,
+                        "from": from_day,
+                        "until": until_day,
+                        "resumption_token": token,
+                        "complete": token is None,
+                    },
+                )
+            offset = next_offset
+            if token is None:
+                break
+        if on_query_plan:
+            on_query_plan(summary)
+
+
+METADATA_BACKENDS = {
+    SearchApiBackend.name: SearchApiBackend,
+    OaiPmhBackend.name: OaiPmhBackend,
+}
+
+
+def get_metadata_backend(name: str) -> MetadataBackend:
+    try:
+        return METADATA_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"unknown baseline metadata backend: {name}") from None
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, List, Mapping
+
+
+class PageSizeController:
+    """AIMD page size per query key (category or plan stream).
+
+    Every ``grow_after`` successful pages in a row add ``step`` to the key's
+    size, up to the caller's maximum; an HTTP 503 multiplies it by
+    ``backoff``, down to ``minimum``.
+    Learned sizes live in the persisted request state through
+    ``read_sizes``/``write_sizes``, so a later run starts from the size that
+    last worked instead of paying for the failed large request again.
+    """
+
+    def __init__(
+        self,
+        read_sizes: Callable[[], Mapping[str, Any] | None],
+        write_sizes: Callable[[Dict[str, int]], None],
+        minimum: int = 100,
+        step: int = 100,
+        backoff: float = 0.5,
+        grow_after: int = 4,
+    ) -> None:
+        self._read_sizes = read_sizes
+        self._write_sizes = write_sizes
+        self.minimum = max(1, minimum)
+        self.step = max(0, step)
+        self.backoff = min(max(backoff, 0.0), 1.0)
+        self.grow_after = max(1, grow_after)
+        self._streaks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._history: List[Dict[str, Any]] = []
+
+    def _sizes(self) -> Dict[str, int]:
+        sizes: Dict[str, int] = {}
+        for key, value in (self._read_sizes() or {}).items():
+            try:
+                sizes[str(key)] = int(value)
+            except (TypeError, ValueError):
+                continue
+        return sizes
+
+    def size_for(self, key: str, maximum: int) -> int:
+        floor = min(self.minimum, maximum)
+        return max(floor, min(maximum, self._sizes().get(key, maximum)))
+
+    def record_success(self, key: str, maximum: int) -> None:
+        current = self._sizes().get(key)
+        if current is None or current >= maximum:
+            return
+        with self._lock:
+            streak = self._streaks.get(key, 0) + 1
+            self._streaks[key] = 0 if streak >= self.grow_after else streak
+        if streak >= self.grow_after:
+            self._set(key, current, min(maximum, current + self.step), "grow")
+
+    def record_unavailable(self, key: str, size: int) -> int | None:
+        """Shrink ``key`` after a 503 at ``size``; ``None`` once it is already at the minimum."""
+        with self._lock:
+            self._streaks.pop(key, None)
+        smaller = max(min(self.minimum, size), int(size * self.backoff))
+        if smaller >= size:
+            return None
+        self._set(key, size, smaller, "shrink")
+        return smaller
+
+    def _set(self, key: str, previous: int, size: int, event: str) -> None:
+        with self._lock:
+            sizes = self._sizes()
+            sizes[key] = size
+            self._write_sizes(sizes)
+            self._history.append({"key": key, "event": event, "from": previous, "to": size})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"sizes": self._sizes(), "history": list(self._history)}
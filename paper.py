@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List
+
+
+def arxiv_id_from_entry_id(raw: str | None) -> str:
+    return (raw or "").strip().rstrip("/").split("/")[-1]
+
+
+def entry_arxiv_id(entry: Mapping[str, Any]) -> str:
+    """arXiv ID of a :class:`Paper` or of a plain row dict."""
+    return getattr(entry, "arxiv_id", None) or arxiv_id_from_entry_id(entry.get("id"))
+
+
+def _parse_iso(value: Any) -> datetime | None:
+    if isinstance(value, datetime) or value is None:
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _pdf_url_from_links(links: Iterable[Mapping[str, Any]] | None) -> str | None:
+    for link in links or ():
+        if link.get("type") == "application/pdf" or link.get("title") == "pdf":
+            return link.get("href")
+    return None
+
+
+def _links_for(entry_id: str | None, pdf_url: str | None) -> List[Dict[str, str]]:
+    """The feed ``links`` an entry is serialized with, rebuilt from its abstract and PDF URLs."""
+    links = []
+    if entry_id:
+        links.append({"href": entry_id, "rel": "alternate", "type": "text/html"})
+    if pdf_url:
+        links.append({"href": pdf_url, "rel": "related", "type": "application/pdf", "title": "pdf"})
+    return links
+
+
+class Paper(Mapping):
+    """One arXiv entry as it moves through the pipeline.
+
+    Category strings are interned, the arXiv ID is computed once and the
+    feed's ``links`` are reduced to the PDF URL. Read access by key works
+    like the row dicts this replaced (``paper["published"]``,
+    ``paper.get("categories")``); plain dicts are produced only at the JSON
+    boundary by :meth:`to_dict`.
+    """
+
+    __slots__ = (
+        "id",
+        "arxiv_id",
+        "title",
+        "summary",
+        "authors",
+        "published",
+        "updated",
+        "primary_category",
+        "categories",
+        "comment",
+        "journal_ref",
+        "pdf_url",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        title: str = "",
+        summary: str = "",
+        authors: List[str] | None = None,
+        published: datetime | None = None,
+        updated: datetime | None = None,
+        primary_category: str | None = None,
+        categories: Iterable[str] | None = None,
+        comment: str = "",
+        journal_ref: str = "",
+        pdf_url: str | None = None,
+        arxiv_id: str | None = None,
+    ) -> None:
+        self.id = id
+        self.arxiv_id = arxiv_id or arxiv_id_from_entry_id(id)
+        self.title = title
+        self.summary = summary
+        self.authors = authors or []
+        self.published = published
+        self.updated = updated
+        self.primary_category = sys.intern(primary_category) if primary_category else primary_category
+        self.categories = [sys.intern(category) for category in categories or ()]
+        self.comment = comment
+        self.journal_ref = journal_ref
+        self.pdf_url = pdf_url
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> "Paper":
+        """Build a paper from a row dict, serialized (ISO dates) or not, with either ``pdf_url`` or ``links``."""
+        if isinstance(payload, Paper):
+            return payload
+        return cls(
+            id=payload.get("id") or "",
+            title=payload.get("title") or "",
+            summary=payload.get("summary") or "",
+            authors=list(payload.get("authors") or []),
+            published=_parse_iso(payload.get("published")),
+            updated=_parse_iso(payload.get("updated")),
+            primary_category=payload.get("primary_category"),
+            categories=payload.get("categories") or [],
+            comment=payload.get("comment") or "",
+            journal_ref=payload.get("journal_ref") or "",
+            pdf_url=payload.get("pdf_url") or _pdf_url_from_links(payload.get("links")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready dict with ISO-formatted dates.
+
+        ``links`` is written back next to ``pdf_url`` so manifests and JSON
+        output keep the schema readers of the feed rows expect.
+        """
+        payload = {name: getattr(self, name) for name in self.__slots__}
+        for name in ("published", "updated"):
+            if payload[name] is not None:
+                payload[name] = payload[name].isoformat()
+        payload["authors"] = list(self.authors)
+        payload["categories"] = list(self.categories)
+        payload["links"] = _links_for(self.id, self.pdf_url)
+        return payload
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _PAPER_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Paper({self.arxiv_id!r})"
+
+
+_PAPER_FIELDS = frozenset(Paper.__slots__)
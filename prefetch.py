@@ -2,20 +2,29 @@
 
 import re
 import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple
+from urllib.parse import urlparse
 
 from requests.exceptions import HTTPError
 
 from config import (
+    ARXIV_BASE_URL,
     CONNECT_TIMEOUT_SEC,
     MIN_PDF_BYTES,
     PDF_CACHE_DIR,
+    PDF_DOWNLOAD_WORKERS,
+    PDF_DOWNLOADS_PER_HOST,
     PDF_CACHE_UNIVERSITY_ONLY_DIR,
     PDF_CACHE_WITH_COMPANY_DIR,
     READ_TIMEOUT_SEC,
 )
-from fetch_arxiv import extract_pdf_url, get_arxiv_id, iter_pdf_urls, request_with_network_fallback
+from fetch_arxiv import extract_pdf_url, get_arxiv_id, iter_pdf_urls, note_response_transferred, request_with_network_fallback
+from request_scheduler import site_for_host
 from runtime_control import PipelineController
 
 SAFE_NAME = re.compile(r"[^a-zA-Z0-9._/-]+")
@@ -51,7 +60,7 @@ def _format_download_error(url: str, exc: Exception | None) -> str:
     return f"{url}: {type(exc).__name__}: {exc}"
 
 
-def _candidate_pdf_urls(entry: Dict[str, Any], aid: str):
+def _candidate_pdf_urls(entry: Mapping[str, Any], aid: str):
     seen = set()
     official_url = extract_pdf_url(entry)
     if official_url:
@@ -67,10 +76,10 @@ def _base_arxiv_id(aid: str) -> str:
     return aid.rsplit("v", 1)[0] if "v" in aid else aid
 
 
-def _candidate_download_urls(entry: Dict[str, Any], aid: str) -> Iterable[Tuple[str, str]]:
+def _candidate_download_urls(entry: Mapping[str, Any], aid: str) -> Iterable[Tuple[str, str]]:
     for url in _candidate_pdf_urls(entry, aid):
         yield url, "pdf"
-    yield f"https://arxiv.org/html/{_base_arxiv_id(aid)}", "html"
+    yield f"{ARXIV_BASE_URL or 'https://arxiv.org'}/html/{_base_arxiv_id(aid)}", "html"
 
 
 def _find_cached_file(cache_dir: Path, filename: str) -> Path | None:
@@ -113,16 +122,171 @@ def organize_cached_pdfs(
     return organized
 
 
-def cache_pdfs(entries: List[Dict[str, Any]], report_date: str | None = None) -> Dict[str, str]:
+def cache_pdfs(entries: List[Mapping[str, Any]], report_date: str | None = None) -> Dict[str, str]:
     cached, _stats = cache_pdfs_with_stats(entries, report_date=report_date)
     return cached
 
 
+@dataclass
+class _PdfResult:
+    aid: str
+    path: str | None = None
+    outcome: str = "failed"
+    error: str | None = None
+    events: List[Tuple[str, str]] = field(default_factory=list)
+
+
+_host_slots: Dict[str, threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
+
+
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    """Per-site download slot, held until the body has been streamed.
+
+    The scheduler lane admits the same number of requests, but releases its
+    slot once the response headers arrive.
+    """
+    site = site_for_host(urlparse(url).hostname or "")
+    with _host_slots_lock:
+        slot = _host_slots.get(site)
+        if slot is None:
+            slot = threading.BoundedSemaphore(max(1, PDF_DOWNLOADS_PER_HOST))
+            _host_slots[site] = slot
+        return slot
+
+
+def _download_document(
+    url: str,
+    document_type: str,
+    target: Path,
+    controller: PipelineController | None,
+) -> Tuple[int | None, bool]:
+    """Stream ``url`` into ``target`` through a ``.part`` file.
+
+    Returns ``(size, stored)``; ``stored`` is False when a PDF turned out to
+    be smaller than ``MIN_PDF_BYTES`` and was discarded.
+    """
+    temp_path = target.with_suffix(f"{target.suffix}.part")
+    with _host_slot(url):
+        response = request_with_network_fallback(
+            url,
+            timeout=(CONNECT_TIMEOUT_SEC, READ_TIMEOUT_SEC),
+            stream=True,
+        )
+        # Every exit has to close the response, or its pooled connection is never released.
+        try:
+            response.raise_for_status()
+            content_length = _content_length(response)
+            if document_type == "pdf" and content_length is not None and content_length < MIN_PDF_BYTES:
+                return content_length, False
+            bytes_written = 0
+            with open(temp_path, "wb") as handle:
+                for chunk in response.iter_content(chunk_size=256 * 1024):
+                    if controller:
+                        controller.checkpoint()
+                    if chunk:
+                        bytes_written += len(chunk)
+                        handle.write(chunk)
+        except BaseException:
+            try:
+                temp_path.unlink(missing_ok=True)
+            except Exception:
+                pass
+            raise
+        finally:
+            response.close()
+        note_response_transferred(bytes_written)
+    if document_type == "pdf" and bytes_written < MIN_PDF_BYTES:
+        try:
+            temp_path.unlink(missing_ok=True)
+        except Exception:
+            pass
+        return bytes_written, False
+    temp_path.replace(target)
+    return bytes_written, True
+
+
+def _cache_one_pdf(entry: Mapping[str, Any], cache_dir: Path, controller: PipelineController | None) -> _PdfResult:
+    aid = get_arxiv_id(entry)
+    result = _PdfResult(aid)
+    rel = SAFE_NAME.sub("_", aid) + ".pdf"
+    fpath = _find_cached_file(cache_dir, rel) or (cache_dir / rel)
+    html_path = fpath.with_suffix(".html")
+    if fpath.exists():
+        existing_size = fpath.stat().st_size
+        if existing_size < MIN_PDF_BYTES:
+            result.outcome = "skipped_small"
+            try:
+                fpath.unlink()
+            except Exception:
+                pass
+            result.events.append((f"跳过小于1MB的PDF缓存: {aid} ({existing_size} bytes)", "warning"))
+            return result
+        result.path = str(fpath)
+        result.outcome = "cache_hit"
+        result.events.append((f"缓存命中: {aid}", "running"))
+        return result
+    if html_path.exists():
+        result.path = str(html_path)
+        result.outcome = "cache_hit"
+        result.events.append((f"HTML fallback 缓存命中: {aid}", "running"))
+        return result
+
+    last_err = None
+    last_url = None
+    errors_seen: List[str] = []
+    for url, document_type in _candidate_download_urls(entry, aid):
+        last_url = url
+        if controller:
+            controller.checkpoint()
+        try:
+            current_path = fpath if document_type == "pdf" else fpath.with_suffix(".html")
+            size, stored = _download_document(url, document_type, current_path, controller)
+            if not stored:
+                result.outcome = "skipped_small"
+                result.events.append((f"跳过小于1MB的PDF: {aid} ({size} bytes)", "warning"))
+                return result
+            result.path = str(current_path)
+            result.outcome = "downloaded"
+            label = "HTML fallback 下载完成" if document_type == "html" else "下载完成"
+            result.events.append((f"{label}: {aid}", "running"))
+            return result
+        except HTTPError as exc:
+            last_err = exc
+            errors_seen.append(_format_download_error(url, exc))
+            continue
+        except Exception as exc:
+            last_err = exc
+            errors_seen.append(_format_download_error(url, exc))
+            try:
+                fpath.with_suffix(f"{fpath.suffix}.part").unlink(missing_ok=True)
+                fpath.with_suffix(".html.part").unlink(missing_ok=True)
+            except Exception:
+                pass
+            continue
+
+    detail = "; ".join(errors_seen) if errors_seen else _format_download_error(last_url or "-", last_err)
+    result.error = f"cache failed for {aid}: {detail}"
+    result.events.append((f"缓存失败: {aid} ({result.error})", "warning"))
+    return result
+
+
+def _wait_for_result(future: Future, controller: PipelineController | None) -> _PdfResult:
+    while True:
+        if controller:
+            controller.checkpoint()
+        try:
+            return future.result(timeout=0.1)
+        except FutureTimeoutError:
+            continue
+
+
 def cache_pdfs_with_stats(
-    entries: List[Dict[str, Any]],
+    entries: List[Mapping[str, Any]],
     report_date: str | None = None,
     controller: PipelineController | None = None,
     progress_callback: ProgressCallback | None = None,
+    max_workers: int | None = None,
 ) -> Tuple[Dict[str, str], Dict[str, Any]]:
     cache_dir = Path(PDF_CACHE_DIR) / report_date if report_date else Path(PDF_CACHE_DIR)
     ensure_dir(cache_dir)
@@ -136,123 +300,36 @@ def cache_pdfs_with_stats(
         "errors": [],
         "cache_dir": str(cache_dir),
     }
+    if controller:
+        controller.checkpoint()
+    if not entries:
+        return out, stats
 
-    total = len(entries) or 1
-    for index, entry in enumerate(entries, start=1):
-        if controller:
-            controller.checkpoint()
-        aid = get_arxiv_id(entry)
-        percent = index / total * 100.0
-        _emit_progress(progress_callback, "pdf_cache", f"正在缓存 PDF {index}/{len(entries)}: {aid}", "running", percent)
-        rel = SAFE_NAME.sub("_", aid) + ".pdf"
-        fpath = _find_cached_file(cache_dir, rel) or (cache_dir / rel)
-        html_path = fpath.with_suffix(".html")
-        if fpath.exists():
-            existing_size = fpath.stat().st_size
-            if existing_size < MIN_PDF_BYTES:
-                stats["skipped_small"] += 1
-                try:
-                    fpath.unlink()
-                except Exception:
-                    pass
-                _emit_progress(
-                    progress_callback,
-                    "pdf_cache",
-                    f"跳过小于1MB的PDF缓存: {aid} ({existing_size} bytes)",
-                    "warning",
-                    percent,
-                )
-                continue
-            out[aid] = str(fpath)
-            stats["cache_hits"] += 1
-            _emit_progress(progress_callback, "pdf_cache", f"缓存命中: {aid}", "running", percent)
-            continue
-        if html_path.exists():
-            out[aid] = str(html_path)
-            stats["cache_hits"] += 1
-            _emit_progress(progress_callback, "pdf_cache", f"HTML fallback 缓存命中: {aid}", "running", percent)
-            continue
-
-        last_err = None
-        last_url = None
-        errors_seen: List[str] = []
-        skipped_small = False
-        for url, document_type in _candidate_download_urls(entry, aid):
-            last_url = url
-            if controller:
-                controller.checkpoint()
-            try:
-                current_path = fpath if document_type == "pdf" else fpath.with_suffix(".html")
-                response = request_with_network_fallback(
-                    url,
-                    timeout=(CONNECT_TIMEOUT_SEC, READ_TIMEOUT_SEC),
-                    stream=True,
-                )
-                response.raise_for_status()
-                content_length = _content_length(response)
-                if document_type == "pdf" and content_length is not None and content_length < MIN_PDF_BYTES:
-                    stats["skipped_small"] += 1
-                    skipped_small = True
-                    _emit_progress(
-                        progress_callback,
-                        "pdf_cache",
-                        f"跳过小于1MB的PDF: {aid} ({content_length} bytes)",
-                        "warning",
-                        percent,
-                    )
-                    break
-                temp_path = current_path.with_suffix(f"{current_path.suffix}.part")
-                bytes_written = 0
-                with open(temp_path, "wb") as handle:
-                    for chunk in response.iter_content(chunk_size=256 * 1024):
-                        if controller:
-                            controller.checkpoint()
-                        if chunk:
-                            bytes_written += len(chunk)
-                            handle.write(chunk)
-                if document_type == "pdf" and bytes_written < MIN_PDF_BYTES:
-                    try:
-                        temp_path.unlink(missing_ok=True)
-                    except Exception:
-                        pass
-                    stats["skipped_small"] += 1
-                    skipped_small = True
-                    _emit_progress(
-                        progress_callback,
-                        "pdf_cache",
-                        f"跳过小于1MB的PDF: {aid} ({bytes_written} bytes)",
-                        "warning",
-                        percent,
-                    )
-                    break
-                temp_path.replace(current_path)
-                out[aid] = str(current_path)
-                stats["downloaded"] += 1
-                label = "HTML fallback 下载完成" if document_type == "html" else "下载完成"
-                _emit_progress(progress_callback, "pdf_cache", f"{label}: {aid}", "running", percent)
-                break
-            except HTTPError as exc:
-                last_err = exc
-                errors_seen.append(_format_download_error(url, exc))
-                if exc.response is not None and exc.response.status_code == 404:
-                    continue
-                continue
-            except Exception as exc:
-                last_err = exc
-                errors_seen.append(_format_download_error(url, exc))
-                try:
-                    fpath.with_suffix(f"{fpath.suffix}.part").unlink(missing_ok=True)
-                    fpath.with_suffix(".html.part").unlink(missing_ok=True)
-                except Exception:
-                    pass
-                continue
-
-        if aid not in out and not skipped_small:
-            detail = "; ".join(errors_seen) if errors_seen else _format_download_error(last_url or "-", last_err)
-            message = f"cache failed for {aid}: {detail}"
-            stats["failed"] += 1
-            stats["errors"].append(message)
-            print(f"[WARN] {message}")
-            _emit_progress(progress_callback, "pdf_cache", f"缓存失败: {aid} ({message})", "warning", percent)
+    workers = max(1, min(max_workers or PDF_DOWNLOAD_WORKERS, len(entries)))
+    total = len(entries)
+    # Downloads run concurrently, but results and progress events are
+    # consumed in the caller's (priority) order.
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-cache")
+    try:
+        futures = [executor.submit(_cache_one_pdf, entry, cache_dir, controller) for entry in entries]
+        for index, future in enumerate(futures, start=1):
+            percent = index / total * 100.0
+            aid = get_arxiv_id(entries[index - 1])
+            _emit_progress(progress_callback, "pdf_cache", f"正在缓存 PDF {index}/{total}: {aid}", "running", percent)
+            result = _wait_for_result(future, controller)
+            if result.path:
+                out[result.aid] = result.path
+            if result.outcome == "cache_hit":
+                stats["cache_hits"] += 1
+            else:
+                stats[result.outcome] += 1
+            if result.error:
+                stats["errors"].append(result.error)
+                print(f"[WARN] {result.error}")
+            for message, state in result.events:
+                _emit_progress(progress_callback, "pdf_cache", message, state, percent)
+    finally:
+        # Queued papers are dropped; in-flight ones stop at their next checkpoint.
+        executor.shutdown(wait=True, cancel_futures=True)
 
     return out, stats
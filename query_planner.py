@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+PLAN_MODES = ("auto", "combined", "exclusion", "per_category")
+
+
+def _any_of(categories: Sequence[str]) -> str:
+    terms = [f"cat:{category}" for category in categories]
+    return terms[0] if len(terms) == 1 else "(" + " OR ".join(terms) + ")"
+
+
+@dataclass(frozen=True)
+class QueryStream:
+    """One paginated arXiv query: papers listed in ``categories`` but in none of ``excluded``."""
+
+    key: str
+    categories: Tuple[str, ...]
+    excluded: Tuple[str, ...] = ()
+
+    @property
+    def single_category(self) -> str | None:
+        if len(self.categories) == 1 and not self.excluded:
+            return self.categories[0]
+        return None
+
+    @property
+    def clause(self) -> str:
+        included = _any_of(self.categories)
+        if not self.excluded:
+            return included
+        return f"({included} ANDNOT {_any_of(self.excluded)})"
+
+
+def per_category_streams(categories: Sequence[str]) -> List[QueryStream]:
+    return [QueryStream(category, (category,)) for category in categories]
+
+
+def exclusion_streams(categories: Sequence[str]) -> List[QueryStream]:
+    # Each category skips papers already returned by an earlier one, so a
+    # cross-listed paper is downloaded exactly once.
+    return [
+        QueryStream(category, (category,), tuple(categories[:index]))
+        for index, category in enumerate(categories)
+    ]
+
+
+def combined_streams(categories: Sequence[str]) -> List[QueryStream]:
+    return [QueryStream("combined", tuple(categories))]
+
+
+def initial_plan(
+    categories: Sequence[str],
+    mode: str,
+    resume_plan: str | None = None,
+) -> Tuple[str, List[QueryStream]]:
+    """Return the plan name and streams to start with for ``mode``.
+
+    ``auto`` starts with the combined query; the caller falls back to
+    :func:`exclusion_streams` once the combined ``totalResults`` is known to
+    be too large to page through. An interrupted ``auto`` run passes the plan
+    it had settled on as ``resume_plan`` so the decision is not made again.
+    """
+    categories = list(categories)
+    if mode not in PLAN_MODES:
+        raise ValueError(f"unknown arXiv query plan: {mode}")
+    if len(categories) <= 1 or mode == "per_category":
+        return "per_category", per_category_streams(categories)
+    if mode == "exclusion" or (mode == "auto" and resume_plan == "exclusion"):
+        return "exclusion", exclusion_streams(categories)
+    return "combined", combined_streams(categories)
+
+
+def combined_too_large(total_results: int | None, max_results: int) -> bool:
+    return total_results is not None and total_results > max_results
+
+
+def _stream_cursor(next_start: Any, complete: Any, windows: Any = None) -> Dict[str, Any]:
+    cursor = {"next_start": max(0, int(next_start or 0)), "complete": bool(complete)}
+    if windows:
+        cursor["windows"] = [[str(window_start), str(window_end)] for window_start, window_end in windows]
+    return cursor
+
+
+class PlanCursors:
+    """Resume position of each stream of a plan: the next offset and whether it is finished.
+
+    A stream whose time window was split into sub-windows also keeps the
+    sub-windows it has not finished yet (``windows``, ISO bounds, current
+    one first); ``next_start`` is then the offset inside the first of them.
+    """
+
+    def __init__(self, plan: str | None = None, streams: Mapping[str, Mapping[str, Any]] | None = None) -> None:
+        self.plan = plan
+        self.streams: Dict[str, Dict[str, Any]] = {
+            key: _stream_cursor(value.get("next_start", 0), value.get("complete"), value.get("windows"))
+            for key, value in (streams or {}).items()
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any] | None) -> "PlanCursors | None":
+        if not isinstance(payload, Mapping) or payload.get("plan") not in PLAN_MODES:
+            return None
+        streams = payload.get("streams")
+        try:
+            return cls(payload["plan"], streams if isinstance(streams, Mapping) else {})
+        except (TypeError, ValueError, AttributeError):
+            return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"plan": self.plan, "streams": {key: dict(value) for key, value in self.streams.items()}}
+
+    def copy(self) -> "PlanCursors":
+        return PlanCursors(self.plan, self.streams)
+
+    def start_for(self, key: str) -> int:
+        return self.streams.get(key, {}).get("next_start", 0)
+
+    def is_complete(self, key: str) -> bool:
+        return self.streams.get(key, {}).get("complete", False)
+
+    def windows_for(self, key: str) -> List[List[str]]:
+        return self.streams.get(key, {}).get("windows", [])
+
+    def advance(
+        self,
+        plan: str,
+        key: str,
+        next_start: int,
+        complete: bool,
+        windows: Sequence[Sequence[str]] | None = None,
+    ) -> None:
+        if plan != self.plan:
+            # Offsets of another plan's streams mean nothing for this one.
+            self.plan = plan
+            self.streams = {}
+        self.streams[key] = _stream_cursor(next_start, complete, None if complete else windows)
+
+
+class QueryPlanStats:
+    """Requests and bytes spent by a plan, next to an estimate for the naive per-category plan.
+
+    The naive plan queries every category on its own, so it downloads a
+    cross-listed paper once per listed category. The estimate is built from
+    the ``categories`` of the rows actually fetched.
+    """
+
+    def __init__(self, categories: Iterable[str], page_size: int) -> None:
+        self.categories = list(categories)
+        self._planned = set(self.categories)
+        self.page_size = max(1, page_size)
+        self.plan = "per_category"
+        self.streams = 0
+        self.requests = 0
+        self.sub_windows = 0
+        self.bytes = 0
+        self.rows = 0
+        self.naive_bytes = 0.0
+        self.listings = {category: 0 for category in self.categories}
+        # totalResults of single-category streams over the whole window.
+        self.totals: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record_page(self, page: Any) -> None:
+        row_listings = 0
+        with self._lock:
+            self.requests += 1
+            self.bytes += page.payload_bytes
+            for row in page.rows:
+                self.rows += 1
+                for category in set(row.get("categories") or ()) & self._planned:
+                    self.listings[category] += 1
+                    row_listings += 1
+            if page.entry_count:
+                self.naive_bytes += page.payload_bytes / page.entry_count * row_listings
+
+    def record_total(self, category: str, total: int) -> None:
+        with self._lock:
+            self.totals[category] = total
+
+    def record_split(self, sub_windows: int) -> None:
+        with self._lock:
+            self.sub_windows += sub_windows
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            naive_requests = sum(max(1, math.ceil(count / self.page_size)) for count in self.listings.values())
+            naive_bytes = int(round(self.naive_bytes))
+            return {
+                "plan": self.plan,
+                "streams": self.streams,
+                "requests": self.requests,
+                "sub_windows": self.sub_windows,
+                "bytes": self.bytes,
+                "rows": self.rows,
+                "naive_requests": naive_requests,
+                "naive_bytes": naive_bytes,
+                "requests_saved": max(0, naive_requests - self.requests),
+                "bytes_saved": max(0, naive_bytes - self.bytes),
+                "totals": dict(self.totals),
+            }
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator
+
+from config import DEBUG
+
+LEDGER_VERSION = 1
+_WINDOW_SEC = 60.0
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Exclusive OS lock on ``path``, held across processes until the block exits."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as handle:
+        if os.name == "nt":
+            import msvcrt
+
+            handle.seek(0)
+            while True:
+                try:
+                    # LK_LOCK gives up after about ten seconds; keep waiting.
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class SharedRateLedger:
+    """Request starts and cooldowns of rate-limited lanes, shared by every process on the machine.
+
+    The ledger is a JSON file next to an OS lock file. Under the lock a
+    process reads the lane's starts of the last minute, and either records
+    its own start or learns how long to sleep: until the lane's minimum
+    interval has passed since the last start by any process, until a
+    per-minute slot frees up, or until a shared cooldown ends. Processes
+    that have to wait queue by the time they started waiting, so a process
+    that just made a request cannot take the next slot from one that was
+    already waiting. Each sleep is exactly the time until the slot opens,
+    never a fixed poll. A waiter that stops checking in (its process died)
+    is dropped ``stale_grace_sec`` after its announced wake-up time.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        stale_grace_sec: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.stale_grace_sec = max(0.0, stale_grace_sec)
+        self._clock = clock
+        self._thread_lock = threading.Lock()
+        self._tickets = 0
+
+    def new_ticket(self) -> str:
+        """Identifier of one reservation in this process."""
+        with self._thread_lock:
+            self._tickets += 1
+            return f"{os.getpid()}:{threading.get_ident()}:{self._tickets}"
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {"version": LEDGER_VERSION, "lanes": {}}
+        if not isinstance(payload, dict) or payload.get("version") != LEDGER_VERSION:
+            return {"version": LEDGER_VERSION, "lanes": {}}
+        payload.setdefault("lanes", {})
+        return payload
+
+    def _store(self, payload: Dict[str, Any]) -> None:
+        # Replace the file in one step, so a crash mid-write cannot leave a truncated ledger.
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.part")
+        try:
+            temp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            temp_path.replace(self.path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    @contextmanager
+    def _locked_lane(self, lane_key: str) -> Iterator[Dict[str, Any]]:
+        with self._thread_lock, _file_lock(self.lock_path):
+            payload = self._load()
+            lane = payload["lanes"].setdefault(lane_key, {})
+            now = self._clock()
+            lane["starts"] = sorted(float(ts) for ts in lane.get("starts") or [] if now - float(ts) < _WINDOW_SEC)
+            lane["waiters"] = {
+                ticket: waiter
+                for ticket, waiter in (lane.get("waiters") or {}).items()
+                if float(waiter.get("until") or 0.0) + self.stale_grace_sec >= now
+            }
+            yield lane
+            self._store(payload)
+
+    def try_start(self, lane_key: str, min_interval_sec: float, per_minute: int, ticket: str, since: float) -> float:
+        """Record a start for ``ticket`` and return 0, or return the seconds to sleep before asking again.
+
+        ``since`` is when the reservation began waiting; it sets the
+        ticket's place in the queue. Ledger I/O errors return 0, so a
+        broken state directory degrades to the per-process limits.
+        """
+        try:
+            with self._locked_lane(lane_key) as lane:
+                now = self._clock()
+                starts = lane["starts"]
+                sleep_for = float(lane.get("cooldown_until") or 0.0) - now
+                if starts:
+                    sleep_for = max(sleep_for, min_interval_sec - (now - starts[-1]))
+                if len(starts) >= per_minute:
+                    sleep_for = max(sleep_for, _WINDOW_SEC - (now - starts[-per_minute]))
+                waiters = lane["waiters"]
+                ahead = [
+                    float(waiter.get("until") or now)
+                    for other, waiter in waiters.items()
+                    if other != ticket and (float(waiter.get("since") or 0.0), other) < (since, ticket)
+                ]
+                if sleep_for <= 0.0 and ahead:
+                    # The slot is open but belongs to an earlier waiter; look
+                    # again just after it was due to take it.
+                    sleep_for = max(0.05, min(ahead) - now + 0.05)
+                if sleep_for <= 0.0:
+                    starts.append(now)
+                    waiters.pop(ticket, None)
+                    return 0.0
+                waiters[ticket] = {"since": since, "until": now + sleep_for, "pid": os.getpid()}
+                return sleep_for
+        except OSError:
+            if DEBUG:
+                print(f"[WARN] shared rate ledger at {self.path} is unavailable; using per-process limits")
+            return 0.0
+
+    def leave(self, lane_key: str, ticket: str) -> None:
+        """Drop ``ticket`` from the queue of a reservation that was abandoned."""
+        try:
+            with self._locked_lane(lane_key) as lane:
+                lane["waiters"].pop(ticket, None)
+        except OSError:
+            pass
+
+    def note_cooldown(self, lane_key: str, seconds: float) -> None:
+        try:
+            with self._locked_lane(lane_key) as lane:
+                lane["cooldown_until"] = max(float(lane.get("cooldown_until") or 0.0), self._clock() + max(0.0, seconds))
+        except OSError:
+            if DEBUG:
+                print(f"[WARN] could not share the {lane_key} cooldown through {self.path}")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Starts in the last minute, queued waiters and cooldown per lane."""
+        if not self.path.exists():
+            return {}
+        try:
+            with self._thread_lock, _file_lock(self.lock_path):
+                payload = self._load()
+        except OSError:
+            return {}
+        now = self._clock()
+        lanes = {}
+        for lane_key, lane in payload["lanes"].items():
+            starts = [float(ts) for ts in lane.get("starts") or [] if now - float(ts) < _WINDOW_SEC]
+            waiters = [
+                waiter for waiter in (lane.get("waiters") or {}).values()
+                if float(waiter.get("until") or 0.0) + self.stale_grace_sec >= now
+            ]
+            lanes[lane_key] = {
+                "starts_last_minute": len(starts),
+                "waiting": len(waiters),
+                "cooldown_sec": round(max(0.0, float(lane.get("cooldown_until") or 0.0) - now), 1),
+            }
+        return lanes
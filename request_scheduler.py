@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+from rate_ledger import SharedRateLedger
+
+GapProvider = Callable[[], Optional[float]]
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    min_interval_sec: float = 0.0
+    per_minute: int = 60
+    concurrency: int = 1
+    cooldown_sec: float = 60.0
+
+    @classmethod
+    def from_config(cls, values: Mapping[str, Any]) -> "RateLimitPolicy":
+        return cls(
+            min_interval_sec=max(0.0, float(values.get("min_interval_sec", 0.0))),
+            per_minute=max(1, int(values.get("per_minute", 60))),
+            concurrency=max(1, int(values.get("concurrency", 1))),
+            cooldown_sec=max(0.0, float(values.get("cooldown_sec", 60.0))),
+        )
+
+
+class RequestLane:
+    """Start-time window, concurrency limit and cooldown for one site and request class."""
+
+    def __init__(self, site: str, request_class: str, policy: RateLimitPolicy) -> None:
+        self.site = site
+        self.request_class = request_class
+        self.policy = policy
+        self.semaphore = threading.BoundedSemaphore(policy.concurrency)
+        self.lock = threading.Lock()
+        self.start_window: deque[float] = deque()
+        self.last_start_ts = 0.0
+        self.cooldown_until_ts = 0.0
+        self.requests = 0
+        self.wait_sec = 0.0
+        self.max_wait_sec = 0.0
+
+    @property
+    def key(self) -> str:
+        return f"{self.site}:{self.request_class}"
+
+    def _sleep_needed_locked(self, now: float, persisted_gap: float | None) -> float:
+        policy = self.policy
+        sleep_for = max(0.0, self.cooldown_until_ts - now)
+        if persisted_gap is not None and persisted_gap < policy.min_interval_sec:
+            sleep_for = max(sleep_for, policy.min_interval_sec - persisted_gap)
+        while self.start_window and now - self.start_window[0] >= 60.0:
+            self.start_window.popleft()
+        if len(self.start_window) >= policy.per_minute:
+            sleep_for = max(sleep_for, 60.0 - (now - self.start_window[0]))
+        if self.last_start_ts:
+            sleep_for = max(sleep_for, policy.min_interval_sec - (now - self.last_start_ts))
+        return sleep_for
+
+    def _record_start_locked(self, now: float, waited: float) -> None:
+        self.start_window.append(now)
+        self.last_start_ts = now
+        self.requests += 1
+        self.wait_sec += waited
+        self.max_wait_sec = max(self.max_wait_sec, waited)
+
+
+def site_for_host(host: str) -> str:
+    host = (host or "").lower()
+    # arxiv.org, export.arxiv.org and other mirrors are one backend with one budget.
+    if host == "arxiv.org" or host.endswith(".arxiv.org"):
+        return "arxiv.org"
+    return host
+
+
+class RequestScheduler:
+    """Per-lane rate limits; lanes of a class in ``shared_classes`` also go through ``ledger``.
+
+    The ledger holds the starts of every process on the machine, so
+    several runs split a shared lane's budget instead of each spending
+    all of it.
+    """
+
+    def __init__(
+        self,
+        policies: Mapping[str, RateLimitPolicy],
+        classify: Callable[[str], str],
+        ledger: SharedRateLedger | None = None,
+        shared_classes: Iterable[str] = (),
+    ) -> None:
+        self._policies = dict(policies)
+        self._classify = classify
+        self._ledger = ledger
+        self._shared_classes = frozenset(shared_classes) if ledger is not None else frozenset()
+        self._lanes: Dict[Tuple[str, str], RequestLane] = {}
+        self._lanes_lock = threading.Lock()
+
+    def policy_for(self, request_class: str) -> RateLimitPolicy:
+        return self._policies.get(request_class) or self._policies.get("other") or RateLimitPolicy()
+
+    def lane_for(self, url: str) -> RequestLane:
+        site = site_for_host(urlparse(url).hostname or "")
+        request_class = self._classify(url)
+        key = (site, request_class)
+        with self._lanes_lock:
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = RequestLane(site, request_class, self.policy_for(request_class))
+                self._lanes[key] = lane
+            return lane
+
+    def shares(self, lane: RequestLane) -> bool:
+        return lane.request_class in self._shared_classes
+
+    def reserve(self, lane: RequestLane, persisted_gap: GapProvider | None = None) -> float:
+        """Block until ``lane`` may start a request and return the time spent waiting."""
+        if not self.shares(lane):
+            return self._reserve(lane, persisted_gap, None)
+        ticket = self._ledger.new_ticket()
+        try:
+            return self._reserve(lane, persisted_gap, ticket)
+        except BaseException:
+            self._ledger.leave(lane.key, ticket)
+            raise
+
+    def _reserve(self, lane: RequestLane, persisted_gap: GapProvider | None, ticket: str | None) -> float:
+        waited = 0.0
+        since = time.time()
+        while True:
+            # Anything that may touch disk runs before the lane lock is taken.
+            gap = persisted_gap() if persisted_gap else None
+            with lane.lock:
+                now = time.monotonic()
+                sleep_for = lane._sleep_needed_locked(now, gap)
+                if sleep_for <= 0.0 and ticket is None:
+                    lane._record_start_locked(now, waited)
+                    return waited
+            if sleep_for <= 0.0:
+                policy = lane.policy
+                sleep_for = self._ledger.try_start(lane.key, policy.min_interval_sec, policy.per_minute, ticket, since)
+                if sleep_for <= 0.0:
+                    with lane.lock:
+                        lane._record_start_locked(time.monotonic(), waited)
+                    return waited
+            sleep_for = max(sleep_for, 0.01)
+            time.sleep(sleep_for)
+            waited += sleep_for
+
+    def note_cooldown(self, lane: RequestLane, seconds: float | None = None) -> None:
+        duration = lane.policy.cooldown_sec if seconds is None else max(0.0, seconds)
+        with lane.lock:
+            lane.cooldown_until_ts = max(lane.cooldown_until_ts, time.monotonic() + duration)
+        if self.shares(lane):
+            self._ledger.note_cooldown(lane.key, duration)
+
+    def ledger_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return self._ledger.snapshot() if self._ledger is not None else {}
+
+    def wait_stats(self, reset_max: bool = False) -> Dict[str, Dict[str, float]]:
+        """Requests and wait time per request class.
+
+        ``requests`` and ``wait_sec`` are running totals, while ``max_wait_sec``
+        is the longest wait since the last call with ``reset_max``: a
+        maximum cannot be recovered from two snapshots, so a run resets it
+        when it takes its ``before`` snapshot for :func:`wait_stats_delta`.
+        """
+        stats: Dict[str, Dict[str, float]] = {}
+        with self._lanes_lock:
+            lanes = list(self._lanes.values())
+        for lane in lanes:
+            with lane.lock:
+                bucket = stats.setdefault(lane.request_class, {"requests": 0, "wait_sec": 0.0, "max_wait_sec": 0.0})
+                bucket["requests"] += lane.requests
+                bucket["wait_sec"] = round(bucket["wait_sec"] + lane.wait_sec, 3)
+                bucket["max_wait_sec"] = round(max(bucket["max_wait_sec"], lane.max_wait_sec), 3)
+                if reset_max:
+                    lane.max_wait_sec = 0.0
+        return stats
+
+
+def wait_stats_delta(before: Mapping[str, Mapping[str, float]], after: Mapping[str, Mapping[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Requests and waits between two :meth:`RequestScheduler.wait_stats` snapshots.
+
+    ``max_wait_sec`` is taken from ``after``; it covers only this span when
+    ``before`` was taken with ``reset_max=True``.
+    """
+    delta: Dict[str, Dict[str, float]] = {}
+    for request_class, current in after.items():
+        previous = before.get(request_class, {})
+        requests = int(current.get("requests", 0) - previous.get("requests", 0))
+        if requests <= 0:
+            continue
+        wait_sec = round(current.get("wait_sec", 0.0) - previous.get("wait_sec", 0.0), 3)
+        delta[request_class] = {
+            "requests": requests,
+            "wait_sec": wait_sec,
+            "avg_wait_sec": round(wait_sec / requests, 3),
+            "max_wait_sec": current.get("max_wait_sec", 0.0),
+        }
+    return delta
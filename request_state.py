@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import atexit
+import json
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from config import DEBUG
+
+_DATETIME_KEYS = ("last_request_started_at", "cooldown_until", "last_429_at")
+
+
+def _read_json_file(path: Path) -> Dict[str, Any]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return payload if isinstance(payload, dict) else {}
+    except Exception:
+        return {}
+
+
+def _max_iso_datetime(values: list[str]) -> str | None:
+    best_dt: datetime | None = None
+    best_raw: str | None = None
+    for value in values:
+        try:
+            dt = datetime.fromisoformat(value)
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            dt = dt.astimezone(timezone.utc)
+        except Exception:
+            continue
+        if best_dt is None or dt > best_dt:
+            best_dt = dt
+            best_raw = dt.isoformat()
+    return best_raw
+
+
+def merge_request_states(payloads: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge state copies: newest timestamps win, other keys come from the first copy that has them."""
+    payloads = [payload for payload in payloads if payload]
+    if not payloads:
+        return {}
+    merged: Dict[str, Any] = {}
+    for key in _DATETIME_KEYS:
+        latest = _max_iso_datetime([str(payload.get(key)) for payload in payloads if payload.get(key)])
+        if latest:
+            merged[key] = latest
+    consecutive_values = []
+    for payload in payloads:
+        try:
+            consecutive_values.append(int(payload.get("consecutive_429", 0) or 0))
+        except Exception:
+            pass
+    if consecutive_values:
+        merged["consecutive_429"] = max(consecutive_values)
+    for payload in payloads:
+        if payload.get("last_429_endpoint"):
+            merged["last_429_endpoint"] = payload["last_429_endpoint"]
+    for payload in payloads:
+        for key, value in payload.items():
+            if key not in merged and key not in _DATETIME_KEYS and key != "consecutive_429":
+                merged[key] = value
+    return merged
+
+
+def _file_signature(path: Path) -> Tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class RequestStateStore:
+    """In-memory copy of the persisted arXiv request state.
+
+    Reads stat the state files and only re-parse them when a signature
+    changes. Writes update the memory copy immediately and are flushed to
+    disk in batches after ``flush_delay_sec``; ``durable=True`` flushes
+    before returning. Pending changes go to the write paths that were
+    current when they were made, even if the paths have changed by the time
+    they are flushed, and keys changed in memory but not yet flushed win
+    over the copies on disk.
+    """
+
+    def __init__(
+        self,
+        read_paths: Callable[[], List[Path]],
+        write_paths: Callable[[], List[Path]],
+        flush_delay_sec: float = 1.0,
+    ) -> None:
+        self._read_paths = read_paths
+        self._write_paths = write_paths
+        self._flush_delay_sec = max(0.0, flush_delay_sec)
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._paths_key: Tuple[str, ...] | None = None
+        self._signatures: Dict[str, Tuple[int, int] | None] = {}
+        self._state: Dict[str, Any] = {}
+        self._removed: set[str] = set()
+        self._changed: set[str] = set()
+        self._dirty = False
+        self._pending_paths: List[Path] = []
+        self._timer: threading.Timer | None = None
+        self.disk_reads = 0
+        self.disk_writes = 0
+
+    def _reset_locked(self, paths_key: Tuple[str, ...]) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._paths_key = paths_key
+        self._signatures = {}
+        self._state = {}
+        self._removed = set()
+        self._changed = set()
+        self._dirty = False
+        self._pending_paths = []
+
+    def _take_pending_locked(self) -> Tuple[Dict[str, Any], List[Path]] | None:
+        if not self._dirty:
+            return None
+        pending = dict(self._state), self._pending_paths
+        self._dirty = False
+        self._removed = set()
+        self._changed = set()
+        self._pending_paths = []
+        return pending
+
+    def _refresh(self) -> None:
+        paths = self._read_paths()
+        paths_key = tuple(str(path) for path in paths)
+        signatures = {str(path): _file_signature(path) for path in paths}
+        with self._lock:
+            if paths_key != self._paths_key:
+                # Changes made against the old paths still belong there.
+                pending = self._take_pending_locked()
+                self._reset_locked(paths_key)
+            elif signatures == self._signatures:
+                return
+            else:
+                pending = None
+        if pending is not None:
+            with self._io_lock:
+                self._write(*pending)
+        payloads = [_read_json_file(path) for path in paths]
+        with self._lock:
+            if paths_key != self._paths_key:
+                return
+            self.disk_reads += 1
+            merged = merge_request_states(payloads + ([self._state] if self._dirty else []))
+            # Newest timestamps are merged above; other unflushed keys win over disk.
+            for key in self._changed:
+                if key not in _DATETIME_KEYS and key in self._state:
+                    merged[key] = self._state[key]
+            for key in self._removed:
+                merged.pop(key, None)
+            self._state = merged
+            self._signatures = signatures
+
+    def snapshot(self) -> Dict[str, Any]:
+        self._refresh()
+        with self._lock:
+            return dict(self._state)
+
+    def update(self, changes: Dict[str, Any] | None = None, remove: Iterable[str] = (), durable: bool = False) -> None:
+        self._refresh()
+        with self._lock:
+            changed = False
+            for key in remove:
+                if key in self._state:
+                    del self._state[key]
+                    self._removed.add(key)
+                    self._changed.discard(key)
+                    changed = True
+            for key, value in (changes or {}).items():
+                if self._state.get(key) != value:
+                    self._state[key] = value
+                    self._removed.discard(key)
+                    self._changed.add(key)
+                    changed = True
+            if changed and not self._dirty:
+                self._dirty = True
+                self._pending_paths = list(self._write_paths())
+        if durable:
+            self.flush()
+        elif changed:
+            self._schedule_flush()
+
+    def replace(self, payload: Dict[str, Any], durable: bool = False) -> None:
+        current = self.snapshot()
+        self.update(payload, remove=[key for key in current if key not in payload], durable=durable)
+
+    def _schedule_flush(self) -> None:
+        with self._lock:
+            if self._timer is not None or not self._dirty:
+                return
+            timer = threading.Timer(self._flush_delay_sec, self.flush)
+            timer.daemon = True
+            self._timer = timer
+        timer.start()
+
+    def _write(self, payload: Dict[str, Any], paths: List[Path]) -> None:
+        wrote = False
+        for path in paths:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+                wrote = True
+            except Exception:
+                if DEBUG:
+                    print(f"[WARN] failed to persist arXiv request state at {path}")
+        if not wrote and DEBUG:
+            print("[WARN] failed to persist arXiv request state")
+        with self._lock:
+            self.disk_writes += 1
+
+    def flush(self) -> None:
+        with self._io_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending = self._take_pending_locked()
+                paths_key = self._paths_key
+            if pending is None:
+                return
+            self._write(*pending)
+            paths = self._read_paths()
+            signatures = {str(path): _file_signature(path) for path in paths}
+            with self._lock:
+                if paths_key == self._paths_key and tuple(str(path) for path in paths) == paths_key and not self._dirty:
+                    self._signatures = signatures
+
+    def register_atexit(self) -> "RequestStateStore":
+        atexit.register(self.flush)
+        return self
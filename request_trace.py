@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Sequence, TextIO
+
+from config import DEBUG
+
+TIMING_FIELDS = ("limiter_wait_sec", "connect_sec", "ttfb_sec", "transfer_sec", "duration_sec", "parse_sec")
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``values`` (which must not be empty)."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _body_size(response: Any) -> int | None:
+    # ``_content`` is only set once requests has read the whole body.
+    content = getattr(response, "_content", None)
+    return len(content) if isinstance(content, (bytes, bytearray)) else None
+
+
+class RequestTracer:
+    """One structured record per HTTP request, written to a JSON-lines file per run.
+
+    A record holds the URL, its request class and route (direct or proxy),
+    the time spent waiting for the limiter, the TCP/TLS connect time of a
+    fresh connection, the time to first byte, the body size and transfer
+    time, the status and the time the caller spent parsing the body.
+
+    A request stays open in the thread that made it until its body has
+    been consumed: streamed downloads report their size with
+    :meth:`note_transferred`, and API pages their parse time through
+    :meth:`parsing`. The next request in the same thread, or
+    :meth:`settle`, closes whatever is still open.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._open: Dict[int, Dict[str, Any]] = {}
+        self._records: List[Dict[str, Any]] = []
+        self._path: Path | None = None
+        self._handle: TextIO | None = None
+
+    def open(self, path: Path) -> None:
+        """Start a new run: earlier records are dropped and new ones go to ``path``."""
+        self.close()
+        path = Path(path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handle = open(path, "w", encoding="utf-8")
+        except OSError:
+            if DEBUG:
+                print(f"[WARN] cannot write request trace to {path}")
+            handle = None
+        with self._lock:
+            self._records = []
+            self._path = path if handle else None
+            self._handle = handle
+
+    def close(self) -> None:
+        self.settle()
+        with self._lock:
+            handle, self._handle, self._path = self._handle, None, None
+        if handle is not None:
+            handle.close()
+
+    @property
+    def path(self) -> Path | None:
+        return self._path
+
+    def begin(self, url: str, request_class: str, route: str, queued_at: float) -> Dict[str, Any]:
+        """Open the record of a request about to be sent; ``queued_at`` is when it asked the limiter."""
+        self._close_open(threading.get_ident())
+        now = self._clock()
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "url": url,
+            "request_class": request_class,
+            "route": route,
+            "status": None,
+            "limiter_wait_sec": round(max(0.0, now - queued_at), 4),
+            "connect_sec": 0.0,
+            "ttfb_sec": None,
+            "transfer_bytes": None,
+            "transfer_sec": None,
+            "duration_sec": None,
+            "parse_sec": None,
+            "error": None,
+            "_sent_at": now,
+            "_streaming": False,
+        }
+        with self._lock:
+            self._open[threading.get_ident()] = record
+        return record
+
+    def received(self, record: Dict[str, Any], response: Any, connect_sec: float, ttfb_sec: float | None, stream: bool) -> None:
+        now = self._clock()
+        duration = now - record["_sent_at"]
+        status = getattr(response, "status_code", None)
+        if not isinstance(ttfb_sec, (int, float)):
+            ttfb_sec = None
+        record.update({
+            "status": status if isinstance(status, int) else None,
+            "connect_sec": round(connect_sec, 4),
+            "ttfb_sec": round(ttfb_sec if ttfb_sec is not None else duration, 4),
+            "duration_sec": round(duration, 4),
+        })
+        if stream:
+            record["_streaming"] = True
+            return
+        record["transfer_bytes"] = _body_size(response)
+        record["transfer_sec"] = round(max(0.0, duration - record["ttfb_sec"]), 4)
+
+    def failed(self, record: Dict[str, Any], exc: BaseException, connect_sec: float) -> None:
+        record.update({
+            "error": type(exc).__name__,
+            "connect_sec": round(connect_sec, 4),
+            "duration_sec": round(self._clock() - record["_sent_at"], 4),
+        })
+        self._close_open(threading.get_ident())
+
+    def note_transferred(self, transfer_bytes: int) -> None:
+        """Close this thread's streamed request once its body of ``transfer_bytes`` has been read."""
+        with self._lock:
+            record = self._open.get(threading.get_ident())
+        if record is None or not record["_streaming"]:
+            return
+        duration = self._clock() - record["_sent_at"]
+        record.update({
+            "transfer_bytes": transfer_bytes,
+            "transfer_sec": round(max(0.0, duration - (record["ttfb_sec"] or 0.0)), 4),
+            "duration_sec": round(duration, 4),
+        })
+        self._close_open(threading.get_ident())
+
+    @contextmanager
+    def parsing(self) -> Iterator[None]:
+        """Time the parse of the body this thread just received and close its record."""
+        started = self._clock()
+        try:
+            yield
+        finally:
+            with self._lock:
+                record = self._open.get(threading.get_ident())
+            if record is not None:
+                record["parse_sec"] = round(self._clock() - started, 4)
+                self._close_open(threading.get_ident())
+
+    def detach(self) -> None:
+        """Close this thread's open record, e.g. before parsing a body that came from a cache."""
+        self._close_open(threading.get_ident())
+
+    def settle(self) -> None:
+        """Close the open records of every thread."""
+        with self._lock:
+            thread_ids = list(self._open)
+        for thread_id in thread_ids:
+            self._close_open(thread_id)
+
+    def _close_open(self, thread_id: int) -> None:
+        with self._lock:
+            record = self._open.pop(thread_id, None)
+            if record is None:
+                return
+            record = {key: value for key, value in record.items() if not key.startswith("_")}
+            self._records.append(record)
+            if self._handle is not None:
+                try:
+                    self._handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    self._handle.flush()
+                except (OSError, ValueError):
+                    self._handle = None
+
+    def position(self) -> int:
+        """Marker for :meth:`summary`; requests still open are closed first."""
+        self.settle()
+        with self._lock:
+            return len(self._records)
+
+    def summary(self, since: int = 0) -> Dict[str, Any]:
+        self.settle()
+        with self._lock:
+            records = self._records[since:]
+        return summarize_trace(records)
+
+
+def summarize_trace(records: Sequence[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Per request class: counts by status and route, bytes, and p50/p90/p99/max of each timing."""
+    by_class: Dict[str, Dict[str, Any]] = {}
+    samples: Dict[str, Dict[str, List[float]]] = {}
+    for record in records:
+        request_class = record.get("request_class") or "other"
+        bucket = by_class.setdefault(request_class, {"requests": 0, "errors": 0, "bytes": 0, "status": {}, "routes": {}})
+        bucket["requests"] += 1
+        if record.get("error"):
+            bucket["errors"] += 1
+        status = str(record.get("status") or record.get("error") or "-")
+        bucket["status"][status] = bucket["status"].get(status, 0) + 1
+        route = record.get("route") or "-"
+        bucket["routes"][route] = bucket["routes"].get(route, 0) + 1
+        bucket["bytes"] += int(record.get("transfer_bytes") or 0)
+        for name in TIMING_FIELDS:
+            value = record.get(name)
+            if value is not None:
+                samples.setdefault(request_class, {}).setdefault(name, []).append(float(value))
+    for request_class, fields in samples.items():
+        for name, values in fields.items():
+            by_class[request_class][name] = {
+                "p50": round(percentile(values, 0.5), 4),
+                "p90": round(percentile(values, 0.9), 4),
+                "p99": round(percentile(values, 0.99), 4),
+                "max": round(max(values), 4),
+                "total": round(sum(values), 4),
+            }
+    return {"requests": len(records), "by_class": by_class}
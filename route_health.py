@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_time(value: Any) -> datetime | None:
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+class RouteHealth:
+    """Rolling latency and error rate per network route, with a circuit breaker.
+
+    A route is an API endpoint, or the direct or proxy session for one host.
+    ``failure_threshold`` failures in a row open a route's breaker. An open
+    route is left out of :meth:`order` while another route is usable. After
+    ``open_sec`` it turns half-open and is tried again after the healthy
+    routes; that request closes the breaker or opens it for another
+    ``open_sec``. Latency and error rate are exponentially weighted, with
+    ``smoothing`` as the weight of the newest sample. State lives in the
+    persisted request state through ``read_state``/``write_state``, so a
+    route found dead by one run is not tried first by the next.
+    """
+
+    def __init__(
+        self,
+        read_state: Callable[[], Mapping[str, Any] | None],
+        write_state: Callable[[Dict[str, Dict[str, Any]]], None],
+        failure_threshold: int = 3,
+        open_sec: float = 300.0,
+        smoothing: float = 0.3,
+        clock: Callable[[], datetime] = _utc_now,
+    ) -> None:
+        self._read_state = read_state
+        self._write_state = write_state
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_sec = max(0.0, open_sec)
+        self.smoothing = min(max(smoothing, 0.01), 1.0)
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def _routes(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            str(route): dict(record)
+            for route, record in (self._read_state() or {}).items()
+            if isinstance(record, Mapping)
+        }
+
+    def _state(self, record: Mapping[str, Any], now: datetime) -> str:
+        if record.get("state") != OPEN:
+            return CLOSED
+        opened_at = _parse_time(record.get("opened_at"))
+        if opened_at is None or (now - opened_at).total_seconds() >= self.open_sec:
+            return HALF_OPEN
+        return OPEN
+
+    @staticmethod
+    def _score(record: Mapping[str, Any]) -> float:
+        latency = float(record.get("latency_ms") or 0.0)
+        return latency / max(0.1, 1.0 - float(record.get("error_rate") or 0.0))
+
+    def order(self, routes: Sequence[str]) -> List[str]:
+        """``routes`` fastest healthy first, then unmeasured, then half-open; open ones only when nothing else is left."""
+        now = self._clock()
+        known = self._routes()
+        usable = []
+        blocked = []
+        for position, route in enumerate(routes):
+            record = known.get(route, {})
+            state = self._state(record, now)
+            if state == OPEN:
+                blocked.append((str(record.get("opened_at") or ""), position, route))
+            else:
+                # Routes without a successful measurement keep their configured
+                # order behind the measured ones, so a working route is not
+                # passed over just to explore a fallback.
+                usable.append((state == HALF_OPEN, record.get("latency_ms") is None, self._score(record), position, route))
+        if usable:
+            return [item[-1] for item in sorted(usable)]
+        return [item[-1] for item in sorted(blocked)]
+
+    def record_success(self, route: str, latency_sec: float | None = None) -> None:
+        with self._lock:
+            routes = self._routes()
+            record = routes.setdefault(route, {})
+            if latency_sec is not None:
+                latency_ms = latency_sec * 1000.0
+                previous = record.get("latency_ms")
+                record["latency_ms"] = round(
+                    latency_ms if previous is None else previous + self.smoothing * (latency_ms - previous),
+                    1,
+                )
+            self._count(record, failed=False)
+            record.update({"failures": 0, "state": CLOSED, "opened_at": None})
+            self._write_state(routes)
+
+    def record_failure(self, route: str) -> None:
+        with self._lock:
+            routes = self._routes()
+            record = routes.setdefault(route, {})
+            now = self._clock()
+            was_half_open = self._state(record, now) == HALF_OPEN
+            self._count(record, failed=True)
+            record["failures"] = int(record.get("failures") or 0) + 1
+            if was_half_open or record["failures"] >= self.failure_threshold:
+                record.update({"state": OPEN, "opened_at": now.isoformat()})
+            self._write_state(routes)
+
+    def _count(self, record: Dict[str, Any], failed: bool) -> None:
+        previous = float(record.get("error_rate") or 0.0)
+        record["error_rate"] = round(previous + self.smoothing * ((1.0 if failed else 0.0) - previous), 3)
+        record["requests"] = int(record.get("requests") or 0) + 1
+        record["last_failure" if failed else "last_success"] = self._clock().isoformat()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Every known route with its effective breaker state."""
+        now = self._clock()
+        routes = self._routes()
+        for record in routes.values():
+            record["state"] = self._state(record, now)
+        return routes
+
+
+class RouteCache:
+    """Route that last worked for each host, trusted for ``ttl_sec``.
+
+    The cached route is tried first, ahead of the health ranking, until it
+    fails or expires. The counters feed the per-run metrics: ``fallbacks``
+    are requests that lost a failed attempt before another route
+    answered, and ``time_saved_sec`` estimates the time not spent on the
+    preferred route while it was being bypassed. The estimate is the mean
+    cost of the failed attempts seen so far.
+    """
+
+    def __init__(self, ttl_sec: float = 600.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_sec = max(0.0, ttl_sec)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._probed_at: Dict[str, float] = {}
+        self._failed_sec = 0.0
+        self._failed_attempts = 0
+        self._bypassed = 0
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "fallbacks": 0, "probes": 0, "recoveries": 0}
+
+    def lookup(self, host: str) -> str | None:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is not None and now - entry[1] >= self.ttl_sec:
+                del self._entries[host]
+                self._counters["expired"] += 1
+                entry = None
+            self._counters["hits" if entry else "misses"] += 1
+            return entry[0] if entry else None
+
+    def remember(self, host: str, route: str) -> None:
+        with self._lock:
+            self._entries[host] = (route, self._clock())
+
+    def forget(self, host: str) -> None:
+        with self._lock:
+            self._entries.pop(host, None)
+
+    def note_failed_attempt(self, seconds: float, fell_back: bool) -> None:
+        with self._lock:
+            self._failed_sec += max(0.0, seconds)
+            self._failed_attempts += 1
+            if fell_back:
+                self._counters["fallbacks"] += 1
+
+    def note_bypass(self) -> None:
+        """A request skipped the preferred route because it was cached or ranked as failing."""
+        with self._lock:
+            self._bypassed += 1
+
+    def claim_probe(self, host: str, interval_sec: float) -> bool:
+        """True when ``host`` was not probed within ``interval_sec``; the caller then probes it."""
+        now = self._clock()
+        with self._lock:
+            last = self._probed_at.get(host)
+            if last is not None and now - last < interval_sec:
+                return False
+            self._probed_at[host] = now
+            self._counters["probes"] += 1
+            return True
+
+    def note_recovery(self) -> None:
+        with self._lock:
+            self._counters["recoveries"] += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            mean_failed = self._failed_sec / self._failed_attempts if self._failed_attempts else 0.0
+            return {
+                **self._counters,
+                "bypassed": self._bypassed,
+                "failed_attempt_sec": round(self._failed_sec, 3),
+                "time_saved_sec": round(self._bypassed * mean_failed, 3),
+            }
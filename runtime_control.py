@@ -39,6 +39,11 @@ class PipelineController:
         self._cancel_event.set()
         self._pause_event.clear()
 
+    def sleep(self, seconds: float) -> None:
+        """Wait ``seconds``, raising :class:`PipelineCancelled` as soon as the run is cancelled."""
+        if self._cancel_event.wait(max(0.0, seconds)):
+            raise PipelineCancelled("pipeline cancelled by user")
+
     def checkpoint(self) -> None:
         if self._cancel_event.is_set():
             raise PipelineCancelled("pipeline cancelled by user")
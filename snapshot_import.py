@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import gzip
+import json
+from array import array
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+from arxiv_oai import parse_version_date, split_authors
+from config import ARXIV_BASE_URL, ARXIV_PRIMARY_CATEGORY_PREFIXES, LOCAL_TZ
+from filters import arxiv_day_window, in_time_window, is_cs
+from paper import Paper
+
+SNAPSHOT_INDEX_VERSION = 1
+# A line can only pass ``is_cs`` if one of the prefixes occurs in it
+# somewhere, so other lines are skipped without being decoded.
+_PREFIX_BYTES = tuple(prefix.encode("ascii") for prefix in ARXIV_PRIMARY_CATEGORY_PREFIXES)
+
+
+def _author_names(record: Mapping[str, Any]) -> List[str]:
+    parsed = record.get("authors_parsed")
+    if parsed:
+        # ``[last, first, suffix]`` -> "First Last Suffix", as the API writes names.
+        return [" ".join(part for part in (first, last, *rest) if part) for last, first, *rest in parsed]
+    return split_authors(record.get("authors") or "")
+
+
+def snapshot_row(record: Mapping[str, Any]) -> Paper:
+    """Convert one record of the arXiv metadata snapshot (JSON lines) into a pipeline row."""
+    versions = record.get("versions") or []
+    latest = (versions[-1].get("version") or "") if versions else ""
+    arxiv_id = f"{record.get('id') or ''}{latest}"
+    categories = (record.get("categories") or "").split()
+    site = ARXIV_BASE_URL or "https://arxiv.org"
+    return Paper(
+        id=f"{site}/abs/{arxiv_id}",
+        arxiv_id=arxiv_id,
+        title=(record.get("title") or "").strip(),
+        summary=(record.get("abstract") or "").strip(),
+        authors=_author_names(record),
+        published=parse_version_date(versions[0].get("created")) if versions else None,
+        updated=parse_version_date(versions[-1].get("created")) if versions else None,
+        primary_category=categories[0] if categories else None,
+        categories=categories,
+        comment=(record.get("comments") or "").strip(),
+        journal_ref=(record.get("journal-ref") or "").strip(),
+        pdf_url=f"{site}/pdf/{arxiv_id}",
+    )
+
+
+def _row_day(row: Paper) -> str | None:
+    if row.published is None:
+        return None
+    day = row.published.astimezone(LOCAL_TZ).date()
+    return day.isoformat() if in_time_window(row, *arxiv_day_window(day)) else None
+
+
+class SnapshotIndex:
+    """Byte ranges of the CS rows of a metadata snapshot, grouped by arXiv server day.
+
+    Built in one streaming pass over the snapshot; afterwards the rows of
+    any day are read with a seek per row. The index remembers the
+    snapshot's size and mtime and is rebuilt when either changes.
+    """
+
+    def __init__(self, snapshot_path: Path, size: int, mtime_ns: int, days: Dict[str, array], scanned: int = 0) -> None:
+        self.snapshot_path = Path(snapshot_path)
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.days = days
+        self.scanned = scanned
+
+    @classmethod
+    def build(cls, snapshot_path: Path, progress: Callable[[int, int], None] | None = None, report_every: int = 100_000) -> "SnapshotIndex":
+        """Scan ``snapshot_path``; ``progress(scanned, indexed)`` is called every ``report_every`` lines."""
+        snapshot_path = Path(snapshot_path)
+        stat = snapshot_path.stat()
+        days: Dict[str, array] = {}
+        scanned = 0
+        indexed = 0
+        offset = 0
+        with snapshot_path.open("rb") as handle:
+            for line in handle:
+                line_offset = offset
+                offset += len(line)
+                scanned += 1
+                if progress and scanned % report_every == 0:
+                    progress(scanned, indexed)
+                if not any(prefix in line for prefix in _PREFIX_BYTES):
+                    continue
+                try:
+                    row = snapshot_row(json.loads(line))
+                except (ValueError, TypeError, AttributeError, IndexError):
+                    continue
+                if not is_cs(row):
+                    continue
+                day = _row_day(row)
+                if day is None:
+                    continue
+                days.setdefault(day, array("Q")).extend((line_offset, len(line)))
+                indexed += 1
+        return cls(snapshot_path, stat.st_size, stat.st_mtime_ns, days, scanned)
+
+    @classmethod
+    def load(cls, index_path: Path, snapshot_path: Path) -> "SnapshotIndex | None":
+        """Read a saved index; ``None`` when it is missing, unreadable or stale for ``snapshot_path``."""
+        try:
+            with gzip.open(index_path, "rt", encoding="utf-8") as handle:
+                payload = json.load(handle)
+            stat = Path(snapshot_path).stat()
+        except (OSError, ValueError, EOFError):
+            return None
+        if (
+            payload.get("version") != SNAPSHOT_INDEX_VERSION
+            or payload.get("size") != stat.st_size
+            or payload.get("mtime_ns") != stat.st_mtime_ns
+        ):
+            return None
+        days = {day: array("Q", ranges) for day, ranges in (payload.get("days") or {}).items()}
+        return cls(Path(snapshot_path), stat.st_size, stat.st_mtime_ns, days, int(payload.get("scanned") or 0))
+
+    def save(self, index_path: Path) -> None:
+        index_path = Path(index_path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = index_path.with_suffix(index_path.suffix + ".part")
+        payload = {
+            "version": SNAPSHOT_INDEX_VERSION,
+            "snapshot": str(self.snapshot_path),
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "scanned": self.scanned,
+            "days": {day: ranges.tolist() for day, ranges in sorted(self.days.items())},
+        }
+        with gzip.open(temp_path, "wt", encoding="utf-8") as handle:
+            json.dump(payload, handle, separators=(",", ":"))
+        temp_path.replace(index_path)
+
+    @property
+    def indexed(self) -> int:
+        return sum(len(ranges) // 2 for ranges in self.days.values())
+
+    def rows_for_day(self, day: date | str) -> List[Paper]:
+        ranges = self.days.get(day.isoformat() if isinstance(day, date) else day)
+        if not ranges:
+            return []
+        rows = []
+        with self.snapshot_path.open("rb") as handle:
+            for position in range(0, len(ranges), 2):
+                handle.seek(ranges[position])
+                rows.append(snapshot_row(json.loads(handle.read(ranges[position + 1]))))
+        return rows
+
+
+def load_or_build_snapshot_index(snapshot_path: Path, index_path: Path, progress: Callable[[int, int], None] | None = None) -> Tuple[SnapshotIndex, bool]:
+    """Return the index of ``snapshot_path`` and whether it had to be built."""
+    index = SnapshotIndex.load(index_path, snapshot_path)
+    if index is not None:
+        return index, False
+    index = SnapshotIndex.build(snapshot_path, progress=progress)
+    index.save(index_path)
+    return index, True
@@ -1,16 +1,13 @@
 import json
-import sys
 import tempfile
-import types
 import unittest
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from unittest import mock
 
-if "feedparser" not in sys.modules:
-    sys.modules["feedparser"] = types.SimpleNamespace(parse=lambda *_args, **_kwargs: None)
-
 import app
+import metadata_backends
+from baseline_store import LazyBaselineEntry
 from config import LOCAL_TZ
 from pipeline_report import PipelineReport
 from runtime_control import PipelineCancelled, PipelineController
@@ -32,6 +29,14 @@ def _entry(arxiv_id="2606.01779", published=None, category="cs.CL", title="Paper
     }
 
 
+def _write_checkpoint(start, end, entries, stats, next_start):
+    """A checkpoint journal for 2026-06-01 holding ``entries`` as one finished page."""
+    journal = app._baseline_journal("2026-06-01", start, end)
+    journal.open()
+    journal.append_page([app._serialize_checkpoint_entry(entry) for entry in entries], app._checkpoint_cursor(stats, next_start, None))
+    journal.close()
+
+
 class PipelineAppTest(unittest.TestCase):
     def test_parse_institutions_text_supports_alias_rows(self):
         parsed = app.parse_institutions_text("FDU: Fudan University, FDU\nAdobe")
@@ -67,38 +72,136 @@ class PipelineAppTest(unittest.TestCase):
         ]
         with tempfile.TemporaryDirectory() as tmpdir, \
              mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")), \
-             mock.patch.object(app, "iter_recent_cs", return_value=iter(rows)):
+             mock.patch.object(metadata_backends, "iter_recent_cs", return_value=iter(rows)):
             entries, stats = app._collect_baseline_entries(start, end, "2026-06-01")
         self.assertEqual([app.get_arxiv_id(row) for row in entries], ["2606.01781"])
         self.assertEqual(stats["filtered_non_cs"], 1)
         self.assertEqual(stats["filtered_out_of_window"], 1)
 
-    def test_collect_baseline_resumes_from_api_offset(self):
+    def test_collect_baseline_records_query_plan_savings(self):
         start = datetime(2026, 6, 1, 4, tzinfo=timezone.utc)
         end = datetime(2026, 6, 2, 4, tzinfo=timezone.utc)
-        existing = app._serialize_checkpoint_entry(_entry())
-        captured = {}
+        plan = {"plan": "combined", "requests": 2, "naive_requests": 9, "requests_saved": 7, "bytes_saved": 5000}
+
+        def iterator(on_query_plan=None, **_kwargs):
+            yield _entry()
+            on_query_plan(plan)
+
+        messages = []
         with tempfile.TemporaryDirectory() as tmpdir, \
-             mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")):
-            app._write_baseline_checkpoint(
+             mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")), \
+             mock.patch.object(metadata_backends, "iter_recent_cs", side_effect=iterator):
+            _entries, stats = app._collect_baseline_entries(
+                start,
+                end,
                 "2026-06-01",
+                progress_callback=lambda *args: messages.append(args[1]),
+            )
+        self.assertEqual(stats["query_plan"], plan)
+        self.assertTrue(any("saved 7 requests" in message for message in messages))
+
+    def test_collect_baseline_uses_configured_metadata_backend(self):
+        start = datetime(2026, 6, 1, 4, tzinfo=timezone.utc)
+        end = datetime(2026, 6, 2, 4, tzinfo=timezone.utc)
+        plan = {"plan": "oai_pmh", "requests": 3, "bytes": 4096, "rows": 1}
+
+        def iterator(on_query_plan=None, **_kwargs):
+            yield _entry()
+            on_query_plan(plan)
+
+        backend = mock.Mock()
+        backend.iter_entries.side_effect = iterator
+        messages = []
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")), \
+             mock.patch.object(app, "BASELINE_METADATA_BACKEND", "oai_pmh"), \
+             mock.patch.object(app, "get_metadata_backend", return_value=backend) as get_backend, \
+             mock.patch.object(metadata_backends, "iter_recent_cs") as iter_mock:
+            self.assertIn("metadata_backend", app._baseline_journal("2026-06-01", start, end).header)
+            entries, stats = app._collect_baseline_entries(
                 start,
                 end,
-                [app._deserialize_checkpoint_entry(existing)],
-                {"scanned": 200, "matched": 1, "filtered_non_cs": 0, "filtered_out_of_window": 0},
-                200,
+                "2026-06-01",
+                progress_callback=lambda *args: messages.append(args[1]),
             )
+        get_backend.assert_called_once_with("oai_pmh")
+        iter_mock.assert_not_called()
+        self.assertEqual(backend.iter_entries.call_args.kwargs["seen_ids"], {"2606.01779"})
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(stats["query_plan"], plan)
+        self.assertTrue(any("oai_pmh harvest used 3 requests" in message for message in messages))
+
+    def test_collect_baseline_resumes_from_api_offset(self):
+        start = datetime(2026, 6, 1, 4, tzinfo=timezone.utc)
+        end = datetime(2026, 6, 2, 4, tzinfo=timezone.utc)
+        existing = app._serialize_checkpoint_entry(_entry())
+        captured = {}
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")):
+            _write_checkpoint(start, end, [existing], {"scanned": 200, "matched": 1, "filtered_non_cs": 0, "filtered_out_of_window": 0}, 200)
 
             def iterator(**kwargs):
                 captured.update(kwargs)
                 yield _entry(arxiv_id="2606.01780")
 
-            with mock.patch.object(app, "iter_recent_cs", side_effect=iterator):
+            with mock.patch.object(metadata_backends, "iter_recent_cs", side_effect=iterator):
                 entries, stats = app._collect_baseline_entries(start, end, "2026-06-01")
+            journal_left = app._baseline_checkpoint_path("2026-06-01").exists()
 
         self.assertEqual(captured["start_offset"], 200)
         self.assertEqual(len(entries), 2)
         self.assertEqual(stats["scanned"], 201)
+        self.assertFalse(journal_left)
+
+    def test_collect_baseline_checkpoints_and_resumes_category_cursors(self):
+        start = datetime(2026, 6, 1, 4, tzinfo=timezone.utc)
+        end = datetime(2026, 6, 2, 4, tzinfo=timezone.utc)
+        cursors = {"plan": "per_category", "streams": {"cs.AI": {"next_start": 0, "complete": True}}}
+
+        def interrupted(on_page_complete=None, **_kwargs):
+            yield _entry()
+            on_page_complete(current_start=0, next_start=0, fetched_count=0, cursors=cursors)
+            raise PipelineCancelled("stop")
+
+        captured = {}
+
+        def resumed(**kwargs):
+            captured.update(kwargs)
+            return iter([])
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")):
+            with mock.patch.object(metadata_backends, "iter_recent_cs", side_effect=interrupted):
+                with self.assertRaises(PipelineCancelled):
+                    app._collect_baseline_entries(start, end, "2026-06-01")
+            with mock.patch.object(metadata_backends, "iter_recent_cs", side_effect=resumed):
+                entries, _stats = app._collect_baseline_entries(start, end, "2026-06-01")
+
+        self.assertEqual(captured["cursors"], cursors)
+        self.assertEqual(len(entries), 1)
+
+    def test_collect_baseline_appends_each_entry_to_journal_once(self):
+        start = datetime(2026, 6, 1, 4, tzinfo=timezone.utc)
+        end = datetime(2026, 6, 2, 4, tzinfo=timezone.utc)
+
+        def two_pages(on_page_complete=None, **_kwargs):
+            yield _entry()
+            on_page_complete(current_start=0, next_start=1, fetched_count=1)
+            yield _entry(arxiv_id="2606.01780")
+            on_page_complete(current_start=1, next_start=2, fetched_count=1)
+            raise PipelineCancelled("stop")
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")):
+            with mock.patch.object(metadata_backends, "iter_recent_cs", side_effect=two_pages):
+                with self.assertRaises(PipelineCancelled):
+                    app._collect_baseline_entries(start, end, "2026-06-01")
+            lines = app._baseline_checkpoint_path("2026-06-01").read_text(encoding="utf-8").splitlines()
+            checkpoint = app._load_baseline_checkpoint("2026-06-01", start, end)
+
+        self.assertEqual([json.loads(line)["type"] for line in lines], ["header", "entry", "cursor", "entry", "cursor"])
+        self.assertEqual(checkpoint["next_start"], 2)
+        self.assertEqual(checkpoint["stats"]["matched"], 2)
 
     def test_checkpoint_rejects_old_schema(self):
         start = datetime(2026, 6, 1, 4, tzinfo=timezone.utc)
@@ -121,13 +224,123 @@ class PipelineAppTest(unittest.TestCase):
         with tempfile.TemporaryDirectory() as tmpdir, \
              mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")):
             app._write_complete_baseline_cache("2026-06-01", start, end, cached)
-            with mock.patch.object(app, "iter_recent_cs") as iter_mock:
+            with mock.patch.object(metadata_backends, "iter_recent_cs") as iter_mock:
                 entries, stats = app._collect_baseline_entries(start, end, "2026-06-01")
 
         iter_mock.assert_not_called()
         self.assertEqual([app.get_arxiv_id(entry) for entry in entries], ["2606.01779"])
         self.assertTrue(stats["cache_hit"])
 
+    def test_collect_baseline_tops_up_open_window_from_watermarks(self):
+        start = datetime(2026, 6, 1, 4, tzinfo=timezone.utc)
+        end = datetime(2026, 6, 2, 4, tzinfo=timezone.utc)
+        cached = _entry(published=datetime(2026, 6, 1, 9, 30, tzinfo=timezone.utc))
+        fresh = _entry(arxiv_id="2606.01790", published=datetime(2026, 6, 1, 11, tzinfo=timezone.utc))
+        since_calls = []
+
+        def since(category, since_utc, end_utc, known_ids=None, on_request_progress=None):
+            since_calls.append((category, since_utc))
+            return iter([cached, fresh])
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")), \
+             mock.patch.object(app, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.CL", "cs.LG"]), \
+             mock.patch.object(app, "window_is_settled", return_value=False):
+            app._write_complete_baseline_cache("2026-06-01", start, end, [cached], {"cs.CL": 1, "cs.LG": 5})
+            with mock.patch.object(app, "probe_category_total", side_effect=lambda category, *_: {"cs.CL": 2, "cs.LG": 5}[category]), \
+                 mock.patch.object(app, "iter_category_since", side_effect=since), \
+                 mock.patch.object(metadata_backends, "iter_recent_cs") as iter_mock:
+                entries, stats = app._collect_baseline_entries(start, end, "2026-06-01")
+            rewritten = app._open_complete_baseline_cache("2026-06-01", start, end)
+            rewritten_ids = [record.arxiv_id for record in rewritten.index]
+
+        iter_mock.assert_not_called()
+        self.assertEqual(since_calls, [("cs.CL", cached["published"])])
+        self.assertEqual([app.get_arxiv_id(entry) for entry in entries], ["2606.01779", "2606.01790"])
+        self.assertEqual(stats["delta"], {"probes": 2, "skipped": ["cs.LG"], "queried": ["cs.CL"], "new": 1})
+        self.assertEqual(rewritten_ids, ["2606.01779", "2606.01790"])
+        self.assertEqual(rewritten.meta["delta"]["categories"]["cs.CL"], {
+            "watermark": fresh["published"].isoformat(),
+            "newest_id": "2606.01790",
+            "total": 2,
+        })
+
+    def test_first_delta_run_after_a_full_fetch_skips_unchanged_categories(self):
+        start = datetime(2026, 6, 1, 4, tzinfo=timezone.utc)
+        end = datetime(2026, 6, 2, 4, tzinfo=timezone.utc)
+
+        def iterator(on_query_plan=None, **_kwargs):
+            yield _entry()
+            on_query_plan({
+                "plan": "exclusion",
+                "requests": 2,
+                "naive_requests": 2,
+                "requests_saved": 0,
+                "bytes_saved": 0,
+                "totals": {"cs.LG": 5},
+            })
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")), \
+             mock.patch.object(app, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.CL", "cs.LG"]), \
+             mock.patch.object(app, "window_is_settled", return_value=False):
+            with mock.patch.object(metadata_backends, "iter_recent_cs", side_effect=iterator):
+                app._collect_baseline_entries(start, end, "2026-06-01")
+            # cs.LG keeps the API total; cs.CL falls back to the rows that list it.
+            with mock.patch.object(app, "probe_category_total", side_effect=lambda category, *_: {"cs.CL": 1, "cs.LG": 5}[category]), \
+                 mock.patch.object(app, "iter_category_since") as since_mock, \
+                 mock.patch.object(metadata_backends, "iter_recent_cs") as iter_mock:
+                _entries, stats = app._collect_baseline_entries(start, end, "2026-06-01")
+
+        iter_mock.assert_not_called()
+        since_mock.assert_not_called()
+        self.assertEqual(stats["delta"], {"probes": 2, "skipped": ["cs.CL", "cs.LG"], "queried": [], "new": 0})
+
+    def test_cached_rows_stay_readable_after_a_delta_top_up(self):
+        start = datetime(2026, 6, 1, 4, tzinfo=timezone.utc)
+        end = datetime(2026, 6, 2, 4, tzinfo=timezone.utc)
+        cached = _entry(published=datetime(2026, 6, 1, 9, 30, tzinfo=timezone.utc), title="Cached paper")
+        fresh = _entry(arxiv_id="2606.01790", published=datetime(2026, 6, 1, 11, tzinfo=timezone.utc), title="Fresh paper")
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")), \
+             mock.patch.object(app, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.CL"]), \
+             mock.patch.object(app, "window_is_settled", return_value=False):
+            app._write_complete_baseline_cache("2026-06-01", start, end, [cached], {"cs.CL": 1})
+            with mock.patch.object(app, "probe_category_total", return_value=2), \
+                 mock.patch.object(app, "iter_category_since", return_value=iter([fresh])):
+                entries, _ = app._collect_baseline_entries(start, end, "2026-06-01")
+            # The rewrite moved every row; the returned entries must read the new file.
+            lazy = [isinstance(entry, LazyBaselineEntry) for entry in entries]
+            titles = [entry["title"] for entry in entries]
+
+        self.assertEqual(lazy, [True, True])
+        self.assertEqual(titles, ["Cached paper", "Fresh paper"])
+
+    def test_complete_cache_round_trips_lazily_and_migrates_legacy_json(self):
+        start = datetime(2026, 6, 1, 4, tzinfo=timezone.utc)
+        end = datetime(2026, 6, 2, 4, tzinfo=timezone.utc)
+        entry = _entry()
+        entry["links"] = [{"href": "https://arxiv.org/pdf/2606.01779v1", "type": "application/pdf"}]
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")):
+            legacy = app._legacy_baseline_cache_path("2026-06-01")
+            legacy.parent.mkdir(parents=True)
+            legacy.write_text(json.dumps({
+                **app._baseline_cache_meta("2026-06-01", start, end),
+                "entries": [{**entry, "published": entry["published"].isoformat()}],
+            }), encoding="utf-8")
+            cached = app._load_complete_baseline_cache("2026-06-01", start, end)
+            legacy_left = legacy.exists()
+            other_window = app._load_complete_baseline_cache("2026-06-01", start, end + timedelta(hours=1))
+            self.assertEqual(app.extract_pdf_url(cached[0]), "https://arxiv.org/pdf/2606.01779v1")
+            self.assertEqual(cached[0]["published"], entry["published"])
+            self.assertEqual(cached[0]["authors"], ["Alice Zhang"])
+            self.assertEqual(cached[0].arxiv_id, "2606.01779")
+
+        self.assertFalse(legacy_left)
+        self.assertIsNone(other_window)
+
     def test_collect_baseline_deduplicates_resumed_entries(self):
         start = datetime(2026, 6, 1, 4, tzinfo=timezone.utc)
         end = datetime(2026, 6, 2, 4, tzinfo=timezone.utc)
@@ -136,20 +349,103 @@ class PipelineAppTest(unittest.TestCase):
         fresh = _entry(arxiv_id="2606.01780")
         with tempfile.TemporaryDirectory() as tmpdir, \
              mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")):
-            app._write_baseline_checkpoint(
-                "2026-06-01",
-                start,
-                end,
-                [existing],
-                {"scanned": 1, "matched": 1, "filtered_non_cs": 0, "filtered_out_of_window": 0},
-                1,
-            )
-            with mock.patch.object(app, "iter_recent_cs", return_value=iter([duplicate, fresh])):
+            _write_checkpoint(start, end, [existing], {"scanned": 1, "matched": 1, "filtered_non_cs": 0, "filtered_out_of_window": 0}, 1)
+            with mock.patch.object(metadata_backends, "iter_recent_cs", return_value=iter([duplicate, fresh])):
                 entries, stats = app._collect_baseline_entries(start, end, "2026-06-01")
 
         self.assertEqual([app.get_arxiv_id(entry) for entry in entries], ["2606.01779", "2606.01780"])
         self.assertEqual(stats["matched"], 2)
 
+    def test_collect_baseline_range_splits_one_stream_into_day_caches(self):
+        rows = [
+            _entry(arxiv_id="2606.00003", published=datetime(2026, 6, 3, 15, tzinfo=timezone.utc)),
+            _entry(arxiv_id="2606.00002", published=datetime(2026, 6, 2, 15, tzinfo=timezone.utc)),
+            _entry(arxiv_id="2606.00001", published=datetime(2026, 6, 2, 5, tzinfo=timezone.utc)),
+            _entry(arxiv_id="2606.00000", published=datetime(2026, 6, 1, 15, tzinfo=timezone.utc)),
+        ]
+        captured = []
+
+        def iterator(**kwargs):
+            captured.append(kwargs)
+            yield from rows
+            # A finished page writes the run's checkpoint journal.
+            kwargs["on_page_complete"](0, len(rows), len(rows))
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")):
+            first_start, first_end = app.arxiv_day_window(date(2026, 6, 1))
+            app._write_complete_baseline_cache("2026-06-01", first_start, first_end, [_entry()])
+            with mock.patch.object(metadata_backends, "iter_recent_cs", side_effect=iterator):
+                stats = app.collect_baseline_range("2026-06-01", "2026-06-03")
+            day_two = app._load_complete_baseline_cache("2026-06-02", *app.arxiv_day_window(date(2026, 6, 2)))
+            day_three = app._load_complete_baseline_cache("2026-06-03", *app.arxiv_day_window(date(2026, 6, 3)))
+            first_day = app._load_complete_baseline_cache("2026-06-01", first_start, first_end)
+            leftover_checkpoints = list((Path(tmpdir) / "reports").rglob("baseline_fetch_checkpoint.jsonl"))
+            report_dirs = sorted(path.name for path in (Path(tmpdir) / "reports").iterdir())
+
+        self.assertEqual(len(captured), 1)
+        self.assertEqual(captured[0]["start_utc"], app.arxiv_day_window(date(2026, 6, 2))[0])
+        self.assertEqual(captured[0]["end_utc"], app.arxiv_day_window(date(2026, 6, 3))[1])
+        self.assertEqual(stats["fetched_days"], ["2026-06-02", "2026-06-03"])
+        self.assertEqual(stats["cached_days"], ["2026-06-01"])
+        self.assertEqual(stats["matched_by_day"], {"2026-06-02": 2, "2026-06-03": 1})
+        self.assertEqual([app.get_arxiv_id(entry) for entry in day_two], ["2606.00002", "2606.00001"])
+        self.assertEqual([app.get_arxiv_id(entry) for entry in day_three], ["2606.00003"])
+        self.assertEqual([app.get_arxiv_id(entry) for entry in first_day], ["2606.01779"])
+        self.assertEqual(leftover_checkpoints, [])
+        self.assertEqual(report_dirs, ["2026-06-01", "2026-06-02", "2026-06-03"])
+
+    def test_collect_baseline_range_fetches_each_run_of_missing_days_separately(self):
+        rows = [
+            _entry(arxiv_id="2606.00003", published=datetime(2026, 6, 3, 15, tzinfo=timezone.utc)),
+            _entry(arxiv_id="2606.00001", published=datetime(2026, 6, 1, 15, tzinfo=timezone.utc)),
+        ]
+        captured = []
+
+        def iterator(**kwargs):
+            captured.append((kwargs["start_utc"], kwargs["end_utc"]))
+            return iter(rows)
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")):
+            app._write_complete_baseline_cache("2026-06-02", *app.arxiv_day_window(date(2026, 6, 2)), [_entry()])
+            with mock.patch.object(metadata_backends, "iter_recent_cs", side_effect=iterator):
+                stats = app.collect_baseline_range("2026-06-01", "2026-06-03")
+
+        self.assertEqual(captured, [app.arxiv_day_window(date(2026, 6, 1)), app.arxiv_day_window(date(2026, 6, 3))])
+        self.assertEqual(stats["cached_days"], ["2026-06-02"])
+        self.assertEqual(stats["matched_by_day"], {"2026-06-01": 1, "2026-06-03": 1})
+
+    def test_import_baseline_snapshot_writes_day_caches_from_index(self):
+        def record(arxiv_id, created, categories="cs.CL"):
+            return json.dumps({
+                "id": arxiv_id,
+                "authors": "Alice Zhang",
+                "title": "Paper",
+                "categories": categories,
+                "abstract": "",
+                "versions": [{"version": "v1", "created": created}],
+            })
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(app, "CACHE_REPORT_DIR", str(Path(tmpdir) / "reports")):
+            snapshot = Path(tmpdir) / "snapshot.json"
+            snapshot.write_text("\n".join([
+                record("2606.00001", "Mon, 1 Jun 2026 15:00:00 GMT"),
+                record("2606.00002", "Mon, 1 Jun 2026 16:00:00 GMT", "math.OC"),
+                record("2606.00003", "Tue, 2 Jun 2026 15:00:00 GMT"),
+            ]) + "\n", encoding="utf-8")
+            first = app.import_baseline_snapshot(snapshot, "2026-06-01", "2026-06-02")
+            day_one = app._load_complete_baseline_cache("2026-06-01", *app.arxiv_day_window(date(2026, 6, 1)))
+            second = app.import_baseline_snapshot(snapshot, "2026-06-01", "2026-06-03")
+
+        self.assertTrue(first["index_built"])
+        self.assertEqual(first["matched_by_day"], {"2026-06-01": 1, "2026-06-02": 1})
+        self.assertEqual([app.get_arxiv_id(entry) for entry in day_one], ["2606.00001v1"])
+        self.assertFalse(second["index_built"])
+        self.assertEqual(second["cached_days"], ["2026-06-01", "2026-06-02"])
+        self.assertEqual(second["matched_by_day"], {"2026-06-03": 0})
+
     def test_prioritize_candidates_moves_priority_categories_first(self):
         entries = [
             _entry(arxiv_id="2", category="cs.SE"),
@@ -282,5 +578,52 @@ class PipelineAppTest(unittest.TestCase):
         self.assertEqual([app.get_arxiv_id(entry) for entry in result["filtered_candidates"]], ["2606.01779"])
 
 
+    def test_run_after_cooldowns_waits_out_rate_limit_and_reruns(self):
+        ended = datetime.now(timezone.utc) - timedelta(seconds=5)
+        task = mock.Mock(side_effect=[app.ArxivRateLimitError("HTTP 429", retry_at=ended), "done"])
+        events = []
+
+        result = app.run_after_cooldowns(task, progress_callback=lambda *event: events.append(event))
+
+        self.assertEqual(result, "done")
+        self.assertEqual(task.call_count, 2)
+        self.assertEqual(events, [("cooldown", "arXiv API cooldown over, resuming", "running", 100.0)])
+
+    def test_run_after_cooldowns_reports_eta_and_honors_cancel(self):
+        until = datetime.now(timezone.utc) + timedelta(hours=2)
+        task = mock.Mock(side_effect=app.ArxivRateLimitError("HTTP 429", retry_at=until))
+        controller = PipelineController()
+        events = []
+
+        def cancel_while_waiting(seconds):
+            self.assertLessEqual(seconds, 60)
+            controller.cancel()
+            PipelineController.sleep(controller, seconds)
+
+        with mock.patch.object(app, "COOLDOWN_PROGRESS_INTERVAL_SEC", 60), \
+             mock.patch.object(controller, "sleep", side_effect=cancel_while_waiting):
+            with self.assertRaises(PipelineCancelled):
+                app.run_after_cooldowns(task, controller=controller, progress_callback=lambda *event: events.append(event))
+
+        task.assert_called_once()
+        stage, message, state, percent = events[0]
+        self.assertEqual((stage, state), ("cooldown", "waiting"))
+        self.assertIn("resuming in 2h00m", message)
+        self.assertLess(percent, 1.0)
+
+    def test_run_after_cooldowns_gives_up_after_max_resumes(self):
+        ended = datetime.now(timezone.utc) - timedelta(seconds=5)
+        task = mock.Mock(side_effect=app.ArxivRateLimitError("HTTP 429", retry_at=ended))
+
+        with self.assertRaises(app.ArxivRateLimitError):
+            app.run_after_cooldowns(task, max_resumes=2)
+        self.assertEqual(task.call_count, 3)
+
+        task = mock.Mock(side_effect=app.ArxivRateLimitError("HTTP 429"))
+        with self.assertRaises(app.ArxivRateLimitError):
+            app.run_after_cooldowns(task)
+        task.assert_called_once()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from arxiv_atom import parse_atom_page
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+class ArxivAtomTest(unittest.TestCase):
+    def setUp(self):
+        self.payload = (FIXTURES / "arxiv_api_page.xml").read_bytes()
+
+    def test_parse_atom_page_reads_opensearch_headers(self):
+        page = parse_atom_page(self.payload)
+        self.assertEqual(page.total_results, 412)
+        self.assertEqual(page.start_index, 0)
+        self.assertEqual(page.items_per_page, 3)
+        self.assertEqual(page.entry_count, 3)
+
+    def test_parse_atom_page_builds_compact_rows(self):
+        row = parse_atom_page(self.payload).rows[0]
+        self.assertEqual(row["id"], "http://arxiv.org/abs/2606.01781v1")
+        self.assertEqual(row["title"], "Retrieval-Augmented Decoding for Long-Context\n  Language Models")
+        self.assertTrue(row["summary"].startswith("We study retrieval-augmented decoding"))
+        self.assertEqual(row["authors"], ["Alice Zhang", "Bob Li"])
+        self.assertEqual(row["published"], datetime(2026, 6, 1, 17, 59, 58, tzinfo=timezone.utc))
+        self.assertEqual(row["primary_category"], "cs.CL")
+        self.assertEqual(row["categories"], ["cs.CL", "cs.AI"])
+        self.assertEqual(row["comment"], "12 pages, 4 figures")
+        self.assertEqual(row["journal_ref"], "")
+        self.assertEqual(row.arxiv_id, "2606.01781v1")
+        self.assertEqual(row.pdf_url, "http://arxiv.org/pdf/2606.01781v1")
+
+    def test_parse_atom_page_puts_primary_category_first_when_not_tagged(self):
+        row = parse_atom_page(self.payload).rows[1]
+        self.assertEqual(row["categories"], ["cs.LG", "cs.CL"])
+        self.assertEqual(row["summary"], "Sparse adapters transfer across languages & scripts.")
+        self.assertEqual(row["journal_ref"], "Proc. ACL 2026")
+
+    def test_parse_atom_page_skips_rows_for_seen_ids(self):
+        page = parse_atom_page(self.payload, seen_ids={"2606.01780v2"})
+        self.assertEqual(page.ids, ["2606.01781v1", "2606.01780v2", "2606.01779v1"])
+        self.assertEqual([row["id"].rsplit("/", 1)[-1] for row in page.rows], ["2606.01781v1", "2606.01779v1"])
+        self.assertEqual(page.skipped_seen, 1)
+
+    def test_parse_atom_page_accepts_text_and_empty_feed(self):
+        page = parse_atom_page("<?xml version='1.0'?><feed xmlns='http://www.w3.org/2005/Atom'></feed>")
+        self.assertEqual(page.entry_count, 0)
+        self.assertIsNone(page.total_results)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+import arxiv_oai
+from arxiv_oai import parse_list_records, split_authors
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+class ArxivOaiTest(unittest.TestCase):
+    def setUp(self):
+        self.payload = (FIXTURES / "arxiv_oai_page.xml").read_bytes()
+
+    def test_parse_list_records_reads_token_and_counts_deleted_records(self):
+        page = parse_list_records(self.payload)
+        self.assertEqual(page.resumption_token, "6961016|1001")
+        self.assertEqual(page.complete_list_size, 5)
+        self.assertEqual(page.cursor, 0)
+        self.assertEqual(page.deleted, 1)
+        self.assertEqual(page.record_count, 3)
+        self.assertEqual(page.ids, ["2606.01781v2", "2401.00042v3"])
+        self.assertEqual(page.payload_bytes, len(self.payload))
+
+    def test_parse_list_records_builds_rows_like_the_search_api(self):
+        row = parse_list_records(self.payload).rows[0]
+        self.assertEqual(row["id"], "https://arxiv.org/abs/2606.01781v2")
+        self.assertEqual(row.arxiv_id, "2606.01781v2")
+        self.assertEqual(row["title"], "Retrieval-Augmented Decoding for Long-Context\n  Language Models")
+        self.assertEqual(row["summary"], "We study retrieval-augmented decoding.")
+        self.assertEqual(row["authors"], ["Alice Zhang", "Bob Li", "Chen Wang"])
+        self.assertEqual(row["published"], datetime(2026, 6, 1, 17, 59, 58, tzinfo=timezone.utc))
+        self.assertEqual(row["updated"], datetime(2026, 6, 2, 9, 12, tzinfo=timezone.utc))
+        self.assertEqual(row["primary_category"], "cs.CL")
+        self.assertEqual(row["categories"], ["cs.CL", "cs.AI"])
+        self.assertEqual(row["comment"], "12 pages, 4 figures")
+        self.assertEqual(row.pdf_url, "https://arxiv.org/pdf/2606.01781v2")
+
+    def test_parse_list_records_points_rows_at_the_configured_base_url(self):
+        with mock.patch.object(arxiv_oai, "ARXIV_BASE_URL", "http://127.0.0.1:8765"):
+            row = parse_list_records(self.payload).rows[0]
+        self.assertEqual(row["id"], "http://127.0.0.1:8765/abs/2606.01781v2")
+        self.assertEqual(row.pdf_url, "http://127.0.0.1:8765/pdf/2606.01781v2")
+
+    def test_parse_list_records_skips_seen_ids_and_reads_errors(self):
+        page = parse_list_records(self.payload, seen_ids={"2401.00042v3"})
+        self.assertEqual([row.arxiv_id for row in page.rows], ["2606.01781v2"])
+        self.assertEqual(page.skipped_seen, 1)
+        with mock.patch.object(arxiv_oai, "_record_row", wraps=arxiv_oai._record_row) as record_row:
+            parse_list_records(self.payload, seen_ids={"2401.00042v3"})
+        self.assertEqual([call.args[1] for call in record_row.call_args_list], ["2606.01781v2"])
+
+        error = parse_list_records(
+            '<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">'
+            '<error code="badResumptionToken">token expired</error></OAI-PMH>'
+        )
+        self.assertEqual(error.error_code, "badResumptionToken")
+        self.assertEqual(error.error_message, "token expired")
+        self.assertIsNone(error.resumption_token)
+
+    def test_split_authors_handles_and_and_commas(self):
+        self.assertEqual(split_authors("A. One, B. Two, and C. Three"), ["A. One", "B. Two", "C. Three"])
+        self.assertEqual(split_authors("Solo Author"), ["Solo Author"])
+
+
+if __name__ == "__main__":
+    unittest.main()
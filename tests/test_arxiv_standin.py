@@ -0,0 +1,121 @@
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+import fetch_arxiv
+from api_cache import ApiResponseCache
+from arxiv_atom import parse_atom_page
+from arxiv_standin import ArxivStandin, StandinOptions, generate_corpus
+from config import ARXIV_PRIMARY_CATEGORY_PREFIXES, MIN_PDF_BYTES
+from filters import arxiv_day_window
+
+DAY = date(2026, 6, 1)
+WINDOW = "submittedDate:[202606010400 TO 202606020359]"
+
+
+class ArxivStandinTest(unittest.TestCase):
+    def setUp(self):
+        self.corpus = generate_corpus([DAY, date(2026, 6, 2)], papers_per_day=60, seed=7)
+        self.session = requests.Session()
+        self.session.trust_env = False
+        self.addCleanup(self.session.close)
+
+    def _serve(self, **options):
+        standin = ArxivStandin(self.corpus, StandinOptions(**options))
+        standin.start()
+        self.addCleanup(standin.stop)
+        return standin
+
+    def _query(self, standin, search_query, start=0, max_results=10):
+        return self.session.get(
+            f"{standin.base_url}/api/query",
+            params={"search_query": search_query, "sortBy": "submittedDate", "sortOrder": "descending", "start": start, "max_results": max_results},
+            timeout=10,
+        )
+
+    def test_corpus_is_deterministic_and_newest_first(self):
+        again = generate_corpus([DAY, date(2026, 6, 2)], papers_per_day=60, seed=7)
+
+        self.assertEqual(again, self.corpus)
+        self.assertEqual(len({paper.arxiv_id for paper in self.corpus}), 120)
+        self.assertEqual(self.corpus, sorted(self.corpus, key=lambda paper: paper.published, reverse=True))
+
+    def test_window_query_with_exclusions_pages_through_matches(self):
+        standin = self._serve()
+        start_utc, end_utc = arxiv_day_window(DAY)
+        expected = [
+            paper.arxiv_id for paper in self.corpus
+            if start_utc <= paper.published <= end_utc and "cs.AI" in paper.categories
+            and not {"cs.CL", "cs.LG"} & set(paper.categories)
+        ]
+        query = f"{WINDOW} AND ((cat:cs.AI) ANDNOT (cat:cs.CL OR cat:cs.LG))"
+
+        first = parse_atom_page(self._query(standin, query, max_results=2).text)
+        rest = parse_atom_page(self._query(standin, query, start=2, max_results=100).text)
+
+        self.assertEqual((first.total_results, first.start_index, first.items_per_page), (len(expected), 0, 2))
+        self.assertEqual(first.ids + rest.ids, expected)
+        self.assertTrue(first.rows[0].pdf_url.startswith(f"{standin.base_url}/pdf/"))
+
+    def test_injects_429_with_retry_after_and_503_on_large_pages(self):
+        standin = self._serve(throttle_every=2, retry_after_sec=30, max_results_limit=50)
+
+        self.assertEqual(self._query(standin, "cat:cs.*").status_code, 200)
+        throttled = self._query(standin, "cat:cs.*")
+        too_large = self._query(standin, "cat:cs.*", max_results=51)
+
+        self.assertEqual((throttled.status_code, throttled.headers["Retry-After"]), (429, "30"))
+        self.assertEqual(too_large.status_code, 503)
+        self.assertEqual(standin.stats()["statuses"], {"200": 1, "429": 1, "503": 1})
+
+    def test_serves_pdf_and_html_for_known_papers(self):
+        standin = self._serve(pdf_bytes=MIN_PDF_BYTES + 10)
+        paper = self.corpus[0]
+
+        pdf = self.session.get(f"{standin.base_url}/pdf/{paper.arxiv_id}", timeout=10)
+        html = self.session.get(f"{standin.base_url}/html/{paper.base_id}", timeout=10)
+        missing = self.session.get(f"{standin.base_url}/pdf/2606.99999v1.pdf", timeout=10)
+
+        self.assertTrue(pdf.content.startswith(b"%PDF-"))
+        self.assertGreaterEqual(len(pdf.content), MIN_PDF_BYTES)
+        self.assertIn(paper.authors[0][1], html.text)
+        self.assertEqual(missing.status_code, 404)
+
+    def test_category_fetch_runs_against_the_standin(self):
+        standin = self._serve()
+        start_utc, end_utc = arxiv_day_window(DAY)
+        expected = {
+            paper.arxiv_id for paper in self.corpus
+            if start_utc <= paper.published <= end_utc
+            and any(category.startswith(prefix) for category in paper.categories for prefix in ARXIV_PRIMARY_CATEGORY_PREFIXES)
+        }
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.addCleanup(fetch_arxiv._request_state_store.flush)
+        scheduler = fetch_arxiv._build_request_scheduler({"api": {"min_interval_sec": 0.0, "per_minute": 1000, "concurrency": 1}})
+
+        with mock.patch.multiple(
+            fetch_arxiv,
+            ARXIV_API_ENDPOINTS=[f"{standin.base_url}/api/query"],
+            ARXIV_API_USE_PROXY=False,
+            NO_PROXY_HOSTS=["127.0.0.1"],
+            _ARXIV_API_HOSTS={"127.0.0.1"},
+            _request_state_path=Path(tmpdir.name) / "arxiv_request_state.json",
+            _legacy_request_state_path=Path(tmpdir.name) / "legacy_arxiv_request_state.json",
+            _request_scheduler=scheduler,
+            _route_cache=fetch_arxiv.RouteCache(ttl_sec=600),
+            _request_tracer=fetch_arxiv.RequestTracer(),
+            _api_cache=ApiResponseCache(Path(tmpdir.name) / "api_cache"),
+        ):
+            rows = list(fetch_arxiv.iter_recent_cs(start_utc=start_utc, end_utc=end_utc))
+
+        self.assertEqual({fetch_arxiv.get_arxiv_id(row) for row in rows}, expected)
+        self.assertGreaterEqual(standin.stats()["requests"]["api"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from unittest import mock
+
+from baseline_store import CheckpointJournal, CompactBaseline, write_compact_baseline
+
+HEADER = {"report_date": "2026-06-01", "filter_version": "v2"}
+
+
+class CheckpointJournalTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.path = Path(self._tmpdir.name) / "checkpoint.jsonl"
+
+    def test_replay_keeps_only_pages_with_a_cursor_and_ignores_torn_line(self):
+        journal = CheckpointJournal(self.path, HEADER, fsync_every=2)
+        journal.append_page([{"id": "a"}], {"next_start": 1})
+        journal.append_page([{"id": "b"}, {"id": "c"}], {"next_start": 3})
+        journal.close()
+        with self.path.open("ab") as handle:
+            handle.write(b'{"type":"entry","entry":{"id":"d"}}\n{"type":"cursor","next_')
+
+        replayed = CheckpointJournal(self.path, HEADER).replay()
+
+        self.assertEqual([entry["id"] for entry in replayed["entries"]], ["a", "b", "c"])
+        self.assertEqual(replayed["cursor"]["next_start"], 3)
+        self.assertLess(replayed["valid_bytes"], self.path.stat().st_size)
+
+    def test_resume_cuts_torn_tail_before_appending(self):
+        journal = CheckpointJournal(self.path, HEADER)
+        journal.append_page([{"id": "a"}], {"next_start": 1})
+        journal.close()
+        with self.path.open("ab") as handle:
+            handle.write(b'{"type":"ent')
+
+        resumed = CheckpointJournal(self.path, HEADER)
+        resumed.open(resumed.replay()["valid_bytes"])
+        resumed.append_page([{"id": "b"}], {"next_start": 2})
+        resumed.close()
+
+        lines = [json.loads(line) for line in self.path.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([line["type"] for line in lines], ["header", "entry", "cursor", "entry", "cursor"])
+        self.assertEqual([entry["id"] for entry in CheckpointJournal(self.path, HEADER).replay()["entries"]], ["a", "b"])
+
+    def test_replay_rejects_journal_for_another_window(self):
+        journal = CheckpointJournal(self.path, HEADER)
+        journal.append_page([{"id": "a"}], {"next_start": 1})
+        journal.close()
+        self.assertIsNone(CheckpointJournal(self.path, {**HEADER, "report_date": "2026-06-02"}).replay())
+
+
+def _index_fields(row):
+    return (row["id"].rsplit("/", 1)[-1], row["id"], row["primary_category"], row["categories"], row["published"], None)
+
+
+class CompactBaselineTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.path = Path(self._tmpdir.name) / "baseline.bin"
+        rows = [
+            {
+                "id": f"http://arxiv.org/abs/2606.0000{index}",
+                "primary_category": "cs.CL",
+                "categories": ["cs.CL", "cs.LG"],
+                "published": datetime(2026, 6, 1, index, tzinfo=timezone.utc).isoformat(),
+                "summary": "abstract " * 50,
+            }
+            for index in range(3)
+        ]
+        write_compact_baseline(self.path, {"report_date": "2026-06-01"}, rows, _index_fields)
+
+    def test_index_fields_do_not_decode_rows(self):
+        baseline = CompactBaseline.open(self.path, dict)
+        self.assertEqual(baseline.meta, {"report_date": "2026-06-01"})
+        entries = baseline.entries()
+        with mock.patch.object(baseline, "load_row", side_effect=AssertionError("row decoded")):
+            self.assertEqual([entry["primary_category"] for entry in entries], ["cs.CL"] * 3)
+            self.assertEqual(entries[2]["published"], datetime(2026, 6, 1, 2, tzinfo=timezone.utc))
+            self.assertEqual([index.arxiv_id for index in baseline.index], ["2606.00000", "2606.00001", "2606.00002"])
+
+    def test_other_fields_load_the_row_on_demand(self):
+        entries = CompactBaseline.open(self.path, dict).entries()
+        self.assertTrue(entries[1]["summary"].startswith("abstract"))
+        self.assertEqual(dict(entries[1])["id"], "http://arxiv.org/abs/2606.00001")
+        self.assertIsNone(entries[0].get("comment"))
+
+    def test_open_rejects_other_files(self):
+        other = Path(self._tmpdir.name) / "baseline.json"
+        other.write_text("{}", encoding="utf-8")
+        self.assertIsNone(CompactBaseline.open(other, dict))
+        self.assertIsNone(CompactBaseline.open(Path(self._tmpdir.name) / "missing.bin", dict))
+
+
+if __name__ == "__main__":
+    unittest.main()
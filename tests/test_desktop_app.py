@@ -1,10 +1,12 @@
 import json
 import tempfile
 import unittest
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest import mock
 
 import desktop_app
+from fetch_arxiv import ArxivRateLimitError
 
 
 class DesktopAppTest(unittest.TestCase):
@@ -99,6 +101,79 @@ class DesktopAppTest(unittest.TestCase):
             self.assertEqual(payload["filtered_candidate_count"], 1)
             self.assertTrue((Path(tmpdir) / "summary.txt").exists())
 
+    def test_run_cli_pipeline_backfills_range_with_one_baseline_pass(self):
+        class _Report:
+            def to_dict(self):
+                return {}
+
+            def summary_lines(self):
+                return []
+
+        def fake_run(target_day, institution_patterns):
+            return {"report_date": target_day.isoformat(), "report": _Report()}
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(desktop_app, "collect_baseline_range") as range_mock, \
+             mock.patch.object(desktop_app, "run_pipeline", side_effect=fake_run):
+            exit_code = desktop_app.main([
+                "--run-once",
+                "--target-day", "2026-04-01",
+                "--through-day", "2026-04-03",
+                "--output-json", str(Path(tmpdir) / "result.json"),
+                "--quiet",
+            ])
+            payload = json.loads((Path(tmpdir) / "result.json").read_text(encoding="utf-8"))
+
+        self.assertEqual(exit_code, 0)
+        range_mock.assert_called_once_with("2026-04-01", "2026-04-03")
+        self.assertEqual([day["report_date"] for day in payload["days"]], ["2026-04-01", "2026-04-02", "2026-04-03"])
+
+    def test_run_cli_pipeline_imports_snapshot_before_running(self):
+        class _Report:
+            def to_dict(self):
+                return {}
+
+            def summary_lines(self):
+                return []
+
+        with mock.patch.object(desktop_app, "import_baseline_snapshot") as import_mock, \
+             mock.patch.object(desktop_app, "collect_baseline_range"), \
+             mock.patch.object(desktop_app, "run_pipeline", return_value={"report_date": "2026-04-01", "report": _Report()}):
+            exit_code = desktop_app.main([
+                "--run-once",
+                "--target-day", "2026-04-01",
+                "--import-snapshot", "snapshot.json",
+                "--quiet",
+            ])
+
+        self.assertEqual(exit_code, 0)
+        import_mock.assert_called_once_with("snapshot.json", "2026-04-01", "2026-04-01")
+
+    def test_run_cli_pipeline_waits_for_cooldown_and_resumes(self):
+        class _Report:
+            def to_dict(self):
+                return {}
+
+            def summary_lines(self):
+                return []
+
+        ended = datetime.now(timezone.utc) - timedelta(seconds=5)
+        outcomes = [
+            ArxivRateLimitError("HTTP 429", retry_at=ended),
+            {"report_date": "2026-04-01", "report": _Report()},
+        ]
+        with mock.patch.object(desktop_app, "run_pipeline", side_effect=outcomes) as run_mock:
+            exit_code = desktop_app.main([
+                "--run-once",
+                "--target-day", "2026-04-01",
+                "--wait-for-cooldown",
+                "--quiet",
+            ])
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(run_mock.call_count, 2)
+        self.assertIsInstance(run_mock.call_args.kwargs["controller"], desktop_app.PipelineController)
+
     def test_main_without_run_once_starts_gui(self):
         fake_root = mock.Mock()
         with mock.patch.object(desktop_app, "Tk", return_value=fake_root) as tk_mock, \
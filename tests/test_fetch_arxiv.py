@@ -1,24 +1,32 @@
-import sys
+import json
 import tempfile
-import types
+import threading
 import unittest
-from collections import deque
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest import mock
 
-if "feedparser" not in sys.modules:
-    sys.modules["feedparser"] = types.SimpleNamespace(parse=lambda *_args, **_kwargs: None)
-
 import fetch_arxiv
+import http_sessions
+from api_cache import ApiResponseCache
+
+
+def _Feed(entries, items_per_page=None, published=None, total_results=None, payload_bytes=0):
+    rows = [{**entry, "published": published} for entry in entries]
+    return fetch_arxiv.AtomPage(
+        rows=rows,
+        ids=[fetch_arxiv.get_arxiv_id(row) for row in rows],
+        items_per_page=items_per_page,
+        total_results=total_results,
+        payload_bytes=payload_bytes,
+    )
 
 
-class _Feed:
-    def __init__(self, entries, items_per_page=None):
-        self.entries = entries
-        self.feed = {}
-        if items_per_page is not None:
-            self.feed["opensearch_itemsperpage"] = str(items_per_page)
+def _scheduler(min_interval=3.1, per_minute=18):
+    return fetch_arxiv._build_request_scheduler({
+        "api": {"min_interval_sec": min_interval, "per_minute": per_minute, "concurrency": 1},
+        "pdf": {"min_interval_sec": 0.5, "per_minute": 90, "concurrency": 4, "cooldown_sec": 60},
+    })
 
 
 class _Response:
@@ -50,6 +58,23 @@ class FetchArxivTest(unittest.TestCase):
         self._legacy_state_patch.start()
         self.addCleanup(self._state_patch.stop)
         self.addCleanup(self._legacy_state_patch.stop)
+        self.addCleanup(fetch_arxiv._request_state_store.flush)
+        self._scheduler_patch = mock.patch.object(fetch_arxiv, "_request_scheduler", _scheduler())
+        self._scheduler_patch.start()
+        self.addCleanup(self._scheduler_patch.stop)
+        route_cache_patch = mock.patch.object(fetch_arxiv, "_route_cache", fetch_arxiv.RouteCache(ttl_sec=600))
+        route_cache_patch.start()
+        self.addCleanup(route_cache_patch.stop)
+        tracer_patch = mock.patch.object(fetch_arxiv, "_request_tracer", fetch_arxiv.RequestTracer())
+        tracer_patch.start()
+        self.addCleanup(tracer_patch.stop)
+        self._api_cache_patch = mock.patch.object(
+            fetch_arxiv,
+            "_api_cache",
+            ApiResponseCache(Path(self._tmpdir.name) / "api_cache"),
+        )
+        self._api_cache_patch.start()
+        self.addCleanup(self._api_cache_patch.stop)
 
     def test_user_state_dir_prefers_localappdata(self):
         with mock.patch.dict(fetch_arxiv.os.environ, {"LOCALAPPDATA": r"C:\Users\BW\AppData\Local"}, clear=False):
@@ -71,12 +96,13 @@ class FetchArxivTest(unittest.TestCase):
     def test_query_cs_window_uses_submitted_date_range(self):
         captured = {}
 
-        def fake_get(params):
+        def fake_get(params, window_end=None):
             captured.update(params)
+            captured["window_end"] = window_end
             return "<?xml version='1.0'?><feed></feed>"
 
         with mock.patch.object(fetch_arxiv, "_get_with_fallback", side_effect=fake_get), \
-             mock.patch.object(fetch_arxiv.feedparser, "parse", return_value=_Feed([])):
+             mock.patch.object(fetch_arxiv, "parse_atom_page", return_value=_Feed([])):
             fetch_arxiv.query_cs_window(
                 datetime(2026, 5, 28, 4, 0, tzinfo=timezone.utc),
                 datetime(2026, 5, 29, 3, 59, tzinfo=timezone.utc),
@@ -88,6 +114,7 @@ class FetchArxivTest(unittest.TestCase):
         self.assertEqual(captured["max_results"], 50)
         self.assertIn("submittedDate:[202605280400 TO 202605290359]", captured["search_query"])
         self.assertIn("cat:cs.*", captured["search_query"])
+        self.assertEqual(captured["window_end"], datetime(2026, 5, 29, 3, 59, tzinfo=timezone.utc))
 
     def test_iter_recent_cs_has_no_page_count_cap(self):
         page_size = 2
@@ -98,17 +125,13 @@ class FetchArxivTest(unittest.TestCase):
         pages.append(_Feed([{"id": "last"}], items_per_page=page_size))
         starts = []
 
-        def query(_start_utc, _end_utc, start, max_results):
+        def query(_start_utc, _end_utc, start, max_results, seen_ids=None):
             starts.append(start)
             self.assertEqual(max_results, page_size)
             return pages.pop(0)
 
         with mock.patch.object(fetch_arxiv, "MAX_RESULTS_PER_PAGE", page_size), \
-             mock.patch.object(fetch_arxiv, "query_cs_window", side_effect=query), \
-             mock.patch.object(fetch_arxiv, "_entry_to_dict", side_effect=lambda row: {
-                 **row,
-                 "published": datetime(2026, 6, 8, 12, tzinfo=timezone.utc),
-             }):
+             mock.patch.object(fetch_arxiv, "query_cs_window", side_effect=query):
             rows = list(fetch_arxiv.iter_recent_cs_single(
                 start_utc=datetime(2026, 6, 8, 4, tzinfo=timezone.utc),
                 end_utc=datetime(2026, 6, 9, 4, tzinfo=timezone.utc),
@@ -121,8 +144,7 @@ class FetchArxivTest(unittest.TestCase):
         checkpoints = []
         rows = [{"id": "a"}, {"id": "b"}]
         with mock.patch.object(fetch_arxiv, "MAX_RESULTS_PER_PAGE", 200), \
-             mock.patch.object(fetch_arxiv, "query_cs_sorted", return_value=_Feed(rows)), \
-             mock.patch.object(fetch_arxiv, "_entry_to_dict", side_effect=lambda row: {**row, "published": None}):
+             mock.patch.object(fetch_arxiv, "query_cs_sorted", return_value=_Feed(rows)):
             list(fetch_arxiv.iter_recent_cs_single(
                 start_offset=400,
                 on_page_complete=lambda **values: checkpoints.append(values),
@@ -135,18 +157,14 @@ class FetchArxivTest(unittest.TestCase):
         calls = []
         progress = []
 
-        def query(_start_utc, _end_utc, start, max_results):
+        def query(_start_utc, _end_utc, start, max_results, seen_ids=None):
             calls.append((start, max_results))
             if max_results == 2000:
                 raise fetch_arxiv.ArxivServiceUnavailableError("503")
             return _Feed([{"id": "a"}], items_per_page=1000)
 
         with mock.patch.object(fetch_arxiv, "MAX_RESULTS_PER_PAGE", 2000), \
-             mock.patch.object(fetch_arxiv, "query_cs_window", side_effect=query), \
-             mock.patch.object(fetch_arxiv, "_entry_to_dict", side_effect=lambda row: {
-                 **row,
-                 "published": datetime(2026, 6, 15, 12, tzinfo=timezone.utc),
-             }):
+             mock.patch.object(fetch_arxiv, "query_cs_window", side_effect=query):
             rows = list(fetch_arxiv.iter_recent_cs_single(
                 start_utc=datetime(2026, 6, 15, 4, tzinfo=timezone.utc),
                 end_utc=datetime(2026, 6, 16, 4, tzinfo=timezone.utc),
@@ -164,17 +182,14 @@ class FetchArxivTest(unittest.TestCase):
             "cs.LG": _Feed([{"id": "http://arxiv.org/abs/1"}, {"id": "http://arxiv.org/abs/2"}], items_per_page=500),
         }
 
-        def query(category, _start_utc, _end_utc, start, max_results):
+        def query(category, _start_utc, _end_utc, start, max_results, seen_ids=None):
             calls.append((category, start, max_results))
             return rows_by_category[category]
 
         with mock.patch.object(fetch_arxiv, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.CL", "cs.LG"]), \
+             mock.patch.object(fetch_arxiv, "ARXIV_CATEGORY_QUERY_PLAN", "per_category"), \
              mock.patch.object(fetch_arxiv, "MAX_RESULTS_PER_PAGE", 500), \
-             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query), \
-             mock.patch.object(fetch_arxiv, "_entry_to_dict", side_effect=lambda row: {
-                 **row,
-                 "published": datetime(2026, 6, 23, 12, tzinfo=timezone.utc),
-             }):
+             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query):
             rows = list(fetch_arxiv.iter_recent_cs(
                 start_utc=datetime(2026, 6, 23, 4, tzinfo=timezone.utc),
                 end_utc=datetime(2026, 6, 24, 4, tzinfo=timezone.utc),
@@ -183,6 +198,207 @@ class FetchArxivTest(unittest.TestCase):
         self.assertEqual([row["id"] for row in rows], ["http://arxiv.org/abs/1", "http://arxiv.org/abs/2"])
         self.assertEqual([call[0] for call in calls], ["cs.CL", "cs.LG"])
 
+    def test_iter_recent_cs_category_resumes_from_per_category_cursors(self):
+        calls = []
+        pages = {
+            ("cs.CL", 100): _Feed([{"id": "http://arxiv.org/abs/2"}], items_per_page=100, total_results=101),
+            ("cs.LG", 0): _Feed([], items_per_page=100, total_results=0),
+        }
+
+        def query(category, _start_utc, _end_utc, start, max_results, seen_ids=None):
+            calls.append((category, start))
+            return pages[(category, start)]
+
+        checkpoints = []
+        cursors = {
+            "plan": "per_category",
+            "streams": {
+                "cs.AI": {"next_start": 300, "complete": True},
+                "cs.CL": {"next_start": 100, "complete": False},
+            },
+        }
+        with mock.patch.object(fetch_arxiv, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.AI", "cs.CL", "cs.LG"]), \
+             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query):
+            rows = list(fetch_arxiv.iter_recent_cs_by_category(
+                datetime(2026, 6, 23, 4, tzinfo=timezone.utc),
+                datetime(2026, 6, 24, 4, tzinfo=timezone.utc),
+                on_page_complete=lambda **kwargs: checkpoints.append(kwargs["cursors"]),
+                plan_mode="per_category",
+                cursors=cursors,
+            ))
+
+        self.assertEqual([row["id"] for row in rows], ["http://arxiv.org/abs/2"])
+        self.assertEqual(calls, [("cs.CL", 100), ("cs.LG", 0)])
+        self.assertEqual(checkpoints[-1]["streams"], {
+            "cs.AI": {"next_start": 300, "complete": True},
+            "cs.CL": {"next_start": 101, "complete": True},
+            "cs.LG": {"next_start": 0, "complete": True},
+        })
+
+    def test_iter_recent_cs_category_restarts_from_zero_when_the_plan_changed(self):
+        calls = []
+
+        def query(category, _start_utc, _end_utc, start, max_results, seen_ids=None):
+            calls.append((category, start))
+            return _Feed([], items_per_page=100, total_results=0)
+
+        cursors = {"plan": "exclusion", "streams": {"cs.CL": {"next_start": 100, "complete": False}}}
+        with mock.patch.object(fetch_arxiv, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.CL", "cs.LG"]), \
+             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query):
+            list(fetch_arxiv.iter_recent_cs_by_category(
+                datetime(2026, 6, 23, 4, tzinfo=timezone.utc),
+                datetime(2026, 6, 24, 4, tzinfo=timezone.utc),
+                start_offset=100,
+                plan_mode="per_category",
+                cursors=cursors,
+            ))
+
+        self.assertEqual(calls, [("cs.CL", 0), ("cs.LG", 0)])
+
+    def test_iter_recent_cs_auto_plan_resumes_exclusion_without_probing_combined(self):
+        calls = []
+
+        def clause_query(clause, _start_utc, _end_utc, start, max_results, seen_ids=None):
+            calls.append((clause, start))
+            return _Feed([{"id": "http://arxiv.org/abs/3"}], items_per_page=500, total_results=1)
+
+        cursors = {"plan": "exclusion", "streams": {"cs.CL": {"next_start": 40, "complete": True}}}
+        with mock.patch.object(fetch_arxiv, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.CL", "cs.LG"]), \
+             mock.patch.object(fetch_arxiv, "query_clause_window", side_effect=clause_query):
+            list(fetch_arxiv.iter_recent_cs_by_category(
+                datetime(2026, 6, 23, 4, tzinfo=timezone.utc),
+                datetime(2026, 6, 24, 4, tzinfo=timezone.utc),
+                plan_mode="auto",
+                cursors=cursors,
+            ))
+
+        self.assertEqual(calls, [("(cat:cs.LG ANDNOT cat:cs.CL)", 0)])
+
+    def test_iter_recent_cs_combined_plan_fetches_cross_lists_once(self):
+        clauses = []
+        page = _Feed(
+            [
+                {"id": "http://arxiv.org/abs/1", "categories": ["cs.CL", "cs.LG"]},
+                {"id": "http://arxiv.org/abs/2", "categories": ["cs.LG"]},
+            ],
+            items_per_page=500,
+            total_results=2,
+            payload_bytes=4000,
+        )
+
+        def query(clause, _start_utc, _end_utc, start, max_results, seen_ids=None):
+            clauses.append(clause)
+            return page
+
+        plans = []
+        with mock.patch.object(fetch_arxiv, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.CL", "cs.LG"]), \
+             mock.patch.object(fetch_arxiv, "ARXIV_CATEGORY_QUERY_PLAN", "auto"), \
+             mock.patch.object(fetch_arxiv, "query_clause_window", side_effect=query):
+            rows = list(fetch_arxiv.iter_recent_cs(
+                start_utc=datetime(2026, 6, 23, 4, tzinfo=timezone.utc),
+                end_utc=datetime(2026, 6, 24, 4, tzinfo=timezone.utc),
+                on_query_plan=plans.append,
+            ))
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(clauses, ["(cat:cs.CL OR cat:cs.LG)"])
+        self.assertEqual(plans[0]["plan"], "combined")
+        self.assertEqual((plans[0]["requests"], plans[0]["naive_requests"]), (1, 2))
+        self.assertEqual((plans[0]["bytes"], plans[0]["naive_bytes"], plans[0]["bytes_saved"]), (4000, 6000, 2000))
+
+    def test_iter_recent_cs_auto_plan_splits_oversized_combined_query(self):
+        calls = []
+
+        def clause_query(clause, _start_utc, _end_utc, start, max_results, seen_ids=None):
+            calls.append(clause)
+            if clause.startswith("(cat:cs.CL OR"):
+                return _Feed([{"id": "http://arxiv.org/abs/1"}], items_per_page=1, total_results=50)
+            return _Feed([{"id": "http://arxiv.org/abs/2"}], items_per_page=500, total_results=1)
+
+        def category_query(category, _start_utc, _end_utc, start, max_results, seen_ids=None):
+            calls.append(category)
+            return _Feed([{"id": "http://arxiv.org/abs/1"}], items_per_page=500, total_results=1)
+
+        plans = []
+        with mock.patch.object(fetch_arxiv, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.CL", "cs.LG"]), \
+             mock.patch.object(fetch_arxiv, "ARXIV_COMBINED_QUERY_MAX_RESULTS", 10), \
+             mock.patch.object(fetch_arxiv, "query_clause_window", side_effect=clause_query), \
+             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=category_query):
+            rows = list(fetch_arxiv.iter_recent_cs_by_category(
+                datetime(2026, 6, 23, 4, tzinfo=timezone.utc),
+                datetime(2026, 6, 24, 4, tzinfo=timezone.utc),
+                plan_mode="auto",
+                on_query_plan=plans.append,
+                pipelined=False,
+            ))
+
+        self.assertEqual([row["id"] for row in rows], ["http://arxiv.org/abs/1", "http://arxiv.org/abs/2"])
+        self.assertEqual(calls, ["(cat:cs.CL OR cat:cs.LG)", "cs.CL", "(cat:cs.LG ANDNOT cat:cs.CL)"])
+        self.assertEqual((plans[0]["plan"], plans[0]["requests"]), ("exclusion", 3))
+
+    def test_split_window_cuts_inclusive_minute_slices_newest_first(self):
+        start = datetime(2026, 6, 23, 4, tzinfo=timezone.utc)
+        end = datetime(2026, 6, 23, 5, 59, 59, 999999, tzinfo=timezone.utc)
+        slices = fetch_arxiv.split_window(start, end, 3)
+        self.assertEqual(slices, [
+            (datetime(2026, 6, 23, 5, 20, tzinfo=timezone.utc), end),
+            (datetime(2026, 6, 23, 4, 40, tzinfo=timezone.utc), datetime(2026, 6, 23, 5, 19, tzinfo=timezone.utc)),
+            (start, datetime(2026, 6, 23, 4, 39, tzinfo=timezone.utc)),
+        ])
+        self.assertEqual(len(fetch_arxiv.split_window(start, start, 4)), 1)
+
+    def test_iter_recent_cs_category_splits_large_window_into_sub_windows(self):
+        start_utc = datetime(2026, 6, 23, 4, tzinfo=timezone.utc)
+        end_utc = datetime(2026, 6, 24, 3, 59, tzinfo=timezone.utc)
+        calls = []
+
+        def query(category, window_start, window_end, start, max_results, seen_ids=None):
+            calls.append((window_start, window_end, start))
+            if (window_start, window_end) == (start_utc, end_utc):
+                return _Feed([{"id": "http://arxiv.org/abs/0"}], items_per_page=100, total_results=250)
+            return _Feed([{"id": f"http://arxiv.org/abs/{window_start.hour}"}], items_per_page=100, total_results=1)
+
+        checkpoints = []
+        plans = []
+        with mock.patch.object(fetch_arxiv, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.LG"]), \
+             mock.patch.object(fetch_arxiv, "MAX_RESULTS_PER_PAGE", 100), \
+             mock.patch.object(fetch_arxiv, "ARXIV_SUBWINDOW_MAX_PAGES", 2), \
+             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query):
+            rows = list(fetch_arxiv.iter_recent_cs_by_category(
+                start_utc,
+                end_utc,
+                on_page_complete=lambda **kwargs: checkpoints.append(kwargs["cursors"]["streams"]["cs.LG"]),
+                on_query_plan=plans.append,
+                pipelined=False,
+            ))
+
+        self.assertEqual([row["id"] for row in rows], ["http://arxiv.org/abs/20", "http://arxiv.org/abs/12", "http://arxiv.org/abs/4"])
+        self.assertEqual([call[2] for call in calls], [0, 0, 0, 0])
+        self.assertEqual(calls[1][:2], (datetime(2026, 6, 23, 20, tzinfo=timezone.utc), end_utc))
+        self.assertEqual(len(checkpoints[0]["windows"]), 2)
+        self.assertEqual(checkpoints[-1], {"next_start": 1, "complete": True})
+        self.assertEqual((plans[0]["requests"], plans[0]["sub_windows"]), (4, 3))
+
+    def test_iter_recent_cs_category_resumes_at_checkpointed_sub_window(self):
+        calls = []
+        window = ["2026-06-23T04:00:00+00:00", "2026-06-23T11:59:00+00:00"]
+
+        def query(category, window_start, window_end, start, max_results, seen_ids=None):
+            calls.append((window_start.isoformat(), window_end.isoformat(), start))
+            return _Feed([{"id": "http://arxiv.org/abs/5"}], items_per_page=100, total_results=101)
+
+        cursors = {"plan": "per_category", "streams": {"cs.LG": {"next_start": 100, "complete": False, "windows": [window]}}}
+        with mock.patch.object(fetch_arxiv, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.LG"]), \
+             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query):
+            list(fetch_arxiv.iter_recent_cs_by_category(
+                datetime(2026, 6, 23, 4, tzinfo=timezone.utc),
+                datetime(2026, 6, 24, 3, 59, tzinfo=timezone.utc),
+                cursors=cursors,
+                pipelined=False,
+            ))
+
+        self.assertEqual(calls, [(window[0], window[1], 100)])
+
     def test_iter_recent_cs_category_continues_past_100_when_server_pages_at_100(self):
         calls = []
         pages = {
@@ -196,17 +412,13 @@ class FetchArxivTest(unittest.TestCase):
             ),
         }
 
-        def query(category, _start_utc, _end_utc, start, max_results):
+        def query(category, _start_utc, _end_utc, start, max_results, seen_ids=None):
             calls.append((category, start, max_results))
             return pages.get((category, start), _Feed([], items_per_page=100))
 
         with mock.patch.object(fetch_arxiv, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.CL"]), \
              mock.patch.object(fetch_arxiv, "MAX_RESULTS_PER_PAGE", 500), \
-             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query), \
-             mock.patch.object(fetch_arxiv, "_entry_to_dict", side_effect=lambda row: {
-                 **row,
-                 "published": datetime(2026, 6, 23, 12, tzinfo=timezone.utc),
-             }):
+             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query):
             rows = list(fetch_arxiv.iter_recent_cs(
                 start_utc=datetime(2026, 6, 23, 4, tzinfo=timezone.utc),
                 end_utc=datetime(2026, 6, 24, 4, tzinfo=timezone.utc),
@@ -223,17 +435,13 @@ class FetchArxivTest(unittest.TestCase):
             ("cs.CL", 120): _Feed([]),
         }
 
-        def query(category, _start_utc, _end_utc, start, max_results):
+        def query(category, _start_utc, _end_utc, start, max_results, seen_ids=None):
             calls.append((category, start, max_results))
             return pages[(category, start)]
 
         with mock.patch.object(fetch_arxiv, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.CL"]), \
              mock.patch.object(fetch_arxiv, "MAX_RESULTS_PER_PAGE", 500), \
-             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query), \
-             mock.patch.object(fetch_arxiv, "_entry_to_dict", side_effect=lambda row: {
-                 **row,
-                 "published": datetime(2026, 6, 23, 12, tzinfo=timezone.utc),
-             }):
+             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query):
             rows = list(fetch_arxiv.iter_recent_cs(
                 start_utc=datetime(2026, 6, 23, 4, tzinfo=timezone.utc),
                 end_utc=datetime(2026, 6, 24, 4, tzinfo=timezone.utc),
@@ -242,6 +450,127 @@ class FetchArxivTest(unittest.TestCase):
         self.assertEqual(len(rows), 120)
         self.assertEqual([call[1] for call in calls], [0, 100, 120])
 
+    def test_iter_recent_cs_category_stops_at_total_results(self):
+        calls = []
+        pages = {
+            ("cs.CL", 0): _Feed([{"id": f"http://arxiv.org/abs/{index}"} for index in range(100)], items_per_page=100, total_results=200),
+            ("cs.CL", 100): _Feed([{"id": f"http://arxiv.org/abs/{index}"} for index in range(100, 200)], items_per_page=100, total_results=200),
+        }
+
+        def query(category, _start_utc, _end_utc, start, max_results, seen_ids=None):
+            calls.append((category, start))
+            return pages[(category, start)]
+
+        with mock.patch.object(fetch_arxiv, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.CL"]), \
+             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query):
+            rows = list(fetch_arxiv.iter_recent_cs(
+                start_utc=datetime(2026, 6, 23, 4, tzinfo=timezone.utc),
+                end_utc=datetime(2026, 6, 24, 4, tzinfo=timezone.utc),
+            ))
+
+        self.assertEqual(len(rows), 200)
+        self.assertEqual(calls, [("cs.CL", 0), ("cs.CL", 100)])
+
+    def test_iter_recent_cs_category_requests_next_page_while_consumer_works(self):
+        second_requested = threading.Event()
+        pages = {
+            ("cs.CL", 0): _Feed([{"id": "http://arxiv.org/abs/1"}], items_per_page=1, total_results=2),
+            ("cs.CL", 1): _Feed([{"id": "http://arxiv.org/abs/2"}], items_per_page=1, total_results=2),
+        }
+
+        def query(category, _start_utc, _end_utc, start, max_results, seen_ids=None):
+            if start == 1:
+                second_requested.set()
+            return pages[(category, start)]
+
+        overlapped = []
+        checkpoints = []
+        with mock.patch.object(fetch_arxiv, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.CL"]), \
+             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query):
+            for row in fetch_arxiv.iter_recent_cs_by_category(
+                datetime(2026, 6, 23, 4, tzinfo=timezone.utc),
+                datetime(2026, 6, 24, 4, tzinfo=timezone.utc),
+                on_page_complete=lambda **kwargs: checkpoints.append(kwargs["next_start"]),
+                pipelined=True,
+            ):
+                if row["id"].endswith("/1"):
+                    overlapped.append(second_requested.wait(timeout=2))
+
+        self.assertEqual(overlapped, [True])
+        self.assertEqual(checkpoints, [1, 2])
+
+    def test_iter_recent_cs_category_pipelined_reraises_fetch_errors(self):
+        def query(category, _start_utc, _end_utc, start, max_results, seen_ids=None):
+            if start:
+                raise fetch_arxiv.ArxivRateLimitError("429")
+            return _Feed([{"id": "http://arxiv.org/abs/1"}], items_per_page=1)
+
+        rows = []
+        with mock.patch.object(fetch_arxiv, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.CL"]), \
+             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query):
+            with self.assertRaises(fetch_arxiv.ArxivRateLimitError):
+                for row in fetch_arxiv.iter_recent_cs_by_category(
+                    datetime(2026, 6, 23, 4, tzinfo=timezone.utc),
+                    datetime(2026, 6, 24, 4, tzinfo=timezone.utc),
+                    pipelined=True,
+                ):
+                    rows.append(row)
+        self.assertEqual(len(rows), 1)
+
+    def test_learned_page_size_is_reused_by_the_next_run(self):
+        calls = []
+
+        def query(category, _start_utc, _end_utc, start, max_results, seen_ids=None):
+            calls.append(max_results)
+            if max_results > 250:
+                raise fetch_arxiv.ArxivServiceUnavailableError("503")
+            return _Feed([{"id": f"http://arxiv.org/abs/{len(calls)}"}], items_per_page=max_results, total_results=1)
+
+        with mock.patch.object(fetch_arxiv, "ARXIV_PRIMARY_CATEGORY_PREFIXES", ["cs.LG"]), \
+             mock.patch.object(fetch_arxiv, "MAX_RESULTS_PER_PAGE", 500), \
+             mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query):
+            for _ in range(2):
+                list(fetch_arxiv.iter_recent_cs_by_category(
+                    datetime(2026, 6, 23, 4, tzinfo=timezone.utc),
+                    datetime(2026, 6, 24, 4, tzinfo=timezone.utc),
+                    pipelined=False,
+                ))
+        fetch_arxiv._request_state_store.flush()
+
+        # The second run starts at the size that worked instead of retrying 500.
+        self.assertEqual(calls, [500, 250, 250])
+        persisted = json.loads(fetch_arxiv._request_state_path.read_text(encoding="utf-8"))
+        self.assertEqual(persisted["api_page_sizes"], {"cs.LG": 250})
+
+    def test_delta_helpers_probe_one_row_and_skip_known_ids(self):
+        calls = []
+
+        def query(category, start_utc, _end_utc, start, max_results, seen_ids=None):
+            calls.append((category, start_utc.hour, max_results))
+            rows = [{"id": "http://arxiv.org/abs/1"}, {"id": "http://arxiv.org/abs/2"}]
+            kept = [row for row in rows if not seen_ids or fetch_arxiv.get_arxiv_id(row) not in seen_ids]
+            page = _Feed(kept, items_per_page=max_results, total_results=2)
+            page.ids = ["1", "2"]
+            return page
+
+        with mock.patch.object(fetch_arxiv, "query_category_window", side_effect=query):
+            total = fetch_arxiv.probe_category_total(
+                "cs.CL",
+                datetime(2026, 6, 23, 4, tzinfo=timezone.utc),
+                datetime(2026, 6, 24, 4, tzinfo=timezone.utc),
+            )
+            rows = list(fetch_arxiv.iter_category_since(
+                "cs.CL",
+                datetime(2026, 6, 23, 9, tzinfo=timezone.utc),
+                datetime(2026, 6, 24, 4, tzinfo=timezone.utc),
+                known_ids={"1"},
+            ))
+
+        self.assertEqual(total, 2)
+        self.assertEqual([row["id"] for row in rows], ["http://arxiv.org/abs/2"])
+        self.assertEqual(calls[0], ("cs.CL", 4, 1))
+        self.assertEqual(calls[1][:2], ("cs.CL", 9))
+
     def test_iter_recent_cs_raises_when_all_adaptive_page_sizes_503(self):
         with mock.patch.object(fetch_arxiv, "MAX_RESULTS_PER_PAGE", 2000), \
              mock.patch.object(fetch_arxiv, "query_cs_window", side_effect=fetch_arxiv.ArxivServiceUnavailableError("503")):
@@ -252,40 +581,71 @@ class FetchArxivTest(unittest.TestCase):
                 ))
 
     def test_reserve_request_slot_is_global_across_arxiv_hosts(self):
-        original_window = fetch_arxiv._request_start_window
-        original_last = fetch_arxiv._last_request_start_ts
-        fetch_arxiv._request_start_window = deque()
-        fetch_arxiv._last_request_start_ts = 0.0
         sleeps = []
-        try:
-            with mock.patch.object(fetch_arxiv, "RATE_LIMIT_MIN_INTERVAL_SEC", 3.1), \
-                 mock.patch.object(fetch_arxiv, "SESSION_RATE_LIMIT_PER_MIN", 18), \
-                 mock.patch.object(fetch_arxiv, "_persisted_last_request_gap", return_value=None), \
-                 mock.patch.object(fetch_arxiv.time, "monotonic", side_effect=[10.0, 11.0, 13.2]), \
-                 mock.patch.object(fetch_arxiv.time, "sleep", side_effect=sleeps.append):
-                fetch_arxiv._reserve_request_slot("https://arxiv.org/api/query")
-                fetch_arxiv._reserve_request_slot("https://export.arxiv.org/pdf/2606.00001.pdf")
-        finally:
-            fetch_arxiv._request_start_window = original_window
-            fetch_arxiv._last_request_start_ts = original_last
+        with mock.patch.object(fetch_arxiv, "_persisted_last_request_gap", return_value=None), \
+             mock.patch.object(fetch_arxiv.time, "monotonic", side_effect=[10.0, 11.0, 13.2]), \
+             mock.patch.object(fetch_arxiv.time, "sleep", side_effect=sleeps.append):
+            fetch_arxiv._reserve_request_slot("https://arxiv.org/api/query")
+            fetch_arxiv._reserve_request_slot("https://export.arxiv.org/api/query")
 
         self.assertEqual(len(sleeps), 1)
         self.assertAlmostEqual(sleeps[0], 2.1)
+        self.assertEqual(fetch_arxiv.request_wait_stats()["api"]["requests"], 2)
+
+    def test_pdf_downloads_do_not_wait_on_api_lane(self):
+        sleeps = []
+        with mock.patch.object(fetch_arxiv, "_persisted_last_request_gap", return_value=None), \
+             mock.patch.object(fetch_arxiv.time, "monotonic", side_effect=[10.0, 10.1, 10.2, 10.7]), \
+             mock.patch.object(fetch_arxiv.time, "sleep", side_effect=sleeps.append):
+            fetch_arxiv._reserve_request_slot("https://export.arxiv.org/api/query")
+            fetch_arxiv._reserve_request_slot("https://arxiv.org/pdf/2606.00001v1")
+            fetch_arxiv._reserve_request_slot("https://export.arxiv.org/pdf/2606.00002v1")
+
+        self.assertEqual(len(sleeps), 1)
+        self.assertAlmostEqual(sleeps[0], 0.4)
+        stats = fetch_arxiv.request_wait_stats()
+        self.assertEqual(stats["api"]["wait_sec"], 0.0)
+        self.assertEqual(stats["pdf"]["requests"], 2)
+        self.assertAlmostEqual(stats["pdf"]["wait_sec"], 0.4)
+
+    def test_pdf_429_pauses_only_the_pdf_lane(self):
+        session = mock.Mock()
+        session.get.return_value = _Response(status_code=429, headers={"Retry-After": "30"})
+        with mock.patch.object(fetch_arxiv, "_persisted_last_request_gap", return_value=None):
+            fetch_arxiv._guarded_get(session, "https://arxiv.org/pdf/2606.00001v1")
+        pdf_lane = fetch_arxiv._request_scheduler.lane_for("https://export.arxiv.org/pdf/2606.00002v1")
+        api_lane = fetch_arxiv._request_scheduler.lane_for("https://export.arxiv.org/api/query")
+        self.assertGreater(pdf_lane.cooldown_until_ts - fetch_arxiv.time.monotonic(), 25)
+        self.assertEqual(api_lane.cooldown_until_ts, 0.0)
+        self.assertFalse(fetch_arxiv._request_state_path.exists())
 
     def test_reserve_request_slot_enforces_persisted_restart_gap(self):
         fetch_arxiv._write_request_state({
             "last_request_started_at": datetime.now(timezone.utc).isoformat(),
         })
         sleeps = []
-        with mock.patch.object(fetch_arxiv, "RATE_LIMIT_MIN_INTERVAL_SEC", 3.1), \
-             mock.patch.object(fetch_arxiv, "SESSION_RATE_LIMIT_PER_MIN", 18), \
-             mock.patch.object(fetch_arxiv, "_persisted_last_request_gap", side_effect=[0.1, 3.2]), \
+        with mock.patch.object(fetch_arxiv, "_persisted_last_request_gap", side_effect=[0.1, 3.2]), \
              mock.patch.object(fetch_arxiv.time, "monotonic", side_effect=[10.0, 13.2]), \
              mock.patch.object(fetch_arxiv.time, "sleep", side_effect=sleeps.append):
             fetch_arxiv._reserve_request_slot("https://export.arxiv.org/api/query")
         self.assertEqual(len(sleeps), 1)
         self.assertGreater(sleeps[0], 0)
 
+    def test_reserve_request_slot_uses_shared_ledger_instead_of_restart_gap(self):
+        ledger = fetch_arxiv.SharedRateLedger(Path(self._tmpdir.name) / "arxiv_rate_ledger.json")
+        scheduler = fetch_arxiv._build_request_scheduler(
+            {"api": {"min_interval_sec": 3.1, "per_minute": 18, "concurrency": 1}},
+            ledger=ledger,
+        )
+        with mock.patch.object(fetch_arxiv, "_request_scheduler", scheduler), \
+             mock.patch.object(fetch_arxiv, "_persisted_last_request_gap", return_value=0.1) as gap, \
+             mock.patch.object(fetch_arxiv.time, "sleep", side_effect=AssertionError("should not sleep")):
+            fetch_arxiv._reserve_request_slot("https://export.arxiv.org/api/query")
+            described = fetch_arxiv.describe_arxiv_request_state()
+
+        gap.assert_not_called()
+        self.assertEqual(described["rate_ledger"]["arxiv.org:api"]["starts_last_minute"], 1)
+
     def test_guarded_get_does_not_add_post_request_sleep(self):
         session = mock.Mock()
         session.get.return_value = object()
@@ -298,8 +658,35 @@ class FetchArxivTest(unittest.TestCase):
             params=None,
             timeout=fetch_arxiv.REQUEST_TIMEOUT,
             stream=True,
+            headers=None,
         )
 
+    def test_guarded_get_traces_route_connect_time_and_parse_time(self):
+        response = _Response(text="<feed></feed>")
+        response._content = b"<feed></feed>"
+
+        def fake_get(url, **kwargs):
+            http_sessions._thread_connects.seconds = 0.2
+            return response
+
+        session = mock.Mock()
+        session.get.side_effect = fake_get
+        trace_path = Path(self._tmpdir.name) / "request_trace.jsonl"
+        fetch_arxiv.open_request_trace(trace_path)
+        self.addCleanup(fetch_arxiv.close_request_trace)
+        with mock.patch.object(fetch_arxiv, "_PROXY_SESSION", session), \
+             mock.patch.object(fetch_arxiv, "_reserve_request_slot"):
+            fetch_arxiv._guarded_get(session, "https://export.arxiv.org/api/query")
+            with fetch_arxiv.traced_parse():
+                pass
+
+        [record] = [json.loads(line) for line in trace_path.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual((record["request_class"], record["route"], record["status"]), ("api", "proxy", 200))
+        self.assertEqual((record["connect_sec"], record["transfer_bytes"]), (0.2, 13))
+        self.assertIsNotNone(record["parse_sec"])
+        summary = fetch_arxiv.request_trace_summary()
+        self.assertEqual(summary["by_class"]["api"]["routes"], {"proxy": 1})
+
     def test_retry_adapter_has_no_hidden_retries(self):
         session = fetch_arxiv._build_session()
         self.assertEqual(session.get_adapter("https://").max_retries.total, 0)
@@ -323,6 +710,7 @@ class FetchArxivTest(unittest.TestCase):
             params={"a": "b"},
             timeout=(1, 1),
             stream=False,
+            headers=None,
         )
 
     def test_request_with_network_fallback_uses_direct_for_arxiv_pdf(self):
@@ -343,6 +731,7 @@ class FetchArxivTest(unittest.TestCase):
             params=None,
             timeout=(1, 1),
             stream=True,
+            headers=None,
         )
 
     def test_iter_pdf_urls_prefers_extensionless_official_shape_before_legacy_pdf_suffix(self):
@@ -356,6 +745,92 @@ class FetchArxivTest(unittest.TestCase):
             ],
         )
 
+    def test_get_with_fallback_replays_settled_window_from_cache(self):
+        params = {"search_query": "cat:cs.AI", "start": 0, "max_results": 100}
+        payload = "<?xml version='1.0'?><feed><entry/></feed>"
+        settled_end = datetime.now(timezone.utc) - timedelta(days=10)
+        with mock.patch.object(fetch_arxiv, "request_with_network_fallback", return_value=_Response(text=payload)) as request:
+            first = fetch_arxiv._get_with_fallback(params, window_end=settled_end)
+            second = fetch_arxiv._get_with_fallback(dict(params), window_end=settled_end)
+        self.assertEqual(first, payload)
+        self.assertEqual(second, payload)
+        self.assertEqual(request.call_count, 1)
+        self.assertEqual(fetch_arxiv.api_cache_stats()["hits"], 1)
+        cached = fetch_arxiv._api_cache.lookup(params)
+        self.assertGreater(cached.expires_at - cached.fetched_at, 24 * 3600)
+
+    def test_get_with_fallback_revalidates_expired_entry(self):
+        params = {"search_query": "cat:cs.AI", "start": 0, "max_results": 100}
+        payload = "<?xml version='1.0'?><feed></feed>"
+        fetch_arxiv._api_cache.store(params, payload, ttl_sec=0, etag='"v1"')
+        with mock.patch.object(fetch_arxiv, "request_with_network_fallback", return_value=_Response(status_code=304, text="")) as request:
+            text = fetch_arxiv._get_with_fallback(params, window_end=datetime.now(timezone.utc))
+        self.assertEqual(text, payload)
+        self.assertEqual(request.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+        self.assertTrue(fetch_arxiv._api_cache.lookup(params).fresh)
+        self.assertEqual(fetch_arxiv.api_cache_stats()["revalidated"], 1)
+
+    def test_get_with_fallback_skips_endpoint_with_open_breaker(self):
+        endpoints = ["https://dead.example/api/query", "https://export.arxiv.org/api/query"]
+        calls = []
+
+        def request(url, **_kwargs):
+            calls.append(url)
+            if url == endpoints[0]:
+                raise fetch_arxiv.RequestsConnectionError("connect timeout")
+            return _Response(text="<?xml version='1.0'?><feed></feed>")
+
+        with mock.patch.object(fetch_arxiv, "ARXIV_API_ENDPOINTS", endpoints), \
+             mock.patch.object(fetch_arxiv, "ARXIV_API_CACHE_ENABLED", False), \
+             mock.patch.object(fetch_arxiv, "request_with_network_fallback", side_effect=request):
+            for page in range(4):
+                fetch_arxiv._get_with_fallback({"search_query": "cat:cs.AI", "start": page})
+
+        self.assertEqual(calls.count(endpoints[0]), fetch_arxiv.ROUTE_BREAKER_FAILURES)
+        self.assertEqual(calls[-1], endpoints[1])
+        health = fetch_arxiv.describe_arxiv_request_state()["route_health"]
+        self.assertEqual(health[endpoints[0]]["state"], "open")
+        self.assertEqual(health[endpoints[1]]["state"], "closed")
+
+    def test_request_with_network_fallback_remembers_working_route_and_probes_direct(self):
+        direct_session = object()
+        proxy_session = object()
+        proxy_response = _Response()
+        sessions = []
+
+        def guarded_get(session, url, **_kwargs):
+            sessions.append(session)
+            if session is direct_session:
+                raise fetch_arxiv.RequestsConnectionError("connection refused")
+            return proxy_response
+
+        with mock.patch.object(fetch_arxiv, "_HAS_PROXY_FALLBACK", True), \
+             mock.patch.object(fetch_arxiv, "_DIRECT_SESSION", direct_session), \
+             mock.patch.object(fetch_arxiv, "_PROXY_SESSION", proxy_session), \
+             mock.patch.object(fetch_arxiv, "_guarded_get", side_effect=guarded_get), \
+             mock.patch.object(fetch_arxiv, "_schedule_route_probe") as schedule_probe:
+            for _ in range(4):
+                self.assertIs(fetch_arxiv.request_with_network_fallback("https://example.org/paper.pdf"), proxy_response)
+
+        self.assertEqual(sessions, [direct_session] + [proxy_session] * 4)
+        schedule_probe.assert_called_once_with("https://example.org/paper.pdf")
+        stats = fetch_arxiv.route_cache_stats()
+        self.assertEqual((stats["hits"], stats["fallbacks"], stats["bypassed"]), (3, 1, 3))
+        self.assertAlmostEqual(stats["time_saved_sec"], 3 * stats["failed_attempt_sec"], delta=0.005)
+
+        with mock.patch.object(fetch_arxiv.socket, "create_connection") as connect:
+            self.assertTrue(fetch_arxiv._probe_direct_route("https://example.org/paper.pdf"))
+        connect.assert_called_once_with(("example.org", 443), timeout=fetch_arxiv.ROUTE_PROBE_TIMEOUT_SEC)
+        self.assertEqual(fetch_arxiv._route_cache.lookup("example.org"), "example.org:direct")
+        self.assertEqual(fetch_arxiv.route_cache_stats()["recoveries"], 1)
+
+    def test_get_with_fallback_does_not_cache_errors(self):
+        params = {"search_query": "cat:cs.AI"}
+        with mock.patch.object(fetch_arxiv, "request_with_network_fallback", return_value=_Response(status_code=503, text="")):
+            with self.assertRaises(fetch_arxiv.ArxivServiceUnavailableError):
+                fetch_arxiv._get_with_fallback(params)
+        self.assertIsNone(fetch_arxiv._api_cache.lookup(params))
+
     def test_get_with_fallback_stops_immediately_on_429(self):
         response = _Response(status_code=429, text="Rate exceeded.", headers={"Retry-After": "5"})
         with mock.patch.object(fetch_arxiv, "request_with_network_fallback", return_value=response) as request:
@@ -380,6 +855,22 @@ class FetchArxivTest(unittest.TestCase):
         self.assertIn("cooldown_until", state)
         self.assertIn("cooldown_until", str(ctx.exception))
 
+    def test_429_cooldown_is_written_to_disk_before_raising(self):
+        response = _Response(status_code=429, text="Rate exceeded.")
+        with mock.patch.object(fetch_arxiv, "request_with_network_fallback", return_value=response):
+            with self.assertRaises(fetch_arxiv.ArxivRateLimitError):
+                fetch_arxiv._get_with_fallback({"search_query": "cat:cs.AI"})
+        payload = json.loads(fetch_arxiv._request_state_path.read_text(encoding="utf-8"))
+        self.assertIn("cooldown_until", payload)
+        self.assertEqual(payload["consecutive_429"], 1)
+
+    def test_reserve_request_slot_defers_state_write(self):
+        with mock.patch.object(fetch_arxiv, "_request_scheduler", _scheduler(min_interval=0)), \
+             mock.patch.object(fetch_arxiv, "_persisted_last_request_gap", return_value=None):
+            fetch_arxiv._reserve_request_slot("https://export.arxiv.org/api/query")
+        self.assertFalse(fetch_arxiv._request_state_path.exists())
+        self.assertIn("last_request_started_at", fetch_arxiv._read_request_state())
+
     def test_429_cooldown_escalates_for_consecutive_errors(self):
         response = _Response(status_code=429, text="Rate exceeded.")
         with mock.patch.object(fetch_arxiv, "ARXIV_429_COOLDOWN_SEC", 3600), \
@@ -406,8 +897,7 @@ class FetchArxivTest(unittest.TestCase):
     def test_reserve_request_slot_preserves_expired_cooldown_until_success(self):
         expired = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
         fetch_arxiv._write_request_state({"cooldown_until": expired, "consecutive_429": 2})
-        with mock.patch.object(fetch_arxiv, "RATE_LIMIT_MIN_INTERVAL_SEC", 0), \
-             mock.patch.object(fetch_arxiv, "SESSION_RATE_LIMIT_PER_MIN", 18), \
+        with mock.patch.object(fetch_arxiv, "_request_scheduler", _scheduler(min_interval=0)), \
              mock.patch.object(fetch_arxiv, "_persisted_last_request_gap", return_value=None):
             fetch_arxiv._reserve_request_slot("https://export.arxiv.org/api/query")
         state = fetch_arxiv._read_request_state()
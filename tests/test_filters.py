@@ -1,5 +1,6 @@
 import unittest
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+from unittest import mock
 
 from config import LOCAL_TZ
 from filters import (
@@ -7,6 +8,7 @@ from filters import (
     arxiv_previous_day_window,
     in_time_window,
     is_cs,
+    window_is_settled,
 )
 
 
@@ -23,6 +25,12 @@ class FiltersTest(unittest.TestCase):
         self.assertEqual(start_utc.isoformat(), "2026-03-31T04:00:00+00:00")
         self.assertEqual(end_utc.isoformat(), "2026-04-01T03:59:59.999999+00:00")
 
+    def test_window_is_settled_after_settle_hours(self):
+        _start_utc, end_utc = arxiv_day_window(date(2026, 3, 30))
+        with mock.patch("filters.ARXIV_WINDOW_SETTLE_HOURS", 72):
+            self.assertFalse(window_is_settled(end_utc, end_utc + timedelta(hours=71)))
+            self.assertTrue(window_is_settled(end_utc, end_utc + timedelta(hours=72)))
+
     def test_in_time_window_only_uses_published(self):
         start_utc = datetime(2026, 3, 31, 4, 0, 0, tzinfo=timezone.utc)
         end_utc = datetime(2026, 4, 1, 3, 59, 59, tzinfo=timezone.utc)
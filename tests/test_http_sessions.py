@@ -0,0 +1,82 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import http_sessions
+from http_sessions import HttpSessionManager, summarize_pool_stats
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HttpSessionManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        self.server.daemon_threads = True
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/item"
+
+    def test_sequential_requests_reuse_one_connection(self):
+        manager = HttpSessionManager(user_agent="test")
+        session = manager.build_session()
+        for _ in range(3):
+            self.assertEqual(session.get(self.url).text, "ok")
+
+        stats = manager.stats_snapshot()["127.0.0.1"]
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["new_connections"], 1)
+        summary = summarize_pool_stats({}, manager.stats_snapshot())
+        self.assertEqual(summary["reused_connections"], 2)
+        self.assertEqual(summary["hosts"]["127.0.0.1"]["new_connections"], 1)
+
+    def test_idle_connection_is_closed_after_keepalive_timeout(self):
+        manager = HttpSessionManager(user_agent="test", keepalive_idle_sec=5)
+        session = manager.build_session()
+        clock = [100.0]
+        with mock.patch.object(http_sessions.time, "monotonic", side_effect=lambda: clock[0]):
+            session.get(self.url)
+            clock[0] += 6
+            session.get(self.url)
+
+        stats = manager.stats_snapshot()["127.0.0.1"]
+        self.assertEqual(stats["idle_closed"], 1)
+        self.assertEqual(stats["new_connections"], 2)
+
+    def test_pool_size_follows_host_overrides(self):
+        manager = HttpSessionManager(user_agent="test", pool_maxsize=2, pool_maxsize_by_host={"arxiv.org": 6})
+        self.assertEqual(manager.maxsize_for("export.arxiv.org"), 6)
+        self.assertEqual(manager.maxsize_for("example.org"), 2)
+        session = manager.build_session()
+        session.get(self.url)
+        pool = session.get_adapter(self.url).poolmanager.connection_from_url(self.url)
+        self.assertEqual(pool.pool.maxsize, 2)
+
+    def test_summary_skips_hosts_without_new_traffic(self):
+        before = {"a": {"requests": 2, "new_connections": 1, "handshake_sec": 0.2, "idle_closed": 0}}
+        after = {
+            "a": {"requests": 2, "new_connections": 1, "handshake_sec": 0.2, "idle_closed": 0},
+            "b": {"requests": 4, "new_connections": 2, "handshake_sec": 0.3, "idle_closed": 1},
+        }
+        summary = summarize_pool_stats(before, after)
+        self.assertEqual(list(summary["hosts"]), ["b"])
+        self.assertEqual(summary["avg_handshake_ms"], 150.0)
+        self.assertEqual(summary["reused_connections"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import fetch_arxiv
+import metadata_backends
+from metadata_backends import OaiPmhBackend, get_metadata_backend
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+_LAST_PAGE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/"><ListRecords>
+<record><header><identifier>oai:arXiv.org:2606.01790</identifier><datestamp>2026-06-02</datestamp></header>
+<metadata><arXivRaw xmlns="http://arxiv.org/OAI/arXivRaw/"><id>2606.01790</id>
+<version version="v1"><date>Mon, 1 Jun 2026 20:00:00 GMT</date></version>
+<title>Late Paper</title><authors>Eve Park</authors><categories>cs.CV</categories><abstract>x</abstract>
+</arXivRaw></metadata></record>
+<resumptionToken cursor="3" completeListSize="4"></resumptionToken>
+</ListRecords></OAI-PMH>"""
+
+_BAD_TOKEN = b"""<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/"><error code="badResumptionToken">expired</error></OAI-PMH>"""
+
+
+class _OaiStub(BaseHTTPRequestHandler):
+    first_page = (FIXTURES / "arxiv_oai_page.xml").read_bytes()
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        self.server.requests.append(params)
+        if self.server.unavailable:
+            self.server.unavailable -= 1
+            self._send(503, b"retry", {"Retry-After": "0"})
+            return
+        token = params.get("resumptionToken")
+        if token is None:
+            self._send(200, self.first_page)
+        elif token == "6961016|1001":
+            self._send(200, _LAST_PAGE)
+        else:
+            self._send(200, _BAD_TOKEN)
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class OaiPmhBackendTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _OaiStub)
+        self.server.daemon_threads = True
+        self.server.requests = []
+        self.server.unavailable = 0
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        for name in ("_request_state_path", "_legacy_request_state_path"):
+            state_patch = mock.patch.object(fetch_arxiv, name, Path(self._tmpdir.name) / f"{name}.json")
+            state_patch.start()
+            self.addCleanup(state_patch.stop)
+        # Write-behind state must reach the temporary files before they are unpatched.
+        self.addCleanup(fetch_arxiv._request_state_store.flush)
+        scheduler = fetch_arxiv._build_request_scheduler({
+            "oai": {"min_interval_sec": 0.0, "per_minute": 600, "concurrency": 1, "cooldown_sec": 60},
+        })
+        scheduler_patch = mock.patch.object(fetch_arxiv, "_request_scheduler", scheduler)
+        scheduler_patch.start()
+        self.addCleanup(scheduler_patch.stop)
+        self.backend = OaiPmhBackend(
+            endpoint=f"http://127.0.0.1:{self.server.server_address[1]}/oai",
+            set_spec="cs",
+            max_retries=2,
+            until_margin_days=3,
+        )
+        self.start_utc = datetime(2026, 6, 1, tzinfo=timezone.utc)
+        self.end_utc = datetime(2026, 6, 1, 23, 59, 59, tzinfo=timezone.utc)
+
+    def test_harvest_pages_with_resumption_token_and_keeps_window_rows(self):
+        self.server.unavailable = 1
+        pages = []
+        plans = []
+
+        rows = list(self.backend.iter_entries(
+            self.start_utc,
+            self.end_utc,
+            on_page_complete=lambda **kwargs: pages.append(kwargs),
+            on_query_plan=plans.append,
+        ))
+
+        self.assertEqual([row.arxiv_id for row in rows], ["2606.01781v2", "2606.01790v1"])
+        first, retried, second = self.server.requests
+        self.assertEqual(first, retried)
+        self.assertEqual(
+            {key: first[key] for key in ("verb", "metadataPrefix", "set", "from")},
+            {"verb": "ListRecords", "metadataPrefix": "arXivRaw", "set": "cs", "from": "2026-06-01"},
+        )
+        self.assertEqual(first["until"], "2026-06-04")
+        self.assertEqual(second, {"verb": "ListRecords", "resumptionToken": "6961016|1001"})
+        self.assertEqual([(page["current_start"], page["next_start"]) for page in pages], [(0, 3), (3, 4)])
+        self.assertEqual(pages[0]["cursors"]["resumption_token"], "6961016|1001")
+        self.assertTrue(pages[1]["cursors"]["complete"])
+        self.assertEqual(plans[0]["plan"], "oai_pmh")
+        self.assertEqual((plans[0]["requests"], plans[0]["rows"], plans[0]["deleted"], plans[0]["outside_window"]), (2, 2, 1, 1))
+        self.assertEqual(fetch_arxiv._request_scheduler.wait_stats()["oai"]["requests"], 3)
+
+    def test_harvest_resumes_from_checkpointed_token(self):
+        cursors = {"plan": "oai_pmh", "from": "2026-06-01", "until": "2026-06-03", "resumption_token": "6961016|1001", "complete": False}
+        pages = []
+
+        rows = list(self.backend.iter_entries(
+            self.start_utc,
+            self.end_utc,
+            start_offset=3,
+            cursors=cursors,
+            on_page_complete=lambda **kwargs: pages.append(kwargs),
+        ))
+
+        self.assertEqual([row.arxiv_id for row in rows], ["2606.01790v1"])
+        self.assertEqual(self.server.requests, [{"verb": "ListRecords", "resumptionToken": "6961016|1001"}])
+        self.assertEqual((pages[0]["current_start"], pages[0]["next_start"]), (3, 4))
+
+    def test_unbounded_harvest_runs_until_today(self):
+        self.backend.until_margin_days = None
+
+        list(self.backend.iter_entries(self.start_utc, self.end_utc))
+
+        self.assertEqual(self.server.requests[0]["until"], datetime.now(timezone.utc).date().isoformat())
+
+    def test_expired_token_restarts_the_harvest(self):
+        cursors = {"plan": "oai_pmh", "from": "2026-06-01", "until": "2026-06-03", "resumption_token": "stale", "complete": False}
+        plans = []
+
+        rows = list(self.backend.iter_entries(
+            self.start_utc,
+            self.end_utc,
+            start_offset=7,
+            cursors=cursors,
+            on_query_plan=plans.append,
+            seen_ids={"2606.01781v2"},
+        ))
+
+        # The checkpoint already holds 2606.01781v2; the restart does not yield it again.
+        self.assertEqual([row.arxiv_id for row in rows], ["2606.01790v1"])
+        self.assertEqual(self.server.requests[1]["until"], "2026-06-03")
+        self.assertEqual((plans[0]["restarts"], plans[0]["skipped_seen"]), (1, 1))
+
+    def test_get_metadata_backend_rejects_unknown_names(self):
+        self.assertIsInstance(get_metadata_backend("oai_pmh"), OaiPmhBackend)
+        self.assertIsInstance(get_metadata_backend("search_api"), metadata_backends.SearchApiBackend)
+        with self.assertRaises(TypeError):
+            metadata_backends.MetadataBackend()
+        with self.assertRaises(ValueError):
+            get_metadata_backend("sql")
+
+
+if __name__ == "__main__":
+    unittest.main()
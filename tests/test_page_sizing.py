@@ -0,0 +1,45 @@
+import unittest
+
+from page_sizing import PageSizeController
+
+
+class PageSizeControllerTest(unittest.TestCase):
+    def setUp(self):
+        self.stored = {}
+        self.controller = PageSizeController(
+            lambda: self.stored.get("api_page_sizes"),
+            lambda sizes: self.stored.update(api_page_sizes=sizes),
+            minimum=100,
+            step=100,
+            backoff=0.5,
+            grow_after=2,
+        )
+
+    def test_shrinks_multiplicatively_and_grows_additively(self):
+        self.assertEqual(self.controller.size_for("cs.LG", 500), 500)
+        self.assertEqual(self.controller.record_unavailable("cs.LG", 500), 250)
+        self.assertEqual(self.controller.record_unavailable("cs.LG", 250), 125)
+        self.assertEqual(self.controller.record_unavailable("cs.LG", 125), 100)
+        self.assertIsNone(self.controller.record_unavailable("cs.LG", 100))
+
+        self.controller.record_success("cs.LG", 500)
+        self.assertEqual(self.controller.size_for("cs.LG", 500), 100)
+        self.controller.record_success("cs.LG", 500)
+        self.assertEqual(self.controller.size_for("cs.LG", 500), 200)
+        self.assertEqual(self.controller.size_for("cs.CL", 500), 500)
+        self.assertEqual(self.stored["api_page_sizes"], {"cs.LG": 200})
+        self.assertEqual(
+            [(event["event"], event["to"]) for event in self.controller.stats()["history"]],
+            [("shrink", 250), ("shrink", 125), ("shrink", 100), ("grow", 200)],
+        )
+
+    def test_success_at_maximum_records_nothing(self):
+        self.controller.record_success("cs.CL", 500)
+        self.stored["api_page_sizes"] = {"cs.CL": 900, "cs.AI": "bad"}
+        self.assertEqual(self.controller.size_for("cs.CL", 500), 500)
+        self.controller.record_success("cs.CL", 500)
+        self.assertEqual(self.controller.stats()["history"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import unittest
+from datetime import datetime, timezone
+
+from paper import Paper, entry_arxiv_id
+
+
+def _row(**overrides):
+    row = {
+        "id": "http://arxiv.org/abs/2606.01779v1",
+        "title": "Sparse Adapters",
+        "summary": "",
+        "authors": ["Alice Zhang"],
+        "published": datetime(2026, 6, 1, 12, tzinfo=timezone.utc),
+        "updated": None,
+        "primary_category": "cs.CL",
+        "categories": ["cs.CL", "cs.LG"],
+        "comment": "",
+        "journal_ref": "",
+        "links": [
+            {"href": "http://arxiv.org/abs/2606.01779v1", "rel": "alternate", "type": "text/html"},
+            {"href": "http://arxiv.org/pdf/2606.01779v1", "rel": "related", "title": "pdf"},
+        ],
+    }
+    row.update(overrides)
+    return row
+
+
+class PaperTest(unittest.TestCase):
+    def test_from_row_dict_resolves_id_pdf_url_and_interns_categories(self):
+        paper = Paper.from_dict(_row(categories=["".join(["cs.", "LG"])]))
+        self.assertEqual(paper.arxiv_id, "2606.01779v1")
+        self.assertEqual(paper.pdf_url, "http://arxiv.org/pdf/2606.01779v1")
+        self.assertIs(paper.categories[0], sys.intern("cs.LG"))
+        self.assertFalse(hasattr(paper, "__dict__"))
+        self.assertEqual(paper["published"], datetime(2026, 6, 1, 12, tzinfo=timezone.utc))
+        self.assertIsNone(paper.get("links"))
+        with self.assertRaises(KeyError):
+            paper["links"]
+
+    def test_dict_round_trip_uses_iso_dates(self):
+        paper = Paper.from_dict(_row())
+        payload = paper.to_dict()
+        self.assertEqual(payload["published"], "2026-06-01T12:00:00+00:00")
+        self.assertEqual(payload["arxiv_id"], "2606.01779v1")
+        self.assertEqual(payload["pdf_url"], "http://arxiv.org/pdf/2606.01779v1")
+        self.assertEqual(
+            [(link["href"], link["type"]) for link in payload["links"]],
+            [("http://arxiv.org/abs/2606.01779v1", "text/html"), ("http://arxiv.org/pdf/2606.01779v1", "application/pdf")],
+        )
+
+        restored = Paper.from_dict(payload)
+        self.assertEqual(restored, paper)
+        # Manifests written before pdf_url existed only carry links.
+        legacy = {key: value for key, value in payload.items() if key != "pdf_url"}
+        self.assertEqual(Paper.from_dict(legacy).pdf_url, paper.pdf_url)
+        self.assertIs(Paper.from_dict(restored), restored)
+
+    def test_entry_arxiv_id_accepts_plain_dicts(self):
+        self.assertEqual(entry_arxiv_id({"id": "http://arxiv.org/abs/2606.01781v1/"}), "2606.01781v1")
+        self.assertEqual(entry_arxiv_id(Paper.from_dict(_row())), "2606.01779v1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,6 @@
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 from unittest import mock
@@ -12,6 +14,10 @@ class _Response:
         self.content = content
         self.status_code = status_code
         self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
 
     def raise_for_status(self):
         if self.status_code >= 400:
@@ -29,14 +35,11 @@ class PrefetchTest(unittest.TestCase):
             {"id": "http://arxiv.org/abs/1234.5678v1"},
             {"id": "http://arxiv.org/abs/9999.0001v1"},
         ]
-        responses = [_Response(), RuntimeError("dns failure")]
-
         def fake_request(url, timeout=None, stream=False):
             self.assertTrue(stream)
-            response = responses.pop(0) if responses else RuntimeError("dns failure")
-            if isinstance(response, Exception):
-                raise response
-            return response
+            if "1234.5678v1" in url:
+                return _Response()
+            raise RuntimeError("dns failure")
 
         with tempfile.TemporaryDirectory() as tmpdir, \
              mock.patch.object(prefetch, "PDF_CACHE_DIR", tmpdir), \
@@ -57,6 +60,65 @@ class PrefetchTest(unittest.TestCase):
             self.assertTrue(Path(cached["1234.5678v1"]).exists())
             self.assertIn("2026-03-31", cached["1234.5678v1"])
 
+    def test_cache_pdfs_with_stats_downloads_concurrently_and_reports_in_order(self):
+        entries = [{"id": f"http://arxiv.org/abs/2606.0000{index}v1"} for index in range(1, 4)]
+        # Every download waits until all three are in flight, so a serial
+        # engine would break the barrier and fail each paper.
+        barrier = threading.Barrier(3, timeout=5)
+        events = []
+
+        def fake_request(url, timeout=None, stream=False):
+            barrier.wait()
+            if url.endswith("2606.00001v1.pdf"):
+                time.sleep(0.05)
+            return _Response(content=b"x" * 20)
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(prefetch, "PDF_CACHE_DIR", tmpdir), \
+             mock.patch.object(prefetch, "MIN_PDF_BYTES", 1), \
+             mock.patch.object(prefetch, "request_with_network_fallback", side_effect=fake_request), \
+             mock.patch.object(prefetch, "iter_pdf_urls", side_effect=lambda aid: [f"https://example/{aid}.pdf"]):
+            cached, stats = prefetch.cache_pdfs_with_stats(
+                entries,
+                report_date="2026-06-01",
+                progress_callback=lambda *event: events.append(event),
+                max_workers=3,
+            )
+
+        self.assertEqual(stats["downloaded"], 3)
+        self.assertEqual(list(cached), ["2606.00001v1", "2606.00002v1", "2606.00003v1"])
+        self.assertEqual(
+            [event[1] for event in events if "下载完成" in event[1]],
+            ["下载完成: 2606.00001v1", "下载完成: 2606.00002v1", "下载完成: 2606.00003v1"],
+        )
+        self.assertEqual([event[3] for event in events], sorted(event[3] for event in events))
+
+    def test_cache_pdfs_with_stats_limits_in_flight_downloads_per_host(self):
+        entries = [{"id": f"http://arxiv.org/abs/2606.0000{index}v1"} for index in range(1, 7)]
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def fake_request(url, timeout=None, stream=False):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+            return _Response(content=b"x" * 20)
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(prefetch, "PDF_CACHE_DIR", tmpdir), \
+             mock.patch.object(prefetch, "MIN_PDF_BYTES", 1), \
+             mock.patch.object(prefetch, "PDF_DOWNLOADS_PER_HOST", 2), \
+             mock.patch.object(prefetch, "_host_slots", {}), \
+             mock.patch.object(prefetch, "request_with_network_fallback", side_effect=fake_request), \
+             mock.patch.object(prefetch, "iter_pdf_urls", side_effect=lambda aid: [f"https://arxiv.org/pdf/{aid}"]):
+            cached, stats = prefetch.cache_pdfs_with_stats(entries, report_date="2026-06-01", max_workers=6)
+
+        self.assertEqual(stats["downloaded"], 6)
+        self.assertEqual(in_flight[1], 2)
+
     def test_cache_pdfs_with_stats_prefers_official_pdf_link_from_entry(self):
         entry = {
             "id": "http://arxiv.org/abs/1234.5678v1",
@@ -138,6 +200,23 @@ class PrefetchTest(unittest.TestCase):
                 {"id": "http://arxiv.org/abs/1234.5678v1"}
             ], controller=controller)
 
+    def test_cache_pdfs_with_stats_cancels_in_flight_downloads(self):
+        controller = PipelineController()
+        entries = [{"id": f"http://arxiv.org/abs/2606.0000{index}v1"} for index in range(1, 5)]
+
+        def fake_request(url, timeout=None, stream=False):
+            controller.cancel()
+            return _Response(content=b"x" * 20)
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(prefetch, "PDF_CACHE_DIR", tmpdir), \
+             mock.patch.object(prefetch, "MIN_PDF_BYTES", 1), \
+             mock.patch.object(prefetch, "request_with_network_fallback", side_effect=fake_request), \
+             mock.patch.object(prefetch, "iter_pdf_urls", side_effect=lambda aid: [f"https://example/{aid}.pdf"]):
+            with self.assertRaises(PipelineCancelled):
+                prefetch.cache_pdfs_with_stats(entries, report_date="2026-06-01", controller=controller, max_workers=2)
+            self.assertFalse(any((Path(tmpdir) / "2026-06-01").glob("*.part")))
+
     def test_cache_pdfs_with_stats_skips_small_content_length_without_download(self):
         entry = {"id": "http://arxiv.org/abs/1234.5678v1"}
         response = _Response(content=b"x" * 20, headers={"Content-Length": "20"})
@@ -153,6 +232,26 @@ class PrefetchTest(unittest.TestCase):
         self.assertEqual(cached, {})
         self.assertEqual(stats["skipped_small"], 1)
         response.iter_content.assert_not_called()
+        self.assertTrue(response.closed)
+
+    def test_download_document_closes_the_response_and_drops_the_part_file_on_errors(self):
+        controller = PipelineController()
+        controller.cancel()
+        failing = _Response(status_code=503)
+        cancelled = _Response(content=b"x" * 20)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            target = Path(tmpdir) / "1234.5678v1.pdf"
+            with mock.patch.object(prefetch, "request_with_network_fallback", return_value=failing):
+                with self.assertRaises(RuntimeError):
+                    prefetch._download_document("https://example/1234.5678v1.pdf", "pdf", target, None)
+            with mock.patch.object(prefetch, "request_with_network_fallback", return_value=cancelled):
+                with self.assertRaises(PipelineCancelled):
+                    prefetch._download_document("https://example/1234.5678v1.pdf", "pdf", target, controller)
+
+            self.assertEqual(list(Path(tmpdir).iterdir()), [])
+        self.assertTrue(failing.closed)
+        self.assertTrue(cancelled.closed)
 
     def test_cache_pdfs_with_stats_discards_small_download_without_length(self):
         entry = {"id": "http://arxiv.org/abs/1234.5678v1"}
@@ -0,0 +1,46 @@
+import unittest
+
+from arxiv_atom import AtomPage
+from query_planner import QueryPlanStats, exclusion_streams, initial_plan
+
+
+class QueryPlannerTest(unittest.TestCase):
+    def test_exclusion_streams_skip_earlier_categories(self):
+        streams = exclusion_streams(["cs.AI", "cs.CL", "cs.LG"])
+        self.assertEqual(
+            [stream.clause for stream in streams],
+            ["cat:cs.AI", "(cat:cs.CL ANDNOT cat:cs.AI)", "(cat:cs.LG ANDNOT (cat:cs.AI OR cat:cs.CL))"],
+        )
+        self.assertEqual(streams[0].single_category, "cs.AI")
+        self.assertIsNone(streams[1].single_category)
+
+    def test_single_category_always_uses_plain_query(self):
+        plan, streams = initial_plan(["cs.CL"], "auto")
+        self.assertEqual(plan, "per_category")
+        self.assertEqual(streams[0].single_category, "cs.CL")
+        with self.assertRaises(ValueError):
+            initial_plan(["cs.CL", "cs.LG"], "fastest")
+
+    def test_naive_estimate_counts_every_listed_category(self):
+        stats = QueryPlanStats(["cs.AI", "cs.CL", "cs.LG"], page_size=2)
+        rows = [
+            {"categories": ["cs.AI", "cs.CL", "cs.LG"]},
+            {"categories": ["cs.CL", "math.OC"]},
+            {"categories": ["cs.CL"]},
+        ]
+        stats.record_page(AtomPage(rows=rows, ids=["1", "2", "3"], payload_bytes=3000))
+        summary = stats.summary()
+        # cs.AI 1 row, cs.CL 3 rows (2 pages), cs.LG 1 row.
+        self.assertEqual(summary["naive_requests"], 4)
+        self.assertEqual(summary["naive_bytes"], 5000)
+        self.assertEqual(summary["requests_saved"], 3)
+        self.assertEqual(summary["bytes_saved"], 2000)
+
+    def test_summary_carries_recorded_category_totals(self):
+        stats = QueryPlanStats(["cs.AI", "cs.CL"], page_size=2)
+        stats.record_total("cs.AI", 42)
+        self.assertEqual(stats.summary()["totals"], {"cs.AI": 42})
+
+
+if __name__ == "__main__":
+    unittest.main()
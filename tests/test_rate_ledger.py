@@ -0,0 +1,151 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from rate_ledger import SharedRateLedger, _file_lock
+from request_scheduler import RateLimitPolicy, RequestScheduler
+
+LANE = "arxiv.org:api"
+
+
+class SharedRateLedgerTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.path = Path(self._tmpdir.name) / "ledger.json"
+        self.now = 1000.0
+
+    def _ledger(self):
+        return SharedRateLedger(self.path, stale_grace_sec=5.0, clock=lambda: self.now)
+
+    def test_processes_share_the_minimum_interval_and_queue_in_order(self):
+        first, second = self._ledger(), self._ledger()
+        self.assertEqual(first.try_start(LANE, 3.0, 20, "a:1", since=1000.0), 0.0)
+
+        self.now = 1001.0
+        self.assertAlmostEqual(second.try_start(LANE, 3.0, 20, "b:1", since=1001.0), 2.0)
+        self.now = 1001.5
+        self.assertAlmostEqual(first.try_start(LANE, 3.0, 20, "a:2", since=1001.5), 1.5)
+
+        # The slot is open, but the second process has been waiting longer.
+        self.now = 1003.0
+        self.assertAlmostEqual(first.try_start(LANE, 3.0, 20, "a:2", since=1001.5), 0.05)
+        self.assertEqual(second.try_start(LANE, 3.0, 20, "b:1", since=1001.0), 0.0)
+        self.now = 1006.0
+        self.assertEqual(first.try_start(LANE, 3.0, 20, "a:2", since=1001.5), 0.0)
+
+        self.assertEqual(first.snapshot()[LANE], {"starts_last_minute": 3, "waiting": 0, "cooldown_sec": 0.0})
+
+    def test_per_minute_budget_counts_every_process(self):
+        first, second = self._ledger(), self._ledger()
+        self.assertEqual(first.try_start(LANE, 0.0, 2, "a:1", since=self.now), 0.0)
+        self.now += 10
+        self.assertEqual(second.try_start(LANE, 0.0, 2, "b:1", since=self.now), 0.0)
+        self.now += 10
+
+        self.assertAlmostEqual(first.try_start(LANE, 0.0, 2, "a:2", since=self.now), 40.0)
+
+    def test_waiter_that_stops_checking_in_is_dropped(self):
+        first, second = self._ledger(), self._ledger()
+        first.try_start(LANE, 3.0, 20, "a:1", since=self.now)
+        self.now += 1
+        self.assertAlmostEqual(second.try_start(LANE, 3.0, 20, "dead:1", since=self.now), 2.0)
+
+        self.now += 2.5
+        self.assertGreater(first.try_start(LANE, 3.0, 20, "a:2", since=self.now), 0.0)
+        self.now += 5
+        self.assertEqual(first.try_start(LANE, 3.0, 20, "a:2", since=self.now - 5), 0.0)
+
+    def test_cooldown_is_shared(self):
+        self._ledger().note_cooldown("arxiv.org:oai", 30)
+        self.now += 10
+
+        self.assertAlmostEqual(self._ledger().try_start("arxiv.org:oai", 0.0, 20, "b:1", since=self.now), 20.0)
+        self.assertEqual(self._ledger().snapshot()["arxiv.org:oai"]["cooldown_sec"], 20.0)
+
+    def test_unreadable_ledger_starts_fresh(self):
+        self.path.write_text("{not json", encoding="utf-8")
+
+        self.assertEqual(self._ledger().try_start(LANE, 3.0, 20, "a:1", since=self.now), 0.0)
+        self.assertEqual(self._ledger().snapshot()[LANE]["starts_last_minute"], 1)
+
+    def test_ledger_is_replaced_whole_and_kept_when_a_write_fails(self):
+        ledger = self._ledger()
+        ledger.try_start(LANE, 3.0, 20, "a:1", since=self.now)
+        before = self.path.read_text(encoding="utf-8")
+
+        self.now += 5
+        with mock.patch.object(Path, "replace", side_effect=OSError("disk full")):
+            self.assertEqual(ledger.try_start(LANE, 3.0, 20, "a:2", since=self.now), 0.0)
+
+        self.assertEqual(self.path.read_text(encoding="utf-8"), before)
+        self.assertEqual(list(self.path.parent.glob("*.part")), [])
+        self.assertEqual(ledger.snapshot()[LANE]["starts_last_minute"], 1)
+
+    def test_snapshot_of_a_missing_ledger_creates_nothing(self):
+        self.assertEqual(self._ledger().snapshot(), {})
+        self.assertEqual(list(self.path.parent.iterdir()), [])
+
+    def test_snapshot_waits_for_the_ledger_lock(self):
+        ledger = self._ledger()
+        ledger.try_start(LANE, 3.0, 20, "a:1", since=self.now)
+        snapshots = []
+
+        with _file_lock(ledger.lock_path):
+            reader = threading.Thread(target=lambda: snapshots.append(ledger.snapshot()))
+            reader.start()
+            reader.join(0.2)
+            self.assertEqual(snapshots, [])
+        reader.join(5)
+
+        self.assertEqual(snapshots[0][LANE]["starts_last_minute"], 1)
+
+
+class SharedSchedulerTest(unittest.TestCase):
+    def test_schedulers_in_separate_processes_space_their_requests(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "ledger.json"
+            policies = {"api": RateLimitPolicy(min_interval_sec=0.2, per_minute=60)}
+            # Separate ledger objects only meet through the OS file lock, as two processes would.
+            schedulers = [
+                RequestScheduler(policies, lambda url: "api", ledger=SharedRateLedger(path), shared_classes=["api"])
+                for _ in range(2)
+            ]
+            starts = []
+            starts_lock = threading.Lock()
+
+            def run(scheduler):
+                lane = scheduler.lane_for("https://export.arxiv.org/api/query")
+                for _ in range(2):
+                    scheduler.reserve(lane)
+                    with starts_lock:
+                        starts.append(time.time())
+
+            threads = [threading.Thread(target=run, args=(scheduler,)) for scheduler in schedulers]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        starts.sort()
+        self.assertEqual(len(starts), 4)
+        for previous, current in zip(starts, starts[1:]):
+            self.assertGreaterEqual(current - previous, 0.18)
+        self.assertLess(starts[-1] - starts[0], 1.5)
+
+    def test_unshared_classes_skip_the_ledger(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ledger = SharedRateLedger(Path(tmpdir) / "ledger.json")
+            scheduler = RequestScheduler({"pdf": RateLimitPolicy()}, lambda url: "pdf", ledger=ledger, shared_classes=["api"])
+            lane = scheduler.lane_for("https://arxiv.org/pdf/2606.00001v1")
+
+            self.assertFalse(scheduler.shares(lane))
+            scheduler.reserve(lane)
+            self.assertFalse(ledger.path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
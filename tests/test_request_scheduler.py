@@ -0,0 +1,63 @@
+import unittest
+from unittest import mock
+
+import request_scheduler
+from request_scheduler import RateLimitPolicy, RequestScheduler, wait_stats_delta
+
+
+def _classify(url):
+    return "pdf" if "/pdf/" in url else "api"
+
+
+class RequestSchedulerTest(unittest.TestCase):
+    def test_arxiv_mirrors_share_one_lane_per_class(self):
+        scheduler = RequestScheduler({"api": RateLimitPolicy(), "pdf": RateLimitPolicy(concurrency=4)}, _classify)
+        api = scheduler.lane_for("https://export.arxiv.org/api/query")
+        self.assertIs(api, scheduler.lane_for("https://arxiv.org/api/query"))
+        pdf = scheduler.lane_for("https://arxiv.org/pdf/2606.00001v1")
+        self.assertIsNot(api, pdf)
+        self.assertEqual(pdf.key, "arxiv.org:pdf")
+        self.assertIsNot(pdf, scheduler.lane_for("https://example.org/pdf/2606.00001v1"))
+
+    def test_per_minute_budget_blocks_until_window_slides(self):
+        scheduler = RequestScheduler({"api": RateLimitPolicy(per_minute=2)}, _classify)
+        lane = scheduler.lane_for("https://export.arxiv.org/api/query")
+        sleeps = []
+        with mock.patch.object(request_scheduler.time, "monotonic", side_effect=[0.0, 1.0, 2.0, 60.0]), \
+             mock.patch.object(request_scheduler.time, "sleep", side_effect=sleeps.append):
+            for _ in range(3):
+                scheduler.reserve(lane)
+        self.assertEqual(sleeps, [58.0])
+        self.assertEqual(scheduler.wait_stats()["api"], {"requests": 3, "wait_sec": 58.0, "max_wait_sec": 58.0})
+
+    def test_wait_stats_delta_reports_only_new_requests(self):
+        before = {"api": {"requests": 4, "wait_sec": 9.0, "max_wait_sec": 3.0}}
+        after = {
+            "api": {"requests": 4, "wait_sec": 9.0, "max_wait_sec": 3.0},
+            "pdf": {"requests": 10, "wait_sec": 2.5, "max_wait_sec": 0.5},
+        }
+        self.assertEqual(
+            wait_stats_delta(before, after),
+            {"pdf": {"requests": 10, "wait_sec": 2.5, "avg_wait_sec": 0.25, "max_wait_sec": 0.5}},
+        )
+
+    def test_max_wait_covers_only_the_span_after_a_reset(self):
+        scheduler = RequestScheduler({"api": RateLimitPolicy(min_interval_sec=3.0)}, _classify)
+        lane = scheduler.lane_for("https://export.arxiv.org/api/query")
+        with mock.patch.object(request_scheduler.time, "monotonic", side_effect=[100.0, 100.0, 103.0, 110.0, 111.0, 113.0]), \
+             mock.patch.object(request_scheduler.time, "sleep"):
+            scheduler.reserve(lane)
+            scheduler.reserve(lane)
+            before = scheduler.wait_stats(reset_max=True)
+            scheduler.reserve(lane)
+            scheduler.reserve(lane)
+
+        self.assertEqual(before["api"]["max_wait_sec"], 3.0)
+        self.assertEqual(
+            wait_stats_delta(before, scheduler.wait_stats()),
+            {"api": {"requests": 2, "wait_sec": 2.0, "avg_wait_sec": 1.0, "max_wait_sec": 2.0}},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
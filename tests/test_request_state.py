@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from request_state import RequestStateStore, merge_request_states
+
+
+class RequestStateStoreTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.primary = Path(self._tmpdir.name) / "state.json"
+        self.legacy = Path(self._tmpdir.name) / "legacy" / "state.json"
+        self.store = RequestStateStore(
+            lambda: [self.primary, self.legacy],
+            lambda: [self.primary, self.legacy],
+            flush_delay_sec=3600,
+        )
+        self.addCleanup(self.store.flush)
+
+    def test_snapshot_rereads_only_when_file_changes(self):
+        self.primary.write_text(json.dumps({"consecutive_429": 1}), encoding="utf-8")
+        self.assertEqual(self.store.snapshot()["consecutive_429"], 1)
+        with mock.patch("request_state._read_json_file") as read_mock:
+            self.store.snapshot()
+            self.store.snapshot()
+        read_mock.assert_not_called()
+
+        self.primary.write_text(json.dumps({"consecutive_429": 3}), encoding="utf-8")
+        stat = self.primary.stat()
+        os.utime(self.primary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(self.store.snapshot()["consecutive_429"], 3)
+
+    def test_updates_are_batched_until_flush(self):
+        for index in range(5):
+            self.store.update({"last_request_started_at": f"2026-06-01T00:00:0{index}+00:00"})
+        self.assertFalse(self.primary.exists())
+        self.assertEqual(self.store.snapshot()["last_request_started_at"], "2026-06-01T00:00:04+00:00")
+
+        self.store.flush()
+
+        self.assertEqual(self.store.disk_writes, 1)
+        self.assertEqual(
+            json.loads(self.legacy.read_text(encoding="utf-8"))["last_request_started_at"],
+            "2026-06-01T00:00:04+00:00",
+        )
+
+    def test_durable_update_is_written_before_returning(self):
+        self.store.update({"cooldown_until": "2026-06-01T02:00:00+00:00"}, durable=True)
+        payload = json.loads(self.primary.read_text(encoding="utf-8"))
+        self.assertEqual(payload["cooldown_until"], "2026-06-01T02:00:00+00:00")
+
+    def test_pending_removal_wins_over_stale_disk_copy(self):
+        self.primary.write_text(json.dumps({"cooldown_until": "2026-06-01T02:00:00+00:00"}), encoding="utf-8")
+        self.store.update(remove=("cooldown_until",))
+        self.legacy.parent.mkdir(parents=True, exist_ok=True)
+        self.legacy.write_text(json.dumps({"last_429_at": "2026-06-01T00:00:00+00:00"}), encoding="utf-8")
+
+        state = self.store.snapshot()
+
+        self.assertNotIn("cooldown_until", state)
+        self.assertEqual(state["last_429_at"], "2026-06-01T00:00:00+00:00")
+
+    def test_update_without_changes_does_not_dirty_store(self):
+        self.store.update(remove=("cooldown_until",))
+        self.store.flush()
+        self.assertEqual(self.store.disk_writes, 0)
+
+    def test_unflushed_changes_win_over_a_disk_copy_written_meanwhile(self):
+        self.primary.write_text(json.dumps({"consecutive_429": 2, "api_page_sizes": {"old": 100}}), encoding="utf-8")
+        self.store.snapshot()
+        self.store.update({"consecutive_429": 0, "api_page_sizes": {"new": 200}})
+        # Another process rewrites the file before this one flushes.
+        self.primary.write_text(json.dumps({"consecutive_429": 3, "api_page_sizes": {"old": 100}, "route_health": {"a": 1}}), encoding="utf-8")
+        stat = self.primary.stat()
+        os.utime(self.primary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        state = self.store.snapshot()
+
+        self.assertEqual((state["consecutive_429"], state["api_page_sizes"]), (0, {"new": 200}))
+        self.assertEqual(state["route_health"], {"a": 1})
+
+    def test_pending_changes_go_to_the_paths_they_were_made_against(self):
+        other = Path(self._tmpdir.name) / "other" / "state.json"
+        paths = [self.primary]
+        store = RequestStateStore(lambda: list(paths), lambda: list(paths), flush_delay_sec=3600)
+        store.update({"route_health": {"test": 1}})
+
+        paths[:] = [other]
+        store.update({"api_page_sizes": {"other": 50}})
+        store.flush()
+
+        self.assertEqual(json.loads(self.primary.read_text(encoding="utf-8")), {"route_health": {"test": 1}})
+        self.assertEqual(json.loads(other.read_text(encoding="utf-8")), {"api_page_sizes": {"other": 50}})
+
+    def test_merge_keeps_unknown_keys_from_first_copy(self):
+        merged = merge_request_states([
+            {"cooldown_until": "2026-06-01T01:00:00+00:00", "extra": "primary"},
+            {"cooldown_until": "2026-06-01T03:00:00+00:00", "extra": "legacy"},
+        ])
+        self.assertEqual(merged["cooldown_until"], "2026-06-01T03:00:00+00:00")
+        self.assertEqual(merged["extra"], "primary")
+
+
+if __name__ == "__main__":
+    unittest.main()
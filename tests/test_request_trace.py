@@ -0,0 +1,115 @@
+import json
+import tempfile
+import threading
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+from request_trace import RequestTracer, percentile, summarize_trace
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class RequestTracerTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.path = Path(self._tmpdir.name) / "request_trace.jsonl"
+        self.clock = _Clock()
+        self.tracer = RequestTracer(clock=self.clock)
+        self.tracer.open(self.path)
+        self.addCleanup(self.tracer.close)
+
+    def _records(self):
+        return [json.loads(line) for line in self.path.read_text(encoding="utf-8").splitlines()]
+
+    def test_api_request_records_timing_breakdown_and_parse_time(self):
+        record = self.tracer.begin("https://export.arxiv.org/api/query", "api", "direct", queued_at=97.0)
+        self.clock.now = 101.5
+        response = SimpleNamespace(status_code=200, _content=b"x" * 2048, elapsed=timedelta(seconds=1.2))
+        self.tracer.received(record, response, connect_sec=0.25, ttfb_sec=1.2, stream=False)
+        with self.tracer.parsing():
+            self.clock.now = 101.8
+
+        [written] = self._records()
+        self.assertEqual(written["request_class"], "api")
+        self.assertEqual(written["route"], "direct")
+        self.assertEqual(written["status"], 200)
+        self.assertEqual(written["limiter_wait_sec"], 3.0)
+        self.assertEqual(written["connect_sec"], 0.25)
+        self.assertEqual(written["ttfb_sec"], 1.2)
+        self.assertEqual(written["transfer_bytes"], 2048)
+        self.assertEqual(written["transfer_sec"], 0.3)
+        self.assertEqual(written["duration_sec"], 1.5)
+        self.assertEqual(written["parse_sec"], 0.3)
+
+    def test_streamed_download_is_closed_after_its_body_is_read(self):
+        record = self.tracer.begin("https://arxiv.org/pdf/2606.00001v1", "pdf", "proxy", queued_at=100.0)
+        self.clock.now = 100.4
+        self.tracer.received(record, SimpleNamespace(status_code=200), connect_sec=0.0, ttfb_sec=0.4, stream=True)
+        self.assertEqual(self._records(), [])
+
+        self.clock.now = 102.4
+        self.tracer.note_transferred(3_000_000)
+
+        [written] = self._records()
+        self.assertEqual((written["transfer_bytes"], written["transfer_sec"], written["duration_sec"]), (3_000_000, 2.0, 2.4))
+        self.assertIsNone(written["parse_sec"])
+
+    def test_failed_request_and_cache_hit_do_not_borrow_parse_time(self):
+        record = self.tracer.begin("https://arxiv.org/pdf/x", "pdf", "direct", queued_at=100.0)
+        self.clock.now = 110.0
+        self.tracer.failed(record, ConnectionError("blackholed"), connect_sec=10.0)
+        self.tracer.detach()
+        with self.tracer.parsing():
+            self.clock.now = 111.0
+
+        [written] = self._records()
+        self.assertEqual((written["error"], written["status"], written["duration_sec"]), ("ConnectionError", None, 10.0))
+        self.assertIsNone(written["parse_sec"])
+
+    def test_records_are_kept_per_thread_and_summarized_since_a_position(self):
+        self.tracer.begin("https://arxiv.org/html/a", "html", "direct", queued_at=100.0)
+        start = self.tracer.position()
+
+        def request():
+            record = self.tracer.begin("https://arxiv.org/pdf/b", "pdf", "direct", queued_at=100.0)
+            self.tracer.received(record, SimpleNamespace(status_code=404), connect_sec=0.0, ttfb_sec=0.1, stream=False)
+
+        thread = threading.Thread(target=request)
+        thread.start()
+        thread.join()
+
+        summary = self.tracer.summary(start)
+        self.assertEqual(summary["requests"], 1)
+        self.assertEqual(summary["by_class"]["pdf"]["status"], {"404": 1})
+        self.assertEqual(len(self._records()), 2)
+
+    def test_summary_reports_percentiles_per_request_class(self):
+        records = [
+            {"request_class": "api", "route": "direct", "status": 200, "ttfb_sec": value / 10, "transfer_bytes": 100}
+            for value in range(1, 11)
+        ]
+        records.append({"request_class": "api", "route": "proxy", "status": None, "error": "ProxyError", "duration_sec": 5.0})
+
+        summary = summarize_trace(records)
+
+        api = summary["by_class"]["api"]
+        self.assertEqual(summary["requests"], 11)
+        self.assertEqual(api["routes"], {"direct": 10, "proxy": 1})
+        self.assertEqual(api["status"], {"200": 10, "ProxyError": 1})
+        self.assertEqual((api["errors"], api["bytes"]), (1, 1000))
+        self.assertEqual(api["ttfb_sec"], {"p50": 0.5, "p90": 0.9, "p99": 1.0, "max": 1.0, "total": 5.5})
+        self.assertEqual(api["duration_sec"]["p50"], 5.0)
+        self.assertEqual(percentile([3.0], 0.99), 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
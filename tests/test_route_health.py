@@ -0,0 +1,77 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from route_health import RouteCache, RouteHealth
+
+
+class RouteHealthTest(unittest.TestCase):
+    def setUp(self):
+        self.stored = {}
+        self.now = datetime(2026, 6, 1, 12, tzinfo=timezone.utc)
+        self.health = self._health()
+
+    def _health(self):
+        return RouteHealth(
+            lambda: self.stored.get("route_health"),
+            lambda routes: self.stored.update(route_health=routes),
+            failure_threshold=2,
+            open_sec=60,
+            smoothing=0.5,
+            clock=lambda: self.now,
+        )
+
+    def test_orders_measured_routes_by_latency_before_unmeasured_ones(self):
+        self.assertEqual(self.health.order(["a", "b", "c"]), ["a", "b", "c"])
+
+        self.health.record_success("c", 0.2)
+        self.health.record_success("b", 0.05)
+        self.health.record_success("b", 0.15)
+
+        self.assertEqual(self.stored["route_health"]["b"]["latency_ms"], 100.0)
+        self.assertEqual(self.health.order(["a", "b", "c"]), ["b", "c", "a"])
+
+    def test_breaker_opens_after_repeated_failures_and_half_opens_later(self):
+        self.health.record_success("direct", 0.01)
+        self.health.record_failure("direct")
+        self.assertEqual(self.health.order(["direct", "proxy"]), ["direct", "proxy"])
+        self.health.record_failure("direct")
+
+        self.assertEqual(self.health.order(["direct", "proxy"]), ["proxy"])
+        self.assertEqual(self.health.snapshot()["direct"]["state"], "open")
+        # With every route open the breaker does not leave nothing to try.
+        self.assertEqual(self.health.order(["direct"]), ["direct"])
+
+        # A later run reads the persisted state.
+        self.now += timedelta(seconds=61)
+        later = self._health()
+        self.assertEqual(later.snapshot()["direct"]["state"], "half_open")
+        self.assertEqual(later.order(["direct", "proxy"]), ["proxy", "direct"])
+
+        later.record_failure("direct")
+        self.assertEqual(later.order(["direct", "proxy"]), ["proxy"])
+        self.now += timedelta(seconds=61)
+        later.record_success("direct", 0.01)
+        self.assertEqual(later.snapshot()["direct"]["state"], "closed")
+        self.assertEqual(later.snapshot()["direct"]["failures"], 0)
+
+
+
+class RouteCacheTest(unittest.TestCase):
+    def test_entries_expire_and_probes_are_rate_limited(self):
+        now = [0.0]
+        cache = RouteCache(ttl_sec=10, clock=lambda: now[0])
+        cache.remember("example.org", "example.org:proxy")
+
+        self.assertEqual(cache.lookup("example.org"), "example.org:proxy")
+        self.assertTrue(cache.claim_probe("example.org", 5))
+        self.assertFalse(cache.claim_probe("example.org", 5))
+        now[0] = 10.0
+        self.assertIsNone(cache.lookup("example.org"))
+        self.assertTrue(cache.claim_probe("example.org", 5))
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["expired"], stats["probes"]), (1, 1, 1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
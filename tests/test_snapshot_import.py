@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+import snapshot_import
+from snapshot_import import SnapshotIndex, load_or_build_snapshot_index, snapshot_row
+
+
+def _record(arxiv_id, categories, created, versions=("v1",)):
+    return {
+        "id": arxiv_id,
+        "submitter": "Alice Zhang",
+        "authors": "Alice Zhang and Bob Li",
+        "title": "A Title\n  Continued",
+        "comments": "8 pages",
+        "journal-ref": None,
+        "categories": categories,
+        "abstract": "  An abstract.\n",
+        "versions": [{"version": version, "created": created} for version in versions],
+        "update_date": "2026-06-02",
+        "authors_parsed": [["Zhang", "Alice", ""], ["Li", "Bob", "Jr"]],
+    }
+
+
+def _write_snapshot(path, records):
+    with path.open("w", encoding="utf-8") as handle:
+        for record in records:
+            handle.write((record if isinstance(record, str) else json.dumps(record)) + "\n")
+
+
+class SnapshotImportTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.root = Path(self._tmpdir.name)
+        self.snapshot = self.root / "arxiv-metadata-oai-snapshot.json"
+        _write_snapshot(self.snapshot, [
+            _record("2606.01781", "cs.CL cs.AI", "Mon, 1 Jun 2026 17:59:58 GMT", ("v1", "v2")),
+            _record("2606.01782", "math.OC", "Mon, 1 Jun 2026 18:00:00 GMT"),
+            "{not json cs.AI",
+            # 02:00 UTC on June 2 is still June 1 in New York.
+            _record("2606.01783", "cs.LG", "Tue, 2 Jun 2026 02:00:00 GMT"),
+            _record("2606.01900", "cs.CV", "Tue, 2 Jun 2026 15:00:00 GMT"),
+        ])
+
+    def test_snapshot_row_matches_api_rows(self):
+        row = snapshot_row(_record("2606.01781", "cs.CL cs.AI", "Mon, 1 Jun 2026 17:59:58 GMT", ("v1", "v2")))
+        self.assertEqual(row.arxiv_id, "2606.01781v2")
+        self.assertEqual(row["id"], "https://arxiv.org/abs/2606.01781v2")
+        self.assertEqual(row["authors"], ["Alice Zhang", "Bob Li Jr"])
+        self.assertEqual(row["published"], datetime(2026, 6, 1, 17, 59, 58, tzinfo=timezone.utc))
+        self.assertEqual(row["primary_category"], "cs.CL")
+        self.assertEqual(row["summary"], "An abstract.")
+        self.assertEqual(row["journal_ref"], "")
+        self.assertEqual(row.pdf_url, "https://arxiv.org/pdf/2606.01781v2")
+        with mock.patch.object(snapshot_import, "ARXIV_BASE_URL", "http://127.0.0.1:8765"):
+            local = snapshot_row(_record("2606.01781", "cs.CL", "Mon, 1 Jun 2026 17:59:58 GMT"))
+        self.assertEqual(local.pdf_url, "http://127.0.0.1:8765/pdf/2606.01781v1")
+
+    def test_index_groups_cs_rows_by_arxiv_day_and_reads_one_day(self):
+        index = SnapshotIndex.build(self.snapshot)
+
+        self.assertEqual(index.scanned, 5)
+        self.assertEqual(index.indexed, 3)
+        self.assertEqual(sorted(index.days), ["2026-06-01", "2026-06-02"])
+        self.assertEqual([row.arxiv_id for row in index.rows_for_day("2026-06-01")], ["2606.01781v2", "2606.01783v1"])
+        self.assertEqual(index.rows_for_day("2026-05-31"), [])
+
+    def test_saved_index_is_reused_until_the_snapshot_changes(self):
+        index_path = self.root / "index" / "snapshot.index.json.gz"
+        _index, built = load_or_build_snapshot_index(self.snapshot, index_path)
+        self.assertTrue(built)
+
+        index, built = load_or_build_snapshot_index(self.snapshot, index_path)
+        self.assertFalse(built)
+        self.assertEqual([row.arxiv_id for row in index.rows_for_day("2026-06-02")], ["2606.01900v1"])
+
+        with self.snapshot.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(_record("2606.01901", "cs.AI", "Tue, 2 Jun 2026 16:00:00 GMT")) + "\n")
+        os.utime(self.snapshot, ns=(0, 1))
+        index, built = load_or_build_snapshot_index(self.snapshot, index_path)
+        self.assertTrue(built)
+        self.assertEqual(len(index.rows_for_day("2026-06-02")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import tempfile
+import time
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+import fetch_arxiv
+from api_cache import ApiResponseCache
+from arxiv_standin import ArxivStandin, generate_corpus
+from filters import arxiv_day_window
+from transport import CassetteMissError, Transport, request_key
+
+
+def _response(status=200, body=b"<feed/>", headers=None, elapsed=0.5):
+    response = requests.Response()
+    response.status_code = status
+    response.reason = "OK" if status == 200 else "Too Many Requests"
+    response.headers = requests.structures.CaseInsensitiveDict(headers or {"Content-Type": "application/atom+xml"})
+    response.elapsed = timedelta(seconds=elapsed)
+    response._content = body
+    return response
+
+
+class TransportTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.cassette_dir = Path(self._tmpdir.name) / "cassette"
+        self.sleeps = []
+
+    def _transport(self, mode, time_scale=1.0):
+        return Transport(mode, self.cassette_dir, time_scale=time_scale, sleep=self.sleeps.append)
+
+    def test_replays_recorded_responses_in_order_with_scaled_timing(self):
+        recorder = self._transport("record")
+        params = {"search_query": "cat:cs.AI", "start": 0}
+        recorder.record("https://export.arxiv.org/api/query", params, _response(429, b"", {"Retry-After": "5"}), 0.5, stream=False)
+        recorder.record("https://export.arxiv.org/api/query", params, _response(200, b"<feed>page</feed>", elapsed=1.0), 1.5, stream=False)
+
+        player = self._transport("replay", time_scale=0.5)
+        first = player.replay("https://export.arxiv.org/api/query", {"start": 0, "search_query": "cat:cs.AI"})
+        second = player.replay("https://export.arxiv.org/api/query", params)
+        again = player.replay("https://export.arxiv.org/api/query", params)
+
+        self.assertEqual((first.status_code, first.headers["Retry-After"]), (429, "5"))
+        self.assertEqual((second.status_code, second.text), (200, "<feed>page</feed>"))
+        self.assertEqual(second.headers["Content-Length"], str(len(b"<feed>page</feed>")))
+        self.assertEqual(second.elapsed, timedelta(seconds=0.5))
+        self.assertEqual(again.text, second.text)
+        self.assertEqual(self.sleeps, [0.25, 0.75, 0.75])
+        self.assertEqual(player.stats_snapshot()["replayed"], 3)
+
+    def test_streamed_body_is_recorded_once_and_still_readable(self):
+        recorder = self._transport("record")
+        body = b"%PDF-" + b"0" * 4096
+        response = _response(200, body, {"Content-Type": "application/pdf", "Content-Encoding": "gzip"})
+
+        recorder.record("https://arxiv.org/pdf/2606.00001v1", None, response, 0.5, stream=True)
+        recorder.record("https://arxiv.org/pdf/2606.00001", None, _response(200, body), 0.5, stream=True)
+
+        self.assertEqual(b"".join(response.iter_content(1024)), body)
+        self.assertEqual(len(list((self.cassette_dir / "bodies").rglob("*.gz"))), 1)
+        replayed = self._transport("replay", time_scale=0).replay("https://arxiv.org/pdf/2606.00001v1")
+        self.assertEqual(b"".join(replayed.iter_content(1024)), body)
+        self.assertNotIn("Content-Encoding", replayed.headers)
+        self.assertEqual(self.sleeps, [])
+
+    def test_recorded_errors_are_raised_again_and_misses_are_reported(self):
+        self._transport("record").record_error("https://arxiv.org/pdf/x", None, requests.exceptions.ConnectTimeout("timed out"), 20.0)
+        player = self._transport("replay")
+
+        with self.assertRaises(requests.exceptions.ConnectTimeout):
+            player.replay("https://arxiv.org/pdf/x")
+        with self.assertRaises(CassetteMissError):
+            player.replay("https://arxiv.org/pdf/y")
+        self.assertEqual(self.sleeps, [20.0])
+        self.assertEqual((player.stats["replayed_errors"], player.stats["misses"]), (1, 1))
+
+    def test_request_key_ignores_the_open_ended_oai_until(self):
+        self.assertEqual(
+            request_key("https://oaipmh.arxiv.org/oai", {"verb": "ListRecords", "until": "2026-06-02"}),
+            request_key("https://oaipmh.arxiv.org/oai", {"verb": "ListRecords", "until": "2026-07-01"}),
+        )
+
+    def test_unknown_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Transport("rewind", self.cassette_dir)
+
+
+class FetchReplayTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.addCleanup(fetch_arxiv._request_state_store.flush)
+        self.tmp = Path(self._tmpdir.name)
+        self.day = date(2026, 6, 1)
+        self.corpus = generate_corpus([self.day], papers_per_day=40, seed=3)
+
+    def _fetch(self, transport, endpoint, min_interval):
+        start_utc, end_utc = arxiv_day_window(self.day)
+        scheduler = fetch_arxiv._build_request_scheduler({"api": {"min_interval_sec": min_interval, "per_minute": 1000, "concurrency": 1}})
+        with mock.patch.multiple(
+            fetch_arxiv,
+            ARXIV_API_ENDPOINTS=[endpoint],
+            ARXIV_API_USE_PROXY=False,
+            ARXIV_API_CACHE_ENABLED=False,
+            NO_PROXY_HOSTS=["127.0.0.1"],
+            _ARXIV_API_HOSTS={"127.0.0.1"},
+            _request_state_path=self.tmp / "arxiv_request_state.json",
+            _legacy_request_state_path=self.tmp / "legacy_arxiv_request_state.json",
+            _request_scheduler=scheduler,
+            _route_cache=fetch_arxiv.RouteCache(ttl_sec=600),
+            _request_tracer=fetch_arxiv.RequestTracer(),
+            _api_cache=ApiResponseCache(self.tmp / "api_cache"),
+            _transport=transport,
+        ):
+            # Two passes, so the second API request has to get past the limiter.
+            ids = [
+                [fetch_arxiv.get_arxiv_id(row) for row in fetch_arxiv.iter_recent_cs(start_utc=start_utc, end_utc=end_utc)]
+                for _ in range(2)
+            ]
+            pdf = fetch_arxiv.request_with_network_fallback(f"{endpoint.rsplit('/api/', 1)[0]}/pdf/{ids[0][0]}", stream=True)
+        return ids, pdf.content
+
+    def test_replay_reproduces_a_recorded_fetch_without_network_or_limiter_sleeps(self):
+        cassette = self.tmp / "cassette"
+        with ArxivStandin(self.corpus) as standin:
+            endpoint = f"{standin.base_url}/api/query"
+            recorded = self._fetch(Transport("record", cassette), endpoint, min_interval=0.0)
+
+        # The server is gone and the limiter would wait 60s between the API requests.
+        started = time.perf_counter()
+        replayed = self._fetch(Transport("replay", cassette, time_scale=0), endpoint, min_interval=60.0)
+
+        self.assertEqual(replayed, recorded)
+        self.assertTrue(replayed[1].startswith(b"%PDF-"))
+        self.assertLess(time.perf_counter() - started, 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from config import DEBUG
+
+TRANSPORT_MODES = ("passthrough", "record", "replay")
+INDEX_NAME = "index.jsonl"
+# OAI-PMH harvests run "until" today; a replay on a later day must still match.
+_VOLATILE_PARAMS = ("until",)
+# The stored body is already decoded, so these no longer describe it.
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+class CassetteMissError(RuntimeError):
+    """A replayed request has no recorded response."""
+
+
+def request_key(url: str, params: Mapping[str, Any] | None = None) -> str:
+    items = sorted(
+        (str(name), str(value))
+        for name, value in (params or {}).items()
+        if value is not None and name not in _VOLATILE_PARAMS
+    )
+    return f"GET {url}?{urlencode(items)}" if items else f"GET {url}"
+
+
+class Cassette:
+    """Recorded responses in a directory: ``index.jsonl`` plus gzip-compressed bodies.
+
+    Each index line holds the request key, URL and parameters, then either
+    the status, headers, body digest and timing of the response or the
+    exception the request ended in. Bodies are stored once per SHA-256
+    under ``bodies/``. A key recorded several times (a 429 and its retry,
+    say) is replayed in the recorded order; its last response repeats.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Dict[str, Any]]] | None = None
+        self._served: Counter = Counter()
+        self._sequence = 0
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / INDEX_NAME
+
+    def _body_path(self, digest: str) -> Path:
+        return self.root / "bodies" / digest[:2] / f"{digest}.gz"
+
+    def append(self, entry: Dict[str, Any], body: bytes | None = None) -> None:
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            if body is not None:
+                digest = hashlib.sha256(body).hexdigest()
+                path = self._body_path(digest)
+                if not path.exists():
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    temp_path = path.with_name(f"{path.name}.{os.getpid()}.part")
+                    temp_path.write_bytes(gzip.compress(body, compresslevel=6))
+                    temp_path.replace(path)
+                entry = {**entry, "body": digest, "body_bytes": len(body)}
+            self._sequence += 1
+            entry = {"seq": self._sequence, "recorded_at": datetime.now(timezone.utc).isoformat(), **entry}
+            with open(self.index_path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self._entries is None:
+            entries: Dict[str, List[Dict[str, Any]]] = {}
+            try:
+                lines = self.index_path.read_text(encoding="utf-8").splitlines()
+            except OSError:
+                lines = []
+            for line in lines:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entries.setdefault(entry.get("key"), []).append(entry)
+            for recorded in entries.values():
+                recorded.sort(key=lambda entry: entry.get("seq") or 0)
+            self._entries = entries
+        return self._entries
+
+    def take(self, key: str) -> Dict[str, Any]:
+        """The next recorded response for ``key``."""
+        with self._lock:
+            recorded = self._load().get(key)
+            if not recorded:
+                raise CassetteMissError(f"no recorded response for {key} in {self.root}")
+            position = min(self._served[key], len(recorded) - 1)
+            self._served[key] += 1
+            return recorded[position]
+
+    def body(self, digest: str) -> bytes:
+        return gzip.decompress(self._body_path(digest).read_bytes())
+
+
+def _replayed_error(entry: Mapping[str, Any]) -> Exception:
+    name = str(entry.get("error") or "")
+    message = str(entry.get("message") or "")
+    error_type = getattr(requests.exceptions, name, None)
+    if isinstance(error_type, type) and issubclass(error_type, Exception):
+        return error_type(message)
+    return RuntimeError(f"{name}: {message}" if message else name)
+
+
+class Transport:
+    """What sits under ``request_with_network_fallback``: the network, a recorder or a replayer.
+
+    ``record`` keeps the network and writes every response, or the error a
+    request ended in, to a :class:`Cassette`. ``replay`` answers from the
+    cassette without touching the network, after the recorded time to first
+    byte and transfer time multiplied by ``time_scale`` (1.0 reproduces the
+    recorded timing, 0 answers at once).
+    """
+
+    def __init__(
+        self,
+        mode: str = "passthrough",
+        cassette_dir: Path | str = "cassettes",
+        time_scale: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if mode not in TRANSPORT_MODES:
+            raise ValueError(f"unknown transport mode: {mode}")
+        self.mode = mode
+        self.cassette = Cassette(Path(cassette_dir))
+        self.time_scale = max(0.0, time_scale)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.stats = {"recorded": 0, "recorded_errors": 0, "replayed": 0, "replayed_errors": 0, "misses": 0}
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def stats_snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"mode": self.mode, "cassette": str(self.cassette.root), **self.stats}
+
+    def record(self, url: str, params: Mapping[str, Any] | None, response: requests.Response, round_trip_sec: float, stream: bool) -> None:
+        """Write ``response`` to the cassette; ``round_trip_sec`` is the time ``session.get`` took.
+
+        A streamed body is read here, so the caller iterates over the copy
+        requests keeps in memory.
+        """
+        elapsed = getattr(response, "elapsed", None)
+        ttfb_sec = elapsed.total_seconds() if elapsed is not None else round_trip_sec
+        transfer_sec = max(0.0, round_trip_sec - ttfb_sec)
+        try:
+            if stream:
+                started = time.perf_counter()
+                body = response.content
+                transfer_sec = time.perf_counter() - started
+            else:
+                body = response.content
+        except Exception as exc:
+            if DEBUG:
+                print(f"[WARN] could not record the body of {url}: {exc}")
+            return
+        headers = {
+            name: value for name, value in (response.headers or {}).items()
+            if name.lower() not in _DROPPED_HEADERS
+        }
+        try:
+            self.cassette.append(
+                {
+                    "key": request_key(url, params),
+                    "url": url,
+                    "params": {name: str(value) for name, value in (params or {}).items()},
+                    "status": response.status_code,
+                    "reason": response.reason,
+                    "headers": headers,
+                    "ttfb_sec": round(ttfb_sec, 4),
+                    "transfer_sec": round(transfer_sec, 4),
+                },
+                body,
+            )
+        except OSError as exc:
+            if DEBUG:
+                print(f"[WARN] could not write to cassette {self.cassette.root}: {exc}")
+            return
+        self._count("recorded")
+
+    def record_error(self, url: str, params: Mapping[str, Any] | None, exc: BaseException, duration_sec: float) -> None:
+        try:
+            self.cassette.append({
+                "key": request_key(url, params),
+                "url": url,
+                "params": {name: str(value) for name, value in (params or {}).items()},
+                "error": type(exc).__name__,
+                "message": str(exc),
+                "duration_sec": round(duration_sec, 4),
+            })
+        except OSError as exc:
+            if DEBUG:
+                print(f"[WARN] could not write to cassette {self.cassette.root}: {exc}")
+            return
+        self._count("recorded_errors")
+
+    def replay(self, url: str, params: Mapping[str, Any] | None = None) -> requests.Response:
+        try:
+            entry = self.cassette.take(request_key(url, params))
+        except CassetteMissError:
+            self._count("misses")
+            raise
+        if entry.get("error"):
+            self._wait(float(entry.get("duration_sec") or 0.0))
+            self._count("replayed_errors")
+            raise _replayed_error(entry)
+        ttfb_sec = float(entry.get("ttfb_sec") or 0.0)
+        self._wait(ttfb_sec + float(entry.get("transfer_sec") or 0.0))
+        body = self.cassette.body(entry["body"]) if entry.get("body") else b""
+        response = requests.Response()
+        response.status_code = int(entry["status"])
+        response.reason = entry.get("reason") or ""
+        response.headers = CaseInsensitiveDict(entry.get("headers") or {})
+        response.headers["Content-Length"] = str(len(body))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = entry.get("url") or url
+        response.elapsed = timedelta(seconds=ttfb_sec * self.time_scale)
+        response._content = body
+        # iter_content reads the body from memory once it counts as consumed.
+        response._content_consumed = True
+        self._count("replayed")
+        return response
+
+    def _wait(self, seconds: float) -> None:
+        if self.time_scale > 0 and seconds > 0:
+            self._sleep(seconds * self.time_scale)